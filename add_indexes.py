@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the lookup indexes declared on the models,
+then check with EXPLAIN QUERY PLAN that the route queries no longer scan whole tables.
+
+The check loads each page in query_budget.ROUTE_PLAN_CHECKS through the app,
+signed in as admin, the first teacher and the first student's parent, and
+explains the statements the views actually executed (see
+query_budget.route_table_scans), so it cannot drift from the view code.
+Loading the pages needs every table and column the models declare, so the
+migrations in REQUIRED_MIGRATIONS must have run first; the script names any
+that have not and stops before changing anything.
+
+Usage: python add_indexes.py [path/to/navyug.db]
+"""
+
+import sqlite3
+import os
+import sys
+
+# (index name, table, columns) - keep in sync with __table_args__ in models.py
+INDEXES = [
+    ("ix_fee_payment_submitted_at_id", "fee_payment", "submitted_at, id"),
+    ("ix_fee_payment_roll_no_submitted_at", "fee_payment", "roll_no, submitted_at"),
+    ("ix_fee_payment_class_submitted_at", "fee_payment", "student_class, submitted_at"),
+    ("ix_fee_payment_paid_submitted_at", "fee_payment", "paid, submitted_at"),
+    ("ix_contact_message_submitted_at", "contact_message", "submitted_at"),
+    ("ix_contact_message_subject_submitted_at", "contact_message", "subject, submitted_at"),
+    ("ix_student_class_section_roll_no", "student", "student_class, section, roll_no"),
+    ("ix_student_class_section_name", "student", "student_class, section, name"),
+    ("ix_visit_date_time", "visit", "visit_date, visit_time"),
+    ("ix_visit_status_date_time", "visit", "status, visit_date, visit_time"),
+    ("ix_teacher_class_section_name", "teacher", "assigned_class, assigned_section, name"),
+    ("ix_marks_student_exam_date", "marks", "student_id, exam_date"),
+    ("ix_marks_teacher_uploaded_at", "marks", "teacher_id, uploaded_at"),
+    ("ix_marks_teacher_exam_date", "marks", "teacher_id, exam_date, uploaded_at"),
+]
+
+# (script, table, column or None for the table itself) the route check needs,
+# in the order the scripts have to run
+REQUIRED_MIGRATIONS = [
+    ("update_database.py", "contact_message", "subject"),
+    ("migrate_receipts.py", "fee_payment", "receipt_sha256"),
+    ("add_thumbnail_jobs.py", "receipt_thumbnail", None),
+    ("add_ingest_checkpoint.py", "ingest_checkpoint", None),
+    ("add_report_cards.py", "mark_summary", None),
+    ("add_visit_slots.py", "visit", "slot_id"),
+    ("add_search_index.py", "fee_payment_fts", None),
+    ("add_search_index.py", "contact_message_fts", None),
+]
+
+def missing_migrations(cursor):
+    """Scripts from REQUIRED_MIGRATIONS that have not been run on the database, in order."""
+    missing = []
+    for script, table, column in REQUIRED_MIGRATIONS:
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = {row[1] for row in cursor.fetchall()}
+        if (not columns or (column and column not in columns)) and script not in missing:
+            missing.append(script)
+    return missing
+
+def route_table_scans(db_path):
+    """(route, plan step, statement) for every route query that still scans a whole table."""
+    from app import create_app
+    from config import Config
+    from models import db, Student, Teacher
+    from query_budget import route_table_scans as explain_routes
+
+    class CheckConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.abspath(db_path)
+        WRITE_BEHIND = False
+        PAGE_CACHE_ENABLED = False
+        PAGE_CACHE_DIR = None
+
+    app = create_app(CheckConfig)
+    client = app.test_client()
+    with app.app_context():
+        teacher = db.session.query(Teacher.teacher_id).order_by(Teacher.id).first()
+        student = db.session.query(Student.id).order_by(Student.id).first()
+        with client.session_transaction() as session:
+            session["admin_logged_in"] = True
+            if teacher:
+                session.update(teacher_logged_in=True, teacher_id=teacher.teacher_id)
+            if student:
+                session.update(parent_logged_in=True, student_id=student.id)
+        try:
+            return explain_routes(client, db.engine)
+        finally:
+            db.engine.dispose()
+
+def add_indexes(db_path='navyug.db'):
+    if not os.path.exists(db_path):
+        print(f"Database file {db_path} not found!")
+        return False
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        missing = missing_migrations(cursor)
+        if missing:
+            print(f"❌ {db_path} is missing tables or columns the route check needs.")
+            print(f"   Run these migrations on it first, in this order: {', '.join(missing)}")
+            return False
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing = {row[0] for row in cursor.fetchall()}
+
+        for name, table, columns in INDEXES:
+            if name in existing:
+                print(f"✓ {name} already exists")
+                continue
+            print(f"Adding index {name} on {table}({columns})...")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+            print(f"✓ {name} added successfully")
+
+        conn.commit()
+
+        print("\nChecking route query plans...")
+        conn.close()
+        conn = None
+        failures = route_table_scans(db_path)
+        if failures:
+            for route, detail, statement in failures:
+                print(f"  ✗ {route}: {detail}\n      {' '.join(statement.split())}")
+            print(f"\n❌ {len(failures)} route query plan(s) still scan a full table")
+            return False
+
+        print("  ✓ route queries use indexes")
+        print("\n✅ Database updated successfully!")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        if conn:
+            conn.close()
+    return False
+
+if __name__ == "__main__":
+    ok = add_indexes(sys.argv[1] if len(sys.argv) > 1 else 'navyug.db')
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the ingest_checkpoint table, which records
+how far the write-behind queue (WRITE_BEHIND=1) has been committed.
+
+Usage: python add_ingest_checkpoint.py [path/to/navyug.db]
+"""
+
+import sqlite3
+import os
+import sys
+
+def add_ingest_checkpoint(db_path='navyug.db'):
+    if not os.path.exists(db_path):
+        print(f"Database file {db_path} not found!")
+        return False
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'ingest_checkpoint'")
+        if cursor.fetchone():
+            print("✓ ingest_checkpoint table already exists")
+        else:
+            print("Creating 'ingest_checkpoint' table...")
+            cursor.execute(
+                "CREATE TABLE ingest_checkpoint ("
+                "name VARCHAR(50) NOT NULL PRIMARY KEY, "
+                "last_id INTEGER NOT NULL)"
+            )
+            conn.commit()
+            print("✓ ingest_checkpoint table created successfully")
+
+        print("\n✅ Database updated successfully!")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        if conn:
+            conn.close()
+    return False
+
+if __name__ == "__main__":
+    ok = add_ingest_checkpoint(sys.argv[1] if len(sys.argv) > 1 else 'navyug.db')
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the mark_summary table, which holds the
+precomputed report cards (totals, percentage, class rank and percentile) read
+by the parent and teacher dashboards. Fill it afterwards with
+`flask --app app report-cards`; from then on every marks write keeps its
+section up to date.
+
+Usage: python add_report_cards.py [path/to/navyug.db]
+"""
+
+import sqlite3
+import os
+import sys
+
+def add_report_cards(db_path='navyug.db'):
+    if not os.path.exists(db_path):
+        print(f"Database file {db_path} not found!")
+        return False
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        if sqlite3.sqlite_version_info < (3, 25, 0):
+            print(f"❌ SQLite {sqlite3.sqlite_version} has no window functions; report cards need 3.25 or newer")
+            return False
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'mark_summary'")
+        if cursor.fetchone():
+            print("✓ mark_summary table already exists")
+        else:
+            print("Creating 'mark_summary' table...")
+            cursor.execute(
+                "CREATE TABLE mark_summary ("
+                "id INTEGER NOT NULL PRIMARY KEY, "
+                "student_id INTEGER NOT NULL REFERENCES student (id) ON DELETE CASCADE, "
+                "student_class VARCHAR(50) NOT NULL, "
+                "section VARCHAR(10) NOT NULL, "
+                "subject VARCHAR(100) NOT NULL, "
+                "exam_type VARCHAR(50) NOT NULL, "
+                "exams INTEGER NOT NULL, "
+                "total_obtained FLOAT NOT NULL, "
+                "total_max FLOAT NOT NULL, "
+                "percentage FLOAT, "
+                "class_rank INTEGER, "
+                "class_size INTEGER, "
+                "class_average FLOAT, "
+                "percentile FLOAT, "
+                "updated_at DATETIME, "
+                "CONSTRAINT uq_mark_summary_student_scope UNIQUE (student_id, subject, exam_type))"
+            )
+            print("✓ mark_summary table created successfully")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_mark_summary_section_scope_rank "
+            "ON mark_summary (student_class, section, subject, exam_type, class_rank)"
+        )
+        conn.commit()
+
+        print("\n✅ Database updated successfully! Now run `flask --app app report-cards`.")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        if conn:
+            conn.close()
+    return False
+
+if __name__ == "__main__":
+    ok = add_report_cards(sys.argv[1] if len(sys.argv) > 1 else 'navyug.db')
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the FTS5 search indexes for fee payments
+and contact messages, and backfill them from the existing rows.
+
+Usage: python add_search_index.py [path/to/navyug.db]
+"""
+
+import sqlite3
+import os
+import sys
+
+from search import SEARCH_COLUMNS, install_search_index
+
+def add_search_index(db_path='navyug.db'):
+    if not os.path.exists(db_path):
+        print(f"Database file {db_path} not found!")
+        return False
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        created = install_search_index(cursor)
+        conn.commit()
+
+        for tablename in SEARCH_COLUMNS:
+            fts = f"{tablename}_fts"
+            if fts in created:
+                cursor.execute(f"SELECT count(*) FROM {fts}")
+                print(f"✓ {fts} created and backfilled ({cursor.fetchone()[0]} rows)")
+            else:
+                print(f"✓ {fts} already exists")
+
+        print("\n✅ Database updated successfully!")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        if conn:
+            conn.close()
+    return False
+
+if __name__ == "__main__":
+    ok = add_search_index(sys.argv[1] if len(sys.argv) > 1 else 'navyug.db')
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the receipt_thumbnail job table used by the
+background thumbnail/preview workers. Existing receipts are queued afterwards
+with `flask --app app receipt-thumbnails`.
+
+Usage: python add_thumbnail_jobs.py [path/to/navyug.db]
+"""
+
+import sqlite3
+import os
+import sys
+
+def add_thumbnail_jobs(db_path='navyug.db'):
+    if not os.path.exists(db_path):
+        print(f"Database file {db_path} not found!")
+        return False
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'receipt_thumbnail'")
+        if cursor.fetchone():
+            print("✓ receipt_thumbnail table already exists")
+        else:
+            print("Creating 'receipt_thumbnail' table...")
+            cursor.execute(
+                "CREATE TABLE receipt_thumbnail ("
+                "id INTEGER NOT NULL PRIMARY KEY, "
+                "receipt_sha256 VARCHAR(64) NOT NULL UNIQUE, "
+                "receipt_filename VARCHAR(300) NOT NULL, "
+                "status VARCHAR(20) NOT NULL, "
+                "attempts INTEGER NOT NULL, "
+                "error VARCHAR(300), "
+                "created_at DATETIME, "
+                "updated_at DATETIME)"
+            )
+            print("✓ receipt_thumbnail table created successfully")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_receipt_thumbnail_status_updated_at "
+            "ON receipt_thumbnail (status, updated_at)"
+        )
+        conn.commit()
+
+        print("\n✅ Database updated successfully!")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        if conn:
+            conn.close()
+    return False
+
+if __name__ == "__main__":
+    ok = add_thumbnail_jobs(sys.argv[1] if len(sys.argv) > 1 else 'navyug.db')
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add visit slots: the visit_slot table (one row
+per bookable date and time, with its capacity and seats booked) and the
+visit.slot_id column linking a booked visit to its slot. Existing visits keep
+slot_id NULL. Open slots afterwards from the admin visits page or with
+`flask --app app open-visit-slots`; until then the public form accepts any
+date and time as before.
+
+Usage: python add_visit_slots.py [path/to/navyug.db]
+"""
+
+import sqlite3
+import os
+import sys
+
+def add_visit_slots(db_path='navyug.db'):
+    if not os.path.exists(db_path):
+        print(f"Database file {db_path} not found!")
+        return False
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'visit_slot'")
+        if cursor.fetchone():
+            print("✓ visit_slot table already exists")
+        else:
+            print("Creating 'visit_slot' table...")
+            cursor.execute(
+                "CREATE TABLE visit_slot ("
+                "id INTEGER NOT NULL PRIMARY KEY, "
+                "slot_date DATE NOT NULL, "
+                "start_time TIME NOT NULL, "
+                "end_time TIME NOT NULL, "
+                "capacity INTEGER NOT NULL, "
+                "booked INTEGER NOT NULL, "
+                "CONSTRAINT uq_visit_slot_date_time UNIQUE (slot_date, start_time), "
+                "CONSTRAINT ck_visit_slot_booked CHECK (booked >= 0 AND booked <= capacity))"
+            )
+            print("✓ visit_slot table created successfully")
+
+        cursor.execute("PRAGMA table_info(visit)")
+        columns = [column[1] for column in cursor.fetchall()]
+        if 'slot_id' in columns:
+            print("✓ visit.slot_id column already exists")
+        else:
+            print("Adding 'slot_id' column to visit table...")
+            cursor.execute("ALTER TABLE visit ADD COLUMN slot_id INTEGER REFERENCES visit_slot (id) ON DELETE SET NULL")
+            print("✓ visit.slot_id column added successfully")
+        conn.commit()
+
+        print("\n✅ Database updated successfully! Open slots from the admin visits page.")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        if conn:
+            conn.close()
+    return False
+
+if __name__ == "__main__":
+    ok = add_visit_slots(sys.argv[1] if len(sys.argv) > 1 else 'navyug.db')
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,64 @@
+"""
+Fingerprinted static assets built by build_assets.py.
+
+The build writes content-hashed copies of the CSS, JS and fonts to
+static/dist/, with .gz/.br variants and a manifest.json mapping each source
+name to its hashed file. asset_url() resolves names through the manifest,
+falling back to the plain static file when nothing has been built, and
+/assets/<file> serves built files with year-long immutable caching, picking a
+precompressed variant the browser accepts.
+"""
+
+import json
+import mimetypes
+import os
+
+from flask import abort, request, send_file, url_for
+from werkzeug.utils import safe_join
+
+DIST_DIR = "dist"
+MANIFEST = "manifest.json"
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+# Preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+def load_manifest(static_folder):
+    """{source name: hashed name} from the last build, or {} if there was none."""
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def init_app(app):
+    """Register the /assets route and the asset_url/assets_built template globals."""
+    dist = os.path.join(app.static_folder, DIST_DIR)
+    manifest = load_manifest(app.static_folder)
+
+    def asset_url(name):
+        built = manifest.get(name)
+        if built:
+            return url_for("asset_file", filename=built)
+        return url_for("static", filename=name)
+
+    def asset_file(filename):
+        path = safe_join(dist, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        served, encoding = path, None
+        for name, suffix in ENCODINGS:
+            if request.accept_encodings[name] and os.path.isfile(path + suffix):
+                served, encoding = path + suffix, name
+                break
+        # Hashed names never change content, so caches may keep them for good
+        response = send_file(served, mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                             max_age=ASSET_MAX_AGE, conditional=True)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    app.add_url_rule("/assets/<path:filename>", "asset_file", asset_file)
+    app.jinja_env.globals.update(asset_url=asset_url, assets_built=bool(manifest))
@@ -0,0 +1,88 @@
+"""
+Cold-worker time to first response, with and without the Jinja bytecode cache.
+
+Each run starts a fresh interpreter, as a newly spawned Gunicorn worker would,
+imports the app and requests every public page once. Three setups are timed:
+templates compiled in memory (cache off), an empty cache directory (the first
+worker after a deploy without precompiling) and a cache filled by
+`flask precompile-templates`.
+
+    python -m benchmarks.cold_start --runs 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from statistics import median
+
+ROUTES = ("/", "/about", "/contact", "/schedule_visit", "/fee", "/admin/login", "/parent/login")
+
+# Runs in the child interpreter; prints {"import_ms": ..., "routes": {route: ms}}
+WORKER = """
+import json, sys
+from time import perf_counter
+started = perf_counter()
+from app import create_app
+app = create_app()
+imported = perf_counter()
+client = app.test_client()
+timings = {}
+for route in sys.argv[1:]:
+    t = perf_counter()
+    assert client.get(route).status_code == 200, route
+    timings[route] = (perf_counter() - t) * 1000
+print(json.dumps({"import_ms": (imported - started) * 1000, "routes": timings}))
+"""
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def worker_env(cache_dir, database_url):
+    env = dict(os.environ, JINJA_BYTECODE_CACHE_DIR=cache_dir, DATABASE_URL=database_url, PAGE_CACHE="0")
+    env.pop("WRITE_BEHIND", None)
+    return env
+
+def cold_worker(cache_dir, database_url):
+    out = subprocess.run([sys.executable, "-c", WORKER, *ROUTES], cwd=BASE_DIR, env=worker_env(cache_dir, database_url),
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def precompile(cache_dir, database_url):
+    subprocess.run([sys.executable, "-m", "flask", "--app", "app", "precompile-templates"], cwd=BASE_DIR,
+                   env=worker_env(cache_dir, database_url), check=True, capture_output=True)
+
+def summarize(setup, results):
+    first = median(r["routes"][ROUTES[0]] for r in results)
+    all_pages = median(sum(r["routes"].values()) for r in results)
+    total = median(r["import_ms"] + sum(r["routes"].values()) for r in results)
+    return f"{setup:<14}{median(r['import_ms'] for r in results):>11.0f}{first:>14.1f}{all_pages:>14.1f}{total:>11.0f}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per setup")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Public pages do not query, but the app still wants a database URL
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        results = {"cache off": [cold_worker("off", database_url) for _ in range(args.runs)]}
+
+        cold = []
+        for i in range(args.runs):
+            cache_dir = os.path.join(tmp, f"empty-{i}")
+            cold.append(cold_worker(cache_dir, database_url))
+        results["empty cache"] = cold
+
+        warm_dir = os.path.join(tmp, "precompiled")
+        precompile(warm_dir, database_url)
+        results["precompiled"] = [cold_worker(warm_dir, database_url) for _ in range(args.runs)]
+
+    print(f"{len(ROUTES)} public pages, median of {args.runs} cold workers (ms)")
+    print(f"{'setup':<14}{'import':>11}{'first page':>14}{'all pages':>14}{'total':>11}")
+    for setup, runs in results.items():
+        print(summarize(setup, runs))
+
+if __name__ == "__main__":
+    main()
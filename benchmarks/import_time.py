@@ -0,0 +1,97 @@
+"""
+Import-time profile of the app's entry points, from `python -X importtime`.
+
+Each target runs in a fresh interpreter, as a new Gunicorn worker or a cron
+job would: `models` is what create_db.py and the benchmarks load, `commands`
+is the `flask` maintenance CLI, and `app` imports the factory and builds the
+app a web worker serves. Reported per target: median wall time, median total
+import time and the packages that cost the most (each module's own time,
+summed per top-level package), so a new heavy import in a hot module shows
+up here before it shows up in cold-start latency.
+
+    python -m benchmarks.import_time --runs 5 --top 8
+    python -m benchmarks.import_time --json > import_time.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from statistics import median
+from time import perf_counter
+
+TARGETS = {
+    "models": "import models",
+    "commands": "import commands",
+    "app": "from app import create_app; create_app()",
+}
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_importtime(stderr):
+    """{top-level package: µs} from -X importtime output, summing each module's own (self) time."""
+    packages = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        packages[name.strip().split(".")[0]] += int(own)
+    return packages
+
+def profile(code, env):
+    started = perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BASE_DIR, env=env,
+                            check=True, capture_output=True, text=True)
+    wall_ms = (perf_counter() - started) * 1000
+    return wall_ms, parse_importtime(result.stderr)
+
+def run(target, runs, env):
+    profile(TARGETS[target], env)  # warm-up: writes any missing .pyc files
+    walls, totals, packages = [], [], defaultdict(list)
+    for _ in range(runs):
+        wall_ms, costs = profile(TARGETS[target], env)
+        walls.append(wall_ms)
+        totals.append(sum(costs.values()) / 1000)
+        for package, us in costs.items():
+            packages[package].append(us / 1000)
+    heaviest = sorted(((median(ms), package) for package, ms in packages.items()), reverse=True)
+    return {
+        "target": target,
+        "wall_ms": median(walls),
+        "import_ms": median(totals),
+        "packages": len(packages),
+        "heaviest": [{"package": package, "ms": ms} for ms, package in heaviest],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per target")
+    parser.add_argument("--top", type=int, default=8, help="heaviest packages to list per target")
+    parser.add_argument("--target", choices=TARGETS, action="append", help="profile only these (repeatable)")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per target instead of a table")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                   JINJA_BYTECODE_CACHE_DIR="off", PAGE_CACHE="0")
+        env.pop("WRITE_BEHIND", None)
+        results = [run(target, args.runs, env) for target in args.target or TARGETS]
+
+    if args.json:
+        for r in results:
+            print(json.dumps(dict(r, heaviest=r["heaviest"][:args.top])))
+        return
+    print(f"median of {args.runs} fresh interpreters (ms)")
+    print(f"{'target':<10}{'wall':>8}{'imports':>10}{'packages':>10}")
+    for r in results:
+        print(f"{r['target']:<10}{r['wall_ms']:>8.0f}{r['import_ms']:>10.0f}{r['packages']:>10}")
+    for r in results:
+        print(f"\n{r['target']}: heaviest packages")
+        for item in r["heaviest"][:args.top]:
+            print(f"  {item['package']:<24}{item['ms']:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Mixed-traffic load test against a running server, using only the stdlib.
+
+Each thread is a virtual user with its own cookie jar: anonymous visitors,
+admins, teachers and parents in the --mix proportions. Signed-in users log
+in once, then every user loops over its role's pages (weighted like real
+traffic, with a few form posts) until --duration runs out, pausing --think-ms
+between requests. Redirects are not followed, so each result is the cost of
+that one request. Latency per route and overall throughput are reported;
+--json writes the format benchmarks.results compares.
+
+Seed the database and start the server first, e.g.
+
+    python -m benchmarks.seed_data --reset
+    gunicorn -w 4 wsgi:app
+    python -m benchmarks.load --url http://127.0.0.1:8000 --users 40 --duration 60 --json load.json
+
+Teachers and parents sign in with the seed_data logins, so --teachers and
+--students must not exceed what was seeded.
+"""
+
+import argparse
+import random
+import threading
+from http.cookiejar import CookieJar
+from time import perf_counter, sleep
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, build_opener
+
+from config import Config
+
+from . import results, seed_data
+
+# role -> [(weight, method, path, form)]
+TRAFFIC = {
+    "public": [
+        (6, "GET", "/", None),
+        (2, "GET", "/about", None),
+        (2, "GET", "/contact", None),
+        (3, "GET", "/fee", None),
+        (1, "GET", "/schedule_visit", None),
+        (1, "GET", "/schedule_visit/availability", None),
+        (1, "POST", "/contact", {"name": "Load", "email": "load@example.com", "subject": "general",
+                                 "message": "Load test message"}),
+        (1, "POST", "/fee", {"student_name": "Load", "roll_no": "LOAD", "student_class": "5", "parent_name": "Load",
+                             "parent_phone": "9000000000", "payment_month": "April", "amount": "1500"}),
+    ],
+    "admin": [
+        (4, "GET", "/admin/dashboard", None),
+        (2, "GET", "/admin/dashboard?query=sharma", None),
+        (2, "GET", "/admin/stats", None),
+        (2, "GET", "/admin/students", None),
+        (2, "GET", "/admin/api/roster/students?student_class=5&section=A", None),
+        (1, "GET", "/admin/visits", None),
+        (1, "GET", "/admin/contacts", None),
+        (1, "GET", "/admin/teachers", None),
+    ],
+    "teacher": [
+        (3, "GET", "/teacher/dashboard", None),
+        (2, "GET", "/teacher/students", None),
+        (3, "GET", "/teacher/marks", None),
+        (1, "GET", "/teacher/marks/grid", None),
+    ],
+    "parent": [
+        (1, "GET", "/parent/dashboard", None),
+    ],
+}
+
+DEFAULT_MIX = "public=60,admin=10,teacher=15,parent=15"
+
+class _NoRedirect(HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None  # surfaces the 3xx as an HTTPError
+
+class User:
+    """One virtual user: a cookie jar, a role and that role's login."""
+
+    def __init__(self, base_url, role, args, rng):
+        self.base_url = base_url.rstrip("/")
+        self.role = role
+        self.rng = rng
+        self.opener = build_opener(HTTPCookieProcessor(CookieJar()), _NoRedirect)
+        self.login_form = None
+        if role == "admin":
+            self.login_path = "/admin/login"
+            self.login_form = {"login_type": "admin", "username": args.admin_user, "password": args.admin_password}
+        elif role == "teacher":
+            self.login_path = "/admin/login"
+            self.login_form = {"login_type": "teacher", "password": seed_data.BENCH_PASSWORD,
+                               "teacher_id": seed_data.teacher_login(rng.randrange(args.teachers))}
+        elif role == "parent":
+            self.login_path = "/parent/login"
+            admission_number, roll_no = seed_data.parent_login(rng.randrange(args.students))
+            self.login_form = {"admission_number": admission_number, "roll_number": roll_no}
+
+    def request(self, method, path, form=None):
+        """(status, ms) of one request; status 0 when the connection failed."""
+        body = urlencode(form).encode() if form is not None else None
+        started = perf_counter()
+        try:
+            with self.opener.open(self.base_url + path, data=body, timeout=30) as response:
+                response.read()
+                status = response.status
+        except HTTPError as e:
+            e.read()
+            status = e.code
+        except (URLError, OSError):
+            status = 0
+        return status, (perf_counter() - started) * 1000
+
+    def login(self):
+        if self.login_form is None:
+            return True
+        status, _ = self.request("POST", self.login_path, self.login_form)
+        return status == 302
+
+def run_user(user, deadline, think_s, samples, lock):
+    if not user.login():
+        with lock:
+            samples.setdefault(f"login {user.role}", ([], [0]))[1][0] += 1
+        return
+    traffic = TRAFFIC[user.role]
+    weights = [w for w, *_ in traffic]
+    while perf_counter() < deadline:
+        _, method, path, form = user.rng.choices(traffic, weights)[0]
+        status, ms = user.request(method, path, form)
+        with lock:
+            latencies, errors = samples.setdefault(f"{method} {path}", ([], [0]))
+            if 200 <= status < 400:
+                latencies.append(ms)
+            else:
+                errors[0] += 1
+        if think_s:
+            sleep(user.rng.uniform(0, 2 * think_s))
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        role, _, weight = part.partition("=")
+        if role not in TRAFFIC:
+            raise argparse.ArgumentTypeError(f"unknown role {role!r}; expected {', '.join(TRAFFIC)}")
+        mix[role] = float(weight)
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users (threads)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of traffic")
+    parser.add_argument("--think-ms", type=float, default=100, help="mean pause between a user's requests")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"role weights (default {DEFAULT_MIX})")
+    parser.add_argument("--students", type=int, default=seed_data.VOLUMES["students"], help="seeded students to log in as")
+    parser.add_argument("--teachers", type=int, default=seed_data.VOLUMES["teachers"], help="seeded teachers to log in as")
+    parser.add_argument("--admin-user", default=Config.ADMIN_USERNAME)
+    parser.add_argument("--admin-password", default=Config.ADMIN_PASSWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", metavar="PATH", help="also write results to PATH (see benchmarks.results)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    roles = rng.choices(list(args.mix), list(args.mix.values()), k=args.users)
+    users = [User(args.url, role, args, random.Random(rng.random())) for role in roles]
+    samples, lock = {}, threading.Lock()
+    started = perf_counter()
+    deadline = started + args.duration
+    threads = [threading.Thread(target=run_user, args=(u, deadline, args.think_ms / 1000, samples, lock))
+               for u in users]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = perf_counter() - started
+
+    out = {name: results.summarize(latencies, errors[0]) for name, (latencies, errors) in sorted(samples.items())}
+    total = sum(r["count"] for r in out.values())
+    failed = sum(r["errors"] for r in out.values())
+    params = {"users": args.users, "duration": args.duration, "think_ms": args.think_ms,
+              "mix": args.mix, "seed": args.seed}
+    if args.json:
+        results.save(args.json, "load", params, out)
+    print(f"{args.users} users ({', '.join(f'{roles.count(r)} {r}' for r in args.mix)}) for {elapsed:.0f} s "
+          f"against {args.url}: {total / elapsed:.1f} req/s, {failed} error(s)")
+    width = max([len(name) for name in out] + [4])
+    print(f"{'case':<{width}}{'count':>8}{'p50':>9}{'p95':>9}{'max':>9}{'errors':>8}")
+    for name, r in out.items():
+        print(f"{name:<{width}}{r['count']:>8}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['max_ms']:>9.1f}{r['errors']:>8}")
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
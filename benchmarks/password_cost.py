@@ -0,0 +1,89 @@
+"""
+Size the password KDF cost to a target sign-in latency on this machine.
+
+Starting from a cheap setting, the cost (scrypt's n, or pbkdf2's iteration
+count) is doubled until one hash takes at least --target-ms, and that
+setting is printed as a PASSWORD_HASH_METHOD value. Then a rush of --rush
+sign-ins is pushed through a PasswordHasher with --workers threads, as the
+app would, to show how long the last teacher in the queue waits at that
+cost. Run it on the production hardware, with the other workers idle.
+
+    python -m benchmarks.password_cost --target-ms 250 --workers 2 --rush 120
+    python -m benchmarks.password_cost --algorithm pbkdf2 --target-ms 150
+"""
+
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median
+from time import perf_counter
+
+from werkzeug.security import generate_password_hash
+
+from passwords import PasswordHasher
+
+# (starting cost, method string for a cost) per algorithm
+ALGORITHMS = {
+    "scrypt": (2 ** 12, lambda n: f"scrypt:{n}:8:1"),
+    "pbkdf2": (50_000, lambda n: f"pbkdf2:sha256:{n}"),
+}
+
+# Double the cost at most this many times before giving up
+MAX_DOUBLINGS = 16
+
+def time_hash(method, samples):
+    """Median ms of one hash with method."""
+    timings = []
+    for _ in range(samples):
+        started = perf_counter()
+        generate_password_hash("benchmark-password", method)
+        timings.append((perf_counter() - started) * 1000)
+    return median(timings)
+
+def size_cost(algorithm, target_ms, samples):
+    """(method, ms) of the cheapest setting of algorithm taking at least target_ms."""
+    cost, method_for = ALGORITHMS[algorithm]
+    for _ in range(MAX_DOUBLINGS):
+        method = method_for(cost)
+        ms = time_hash(method, samples)
+        print(f"  {method:<28}{ms:>9.1f} ms")
+        if ms >= target_ms:
+            return method, ms
+        cost *= 2
+    return method, ms
+
+def rush(method, workers, sign_ins):
+    """(seconds to finish, median wait ms, max wait ms) for sign_ins arriving at once."""
+    hasher = PasswordHasher(method, workers, queue_size=sign_ins, wait=600, cache_size=0, cache_ttl=0)
+    stored = generate_password_hash("benchmark-password", method)
+    waits = []
+
+    def sign_in(_):
+        started = perf_counter()
+        hasher.verify(stored, "benchmark-password")
+        waits.append((perf_counter() - started) * 1000)
+
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=sign_ins) as requests:
+        list(requests.map(sign_in, range(sign_ins)))
+    return perf_counter() - started, median(waits), max(waits)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="scrypt")
+    parser.add_argument("--target-ms", type=float, default=250, help="time one hash should take")
+    parser.add_argument("--samples", type=int, default=5, help="hashes timed per setting")
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS to simulate")
+    parser.add_argument("--rush", type=int, default=100, help="simultaneous sign-ins to simulate (0 skips)")
+    args = parser.parse_args()
+
+    print(f"Sizing {args.algorithm} to {args.target_ms:g} ms per hash on {os.cpu_count()} CPU(s):")
+    method, ms = size_cost(args.algorithm, args.target_ms, args.samples)
+    print(f"\nPASSWORD_HASH_METHOD={method}  ({ms:.0f} ms per hash)")
+    if args.rush:
+        elapsed, typical, worst = rush(method, args.workers, args.rush)
+        print(f"{args.rush} sign-ins at once on {args.workers} worker(s): done in {elapsed:.1f} s, "
+              f"median wait {typical:.0f} ms, last {worst:.0f} ms ({args.rush / elapsed:.1f} sign-ins/s)")
+
+if __name__ == "__main__":
+    main()
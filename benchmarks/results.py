@@ -0,0 +1,117 @@
+"""
+Benchmark results files, and a comparison that flags p95 regressions.
+
+benchmarks.routes and benchmarks.load both write one JSON object:
+
+    {"benchmark": "routes", "created_at": "...", "git_rev": "abc1234",
+     "python": "3.11.4", "params": {...},
+     "results": {"GET /admin/dashboard": {"count": 50, "errors": 0,
+                 "mean_ms": 8.1, "p50_ms": 7.9, "p95_ms": 9.6, "max_ms": 12.0}, ...}}
+
+A case regresses when its p95 grows by more than --threshold percent *and*
+by at least --min-ms, so sub-millisecond jitter on fast routes is not
+reported; new errors count as a regression too. Exits 1 if anything
+regressed, so it can gate CI.
+
+    python -m benchmarks.routes --json base.json      # on main
+    python -m benchmarks.routes --json head.json      # on the branch
+    python -m benchmarks.results base.json head.json --threshold 15
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from statistics import mean
+
+from perf import percentile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def summarize(latencies, errors=0):
+    """Result entry for one case from its latencies in ms."""
+    latencies = sorted(latencies)
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "mean_ms": round(mean(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+def git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save(path, benchmark, params, results):
+    with open(path, "w") as f:
+        json.dump({
+            "benchmark": benchmark,
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "git_rev": git_rev(),
+            "python": platform.python_version(),
+            "params": params,
+            "results": results,
+        }, f, indent=2)
+        f.write("\n")
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare(base, head, threshold, min_ms):
+    """[(case, base p95, head p95, change %, flag)] for every case in either run."""
+    rows = []
+    for case in sorted(set(base["results"]) | set(head["results"])):
+        old, new = base["results"].get(case), head["results"].get(case)
+        if old is None or new is None:
+            rows.append((case, old and old["p95_ms"], new and new["p95_ms"], None, "added" if old is None else "removed"))
+            continue
+        change = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        flag = ""
+        if new["errors"] > old["errors"]:
+            flag = "ERRORS"
+        elif change > threshold and new["p95_ms"] - old["p95_ms"] >= min_ms:
+            flag = "REGRESSED"
+        elif change < -threshold and old["p95_ms"] - new["p95_ms"] >= min_ms:
+            flag = "faster"
+        rows.append((case, old["p95_ms"], new["p95_ms"], change, flag))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base", help="results JSON of the reference run")
+    parser.add_argument("head", help="results JSON of the run under test")
+    parser.add_argument("--threshold", type=float, default=20.0, help="p95 growth in percent that counts as a regression")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore p95 changes smaller than this")
+    args = parser.parse_args()
+
+    base, head = load(args.base), load(args.head)
+    if base["benchmark"] != head["benchmark"]:
+        raise SystemExit(f"Cannot compare a {base['benchmark']} run with a {head['benchmark']} run.")
+    if base["params"] != head["params"]:
+        print(f"warning: runs used different parameters:\n  {base['params']}\n  {head['params']}", file=sys.stderr)
+
+    rows = compare(base, head, args.threshold, args.min_ms)
+    width = max([len(r[0]) for r in rows] + [4])
+    print(f"p95 ms, {base['git_rev'] or args.base} -> {head['git_rev'] or args.head}")
+    print(f"{'case':<{width}}{'base':>10}{'head':>10}{'change':>9}")
+    for case, old, new, change, flag in rows:
+        old_s = f"{old:.1f}" if old is not None else "-"
+        new_s = f"{new:.1f}" if new is not None else "-"
+        change_s = f"{change:+.0f}%" if change is not None else ""
+        print(f"{case:<{width}}{old_s:>10}{new_s:>10}{change_s:>9}  {flag}")
+    regressed = [r for r in rows if r[4] in ("REGRESSED", "ERRORS")]
+    print(f"\n{len(regressed)} regression(s) over {args.threshold:.0f}% and {args.min_ms:g} ms.")
+    if regressed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""
+Per-view micro-benchmarks through the Flask test client.
+
+Every view function has at least one case, run as the role that would call it
+(anonymous visitor, admin, teacher or parent) against a temporary database
+filled by benchmarks.seed_data. Each case is warmed up, then timed
+--iterations times. Cases that delete or need a fresh row get it from their
+prepare step, which runs outside the timed part, so every iteration does the
+same work. Endpoints without a case are listed at the end, so a new route
+does not slip through unbenchmarked.
+
+    python -m benchmarks.routes --iterations 50 --json routes.json
+    python -m benchmarks.routes --case /admin/ --payments 50000
+"""
+
+import argparse
+import io
+import os
+import random
+import tempfile
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from functools import partial
+from itertools import count
+from time import perf_counter
+from urllib.parse import urlencode
+
+from app import create_app
+from config import Config
+from models import db, ContactMessage, FeePayment, Marks, Student, Teacher, Visit, VisitSlot
+from thumbnails import thumbnail_path
+from views.admin import encode_student_cursor
+
+from . import results, seed_data
+
+# prepare(bench) runs before each request and returns extra path fields/form data
+Case = namedtuple("Case", "role method path data prepare status", defaults=(None, None, None))
+
+# Served by Flask/whitenoise-style file handlers rather than view code
+FILE_ENDPOINTS = {"static", "asset_file"}
+
+RECEIPT_BYTES = b"%PDF-1.4 benchmark receipt\n" + b"0" * 20_000
+
+def _payment(bench, **values):
+    row = dict(bench.ids["payer"], payment_month="April", amount=1500.0, paid=False)
+    row.update(values)
+    return FeePayment(**row)
+
+def new_payment(bench):
+    payment = _payment(bench)
+    db.session.add(payment)
+    db.session.commit()
+    return {"payment_id": payment.id}
+
+def unpaid_payments(bench, n=50):
+    payments = [_payment(bench) for _ in range(n)]
+    db.session.add_all(payments)
+    db.session.commit()
+    return {"data": {"payment_ids": [str(p.id) for p in payments]}}
+
+def new_visit(bench):
+    visit = Visit(student_name="Bench", parent_name="Bench", parent_phone="9000000000", student_class="5 - Section A",
+                  visit_date=date.today(), visit_time="10:00", purpose="Benchmark")
+    db.session.add(visit)
+    db.session.commit()
+    return {"visit_id": visit.id}
+
+def visit_booking(bench):
+    """A one-seat slot of its own, so every iteration books successfully."""
+    slot = VisitSlot(slot_date=date.today() + timedelta(days=400 + next(bench.serial)), start_time=time(10),
+                     end_time=time(11), capacity=1, booked=0)
+    db.session.add(slot)
+    db.session.commit()
+    return {"data": dict(VISIT_FORM, visit_date=slot.slot_date.isoformat(), visit_time="10:00 AM - 11:00 AM")}
+
+def new_contact(bench):
+    contact = ContactMessage(name="Bench", email="bench@example.com", message="Benchmark message")
+    db.session.add(contact)
+    db.session.commit()
+    return {"contact_id": contact.id}
+
+def new_student(bench):
+    n = next(bench.serial)
+    student = Student(admission_number=f"BENCH{n}", roll_no=f"BR{n}", name="Bench Student", student_class="5",
+                      section="A", parent_name="Bench", parent_phone="9000000000", admission_date=date(2024, 4, 1))
+    db.session.add(student)
+    db.session.commit()
+    return {"student_id": student.id}
+
+def new_teacher(bench):
+    n = next(bench.serial)
+    teacher = Teacher(teacher_id=f"BT{n}", name="Bench Teacher", password="x", assigned_class="5", assigned_section="A")
+    db.session.add(teacher)
+    db.session.commit()
+    return {"teacher_id": teacher.id}
+
+def new_mark(bench):
+    mark = Marks(student_id=bench.ids["parent_student_id"], teacher_id=bench.ids["teacher_pk"], subject="Science",
+                 exam_type="Quiz", marks_obtained=7, max_marks=10, exam_date=date(2024, 6, 1))
+    db.session.add(mark)
+    db.session.commit()
+    return {"mark_id": mark.id}
+
+def student_form(bench):
+    n = next(bench.serial)
+    return {"data": {"name": "Bench Student", "roll_no": f"BR{n}", "admission_number": f"BENCH{n}",
+                     "student_class": "5", "section": "A", "parent_name": "Bench",
+                     "parent_phone": "9000000000", "admission_date": "2024-04-01"}}
+
+def teacher_form(bench):
+    n = next(bench.serial)
+    return {"data": {"teacher_id": f"BT{n}", "name": "Bench Teacher", "password": "x",
+                     "assigned_class": "5", "assigned_section": "A"}}
+
+def students_csv(bench, rows=100):
+    start = next(bench.serial)
+    bench.serial = count(start + rows)
+    lines = ["name,roll_no,admission_number,student_class,section,parent_name,parent_phone,admission_date"]
+    lines += [f"Bench {n},BR{n},BENCH{n},6,B,Bench,9000000000,2024-04-01" for n in range(start, start + rows)]
+    return {"data": {"file": (io.BytesIO("\n".join(lines).encode()), "students.csv")}}
+
+def relogin(role, bench):
+    bench.login(role)
+    return {}
+
+# Defaults for the form posts; {placeholders} come from Bench.ids and prepare()
+CONTACT_FORM = {"name": "Bench", "email": "bench@example.com", "subject": "general", "message": "Benchmark message"}
+VISIT_FORM = {"student_name": "Bench", "parent_name": "Bench", "parent_phone": "9000000000", "student_class": "5",
+              "section": "A", "visit_date": "2025-01-15", "visit_time": "10:00", "purpose": "Benchmark"}
+FEE_FORM = {"student_name": "Bench", "roll_no": "BR0", "student_class": "5", "parent_name": "Bench",
+            "parent_phone": "9000000000", "payment_month": "April", "amount": "1500"}
+MARK_FORM = {"student_id": "{parent_student_id}", "subject": "Science", "exam_type": "Quiz",
+             "marks_obtained": "8", "max_marks": "10", "exam_date": "2024-06-01"}
+EDIT_FORM = {"subject": "Science", "exam_type": "Quiz", "marks_obtained": "9", "max_marks": "10",
+             "exam_date": "2024-06-01"}
+
+CASES = [
+    Case("anon", "GET", "/"),
+    Case("anon", "GET", "/about"),
+    Case("anon", "GET", "/contact"),
+    Case("anon", "POST", "/contact", CONTACT_FORM),
+    Case("anon", "GET", "/schedule_visit"),
+    Case("anon", "POST", "/schedule_visit", prepare=visit_booking),
+    Case("anon", "GET", "/schedule_visit/availability?days=14"),
+    Case("anon", "GET", "/fee"),
+    Case("anon", "POST", "/fee", FEE_FORM),
+    Case("anon", "GET", "/payment_history"),
+    Case("anon", "POST", "/payment_history", {"roll_no": "{parent_roll_no}"}, status=200),
+    Case("anon", "GET", "/admin/login"),
+    Case("anon", "GET", "/parent/login"),
+    Case("login", "POST", "/admin/login", "{admin_login}"),
+    Case("login", "POST", "/admin/login", "{teacher_login}"),
+    Case("login", "POST", "/parent/login", "{parent_login}"),
+
+    Case("admin", "GET", "/admin/dashboard"),
+    Case("admin", "GET", "/admin/dashboard?query=sharma"),
+    Case("admin", "GET", "/admin/dashboard?filter_class=5&filter_status=paid"),
+    Case("admin", "GET", "/admin/download_csv"),
+    Case("admin", "GET", "/admin/stats"),
+    Case("admin", "GET", "/admin/perf"),
+    Case("admin", "GET", "/admin/students"),
+    Case("admin", "GET", "/admin/students?filter_class=5"),
+    Case("admin", "GET", "/admin/student_details/{parent_student_id}"),
+    Case("admin", "GET", "/admin/api/roster"),
+    Case("admin", "GET", "/admin/api/roster/students?{roster_section}"),
+    Case("admin", "GET", "/admin/api/roster/students?{roster_section}&after={roster_cursor}"),
+    Case("admin", "GET", "/admin/visits"),
+    Case("admin", "GET", "/admin/contacts"),
+    Case("admin", "GET", "/admin/contacts?query=fee"),
+    Case("admin", "GET", "/admin/teachers"),
+    Case("admin", "GET", "/uploads/{receipt_filename}"),
+    Case("admin", "GET", "/receipts/{receipt_payment_id}"),
+    Case("admin", "POST", "/admin/mark_paid/{payment_id}", prepare=new_payment),
+    Case("admin", "POST", "/admin/delete/{payment_id}", prepare=new_payment),
+    Case("admin", "POST", "/admin/bulk_mark_paid", prepare=unpaid_payments),
+    Case("admin", "POST", "/admin/bulk_delete", prepare=unpaid_payments),
+    Case("admin", "POST", "/admin/add_student", prepare=student_form),
+    Case("admin", "POST", "/admin/delete_student/{student_id}", prepare=new_student),
+    Case("admin", "POST", "/admin/import/students?format=json", prepare=students_csv, status=200),
+    Case("admin", "POST", "/admin/update_visit_status/{visit_id}", {"status": "completed"}, prepare=new_visit),
+    Case("admin", "POST", "/admin/delete_visit/{visit_id}", prepare=new_visit),
+    Case("admin", "POST", "/admin/visit_slots", {"start_date": "{today}", "days": "14", "capacity": "3"}),
+    Case("admin", "POST", "/admin/delete_contact/{contact_id}", prepare=new_contact),
+    Case("admin", "POST", "/admin/add_teacher", prepare=teacher_form),
+    Case("admin", "POST", "/admin/delete_teacher/{teacher_id}", prepare=new_teacher),
+    Case("admin", "GET", "/admin/logout", status=302, prepare=partial(relogin, "admin")),
+
+    Case("teacher", "GET", "/teacher/dashboard"),
+    Case("teacher", "GET", "/teacher/students"),
+    Case("teacher", "GET", "/teacher/marks"),
+    Case("teacher", "GET", "/teacher/marks?filter_subject=Science"),
+    Case("teacher", "POST", "/teacher/marks", MARK_FORM),
+    Case("teacher", "GET", "/teacher/marks/grid"),
+    Case("teacher", "GET", "/teacher/marks/grid?subject=Science&exam_type=Quiz&exam_date=2024-06-01"),
+    Case("teacher", "POST", "/teacher/marks/grid", "{grid_form}"),
+    Case("teacher", "POST", "/teacher/marks/edit/{mark_id}", EDIT_FORM, prepare=new_mark),
+    Case("teacher", "POST", "/teacher/marks/delete/{mark_id}", prepare=new_mark),
+    Case("teacher", "GET", "/teacher/logout", status=302, prepare=partial(relogin, "teacher")),
+
+    Case("parent", "GET", "/parent/dashboard"),
+    Case("parent", "GET", "/receipts/{receipt_payment_id}/thumb"),
+    Case("parent", "GET", "/parent/logout", status=302, prepare=partial(relogin, "parent")),
+]
+
+def case_name(case):
+    return f"{case.method} {case.path}" + (f" {case.data}" if isinstance(case.data, str) else "")
+
+def _fill(value, fields):
+    if isinstance(value, str):
+        if value.startswith("{") and value.endswith("}") and value[1:-1] in fields:
+            return fields[value[1:-1]]  # whole form from the fixtures
+        return value.format(**fields)
+    if isinstance(value, dict):
+        return {k: _fill(v, fields) for k, v in value.items()}
+    return value
+
+class Bench:
+    """The app, one test client per role and the ids the cases refer to."""
+
+    def __init__(self, app):
+        self.app = app
+        self.clients = {}
+        self.serial = count(1)
+        self.ids = {}
+
+    def login(self, role):
+        client = self.clients.setdefault(role, self.app.test_client())
+        if role in ("admin", "teacher", "parent"):
+            path, form = {"admin": ("/admin/login", self.ids["admin_login"]),
+                          "teacher": ("/admin/login", self.ids["teacher_login"]),
+                          "parent": ("/parent/login", self.ids["parent_login"])}[role]
+            assert client.post(path, data=form).status_code == 302, f"{role} login failed"
+        return client
+
+    def setup_fixtures(self):
+        """Look up the seeded rows the cases use and give one payment a receipt on disk."""
+        admission_number, roll_no = seed_data.parent_login(0)
+        student = Student.query.filter_by(roll_no=roll_no).one()
+        teacher = Teacher.query.filter_by(teacher_id=seed_data.teacher_login(0)).one()
+        section = Student.query.filter_by(student_class=student.student_class, section=student.section).all()
+
+        digest = "ab" * 32
+        receipt = f"receipts/bench-{digest[:8]}.pdf"
+        for relative, body in ((receipt, RECEIPT_BYTES), (thumbnail_path(digest, "thumb"), b"\xff\xd8bench")):
+            path = os.path.join(self.app.config["UPLOAD_FOLDER"], relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(body)
+        grid = {"subject": "Science", "exam_type": "Unit Test", "exam_date": "2024-06-15", "max_marks": "50"}
+        grid.update({f"marks_{s.id}": str(20 + s.id % 30) for s in section})
+        self.ids.update({
+            "payer": {"student_name": student.name, "roll_no": roll_no, "student_class": student.student_class,
+                      "parent_name": student.parent_name, "parent_phone": student.parent_phone},
+            "parent_student_id": student.id, "parent_roll_no": roll_no, "teacher_pk": teacher.id,
+            "receipt_filename": receipt,
+            "admin_login": {"login_type": "admin", "username": self.app.config["ADMIN_USERNAME"],
+                            "password": self.app.config["ADMIN_PASSWORD"]},
+            "teacher_login": {"login_type": "teacher", "teacher_id": teacher.teacher_id,
+                              "password": seed_data.BENCH_PASSWORD},
+            "parent_login": {"admission_number": admission_number, "roll_number": roll_no},
+            "grid_form": grid, "today": date.today().isoformat(),
+            "roster_section": urlencode({"student_class": student.student_class, "section": student.section}),
+            "roster_cursor": encode_student_cursor(min(section, key=lambda s: (s.name, s.id))),
+        })
+        payment = _payment(self, receipt_filename=receipt, receipt_sha256=digest)
+        db.session.add(payment)
+        db.session.commit()
+        self.ids["receipt_payment_id"] = payment.id
+
+    def request(self, case):
+        """Time one request of case; returns (ms, ok)."""
+        with self.app.app_context():
+            extra = case.prepare(self) if case.prepare else {}
+            data = extra.pop("data", None) or _fill(case.data, dict(self.ids, **extra))
+            path = case.path.format(**dict(self.ids, **extra))
+        client = self.clients[case.role]
+        started = perf_counter()
+        response = client.open(path, method=case.method, data=data)
+        response.get_data()
+        elapsed = (perf_counter() - started) * 1000
+        expected = case.status or (302 if case.method == "POST" else 200)
+        return elapsed, response.status_code == expected
+
+def run(bench, cases, iterations, warmup):
+    out = {}
+    for case in cases:
+        for role in ("admin", "teacher", "parent"):
+            bench.login(role)  # a logout case may have ended the session
+        for _ in range(warmup):
+            bench.request(case)
+        latencies, errors = [], 0
+        for _ in range(iterations):
+            ms, ok = bench.request(case)
+            latencies.append(ms)
+            errors += not ok
+        out[case_name(case)] = results.summarize(latencies, errors)
+    return out
+
+def uncovered(app, cases):
+    """Endpoints of app that no case reaches."""
+    adapter = app.url_map.bind("localhost")
+    reached = {adapter.match(c.path.split("?")[0].format_map(_AnyId()), method=c.method)[0] for c in cases}
+    return sorted({rule.endpoint for rule in app.url_map.iter_rules()} - reached - FILE_ENDPOINTS)
+
+class _AnyId(dict):
+    def __missing__(self, key):
+        return "1" if key.endswith("_id") else "x"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=30, help="timed requests per case")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed requests per case first")
+    parser.add_argument("--case", action="append", help="only cases whose name contains this (repeatable)")
+    parser.add_argument("--json", metavar="PATH", help="also write results to PATH (see benchmarks.results)")
+    for name, default in seed_data.VOLUMES.items():
+        parser.add_argument(f"--{name}", type=int, default=default, help=f"seeded rows (default {default})")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cases = [c for c in CASES if not args.case or any(s in case_name(c) for s in args.case)]
+    volumes = {name: getattr(args, name) for name in seed_data.VOLUMES}
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            UPLOAD_FOLDER = os.path.join(tmp, "uploads")
+            JINJA_BYTECODE_CACHE_DIR = None
+            PAGE_CACHE_DIR = None
+            WRITE_BEHIND = False
+            SLOW_QUERY_THRESHOLD_MS = float("inf")
+
+        app = create_app(BenchConfig)
+        bench = Bench(app)
+        with app.app_context():
+            seed_data.reset_database()
+            seed_data.seed(volumes, random.Random(args.seed))
+            bench.setup_fixtures()
+        for role in ("anon", "login", "admin", "teacher", "parent"):
+            bench.login(role)
+        started = datetime.now()
+        out = run(bench, cases, args.iterations, args.warmup)
+        elapsed = (datetime.now() - started).total_seconds()
+        with app.app_context():
+            db.engine.dispose()
+
+    params = dict(volumes, iterations=args.iterations, warmup=args.warmup, seed=args.seed)
+    if args.json:
+        results.save(args.json, "routes", params, out)
+    width = max(len(name) for name in out)
+    print(f"{len(out)} cases x {args.iterations} requests in {elapsed:.0f} s (ms)")
+    print(f"{'case':<{width}}{'p50':>9}{'p95':>9}{'max':>9}{'errors':>8}")
+    for name, r in out.items():
+        print(f"{name:<{width}}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['max_ms']:>9.1f}{r['errors']:>8}")
+    missing = uncovered(app, CASES)
+    if missing:
+        print(f"\nNo benchmark case for: {', '.join(missing)}")
+
+if __name__ == "__main__":
+    main()
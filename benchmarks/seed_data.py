@@ -0,0 +1,179 @@
+"""
+Synthetic school data for the route and load benchmarks.
+
+Fills the app's database (navyug.db unless DATABASE_URL points elsewhere)
+with students, teachers, fee payments, marks, visits and contact messages in
+the volumes given. Rows go in as executemany INSERTs of BULK_CHUNK_SIZE, so
+the search triggers and report cards see exactly what the app would have
+written, and the same --seed always produces the same data.
+
+Visit slots are opened for the next four weeks. Logins are predictable so
+the benchmarks can use them: teacher n is teacher_login(n) with password
+BENCH_PASSWORD (stored hashed, as the app would), and the parent of student n signs in with parent_login(n).
+Teacher n teaches section n of SECTIONS (wrapping round), and students are
+spread over the taught sections.
+
+    python -m benchmarks.seed_data --reset --students 2000 --payments 20000
+"""
+
+import argparse
+import random
+from datetime import date, datetime, timedelta
+from itertools import product
+from time import perf_counter
+
+from sqlalchemy import text
+
+from app import create_app
+import passwords
+import report_cards
+import visit_slots
+from helpers import BULK_CHUNK_SIZE, chunked
+from models import db, ContactMessage, FeePayment, Marks, Student, Teacher, Visit
+from search import SEARCH_COLUMNS, install_search_index
+from views.admin import VISIT_STATUSES
+from views.teacher import EXAM_TYPES
+
+VOLUMES = {
+    "students": 1000,
+    "teachers": 24,
+    "payments": 10000,
+    "marks": 20000,
+    "visits": 1000,
+    "contacts": 1000,
+}
+
+BENCH_PASSWORD = "bench-password"
+SECTIONS = [(str(c), s) for c, s in product(range(1, 13), "AB")]
+SUBJECTS = ["Mathematics", "Science", "English", "Hindi", "Social Studies", "Computer"]
+MONTHS = ["April", "May", "June", "July", "August", "September", "October",
+          "November", "December", "January", "February", "March"]
+CONTACT_SUBJECTS = ["admission", "fee", "transport", "general"]
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Kavya", "Vivaan", "Anaya", "Reyansh", "Saanvi", "Arjun", "Myra"]
+LAST_NAMES = ["Sharma", "Verma", "Gupta", "Patel", "Singh", "Kumar", "Yadav", "Mehta", "Joshi", "Rao"]
+
+def teacher_login(n):
+    return f"T{n:04d}"
+
+def parent_login(n):
+    """(admission_number, roll_no) of student n."""
+    return f"ADM{n:06d}", f"R{n:06d}"
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def _insert(model, rows):
+    for chunk in chunked(rows, BULK_CHUNK_SIZE):
+        db.session.execute(db.insert(model), chunk)
+
+def reset_database():
+    """Drop and recreate every table and the search indexes."""
+    db.drop_all()
+    if db.engine.dialect.name == "sqlite":
+        for tablename in SEARCH_COLUMNS:
+            db.session.execute(text(f"DROP TABLE IF EXISTS {tablename}_fts"))
+        db.session.commit()
+    db.create_all()
+    if db.engine.dialect.name == "sqlite":
+        conn = db.engine.raw_connection()
+        try:
+            install_search_index(conn.cursor())
+            conn.commit()
+        finally:
+            conn.close()
+
+def seed(volumes, rng):
+    """Insert the given row counts into an empty database; returns seconds taken."""
+    started = perf_counter()
+    now = datetime.utcnow()
+    sections = SECTIONS[:max(1, min(volumes["teachers"], len(SECTIONS)))]
+
+    hashes = passwords.hasher().hash_many([BENCH_PASSWORD] * volumes["teachers"])
+    _insert(Teacher, [{
+        "teacher_id": teacher_login(n), "name": _name(rng), "password": hashes[n],
+        "assigned_class": SECTIONS[n % len(SECTIONS)][0], "assigned_section": SECTIONS[n % len(SECTIONS)][1],
+        "email": f"{teacher_login(n).lower()}@example.com", "created_at": now,
+    } for n in range(volumes["teachers"])])
+
+    students = []
+    for n in range(volumes["students"]):
+        student_class, section = sections[n % len(sections)]
+        admission_number, roll_no = parent_login(n)
+        students.append({
+            "admission_number": admission_number, "roll_no": roll_no, "name": _name(rng),
+            "student_class": student_class, "section": section, "parent_name": _name(rng),
+            "parent_phone": f"9{rng.randrange(10 ** 9):09d}",
+            "admission_date": date(2024, 4, 1) - timedelta(days=rng.randrange(2000)),
+        })
+    _insert(Student, students)
+
+    student_ids = dict(db.session.query(Student.roll_no, Student.id))
+    teacher_ids = {(t.assigned_class, t.assigned_section): t.id for t in
+                   db.session.query(Teacher.id, Teacher.assigned_class, Teacher.assigned_section)}
+
+    _insert(FeePayment, [dict(
+        student_name=s["name"], roll_no=s["roll_no"], student_class=s["student_class"],
+        parent_name=s["parent_name"], parent_phone=s["parent_phone"], payment_month=rng.choice(MONTHS),
+        amount=float(rng.choice([1200, 1500, 1800, 2500])), paid=rng.random() < 0.6,
+        submitted_at=now - timedelta(minutes=rng.randrange(365 * 24 * 60)),
+    ) for s in (rng.choice(students) for _ in range(volumes["payments"] if students else 0))])
+
+    marks = []
+    for _ in range(volumes["marks"] if students and teacher_ids else 0):
+        s = rng.choice(students)
+        max_marks = rng.choice([25.0, 50.0, 100.0])
+        marks.append({
+            "student_id": student_ids[s["roll_no"]], "teacher_id": teacher_ids[(s["student_class"], s["section"])],
+            "subject": rng.choice(SUBJECTS), "exam_type": rng.choice(EXAM_TYPES),
+            "marks_obtained": float(round(max_marks * rng.uniform(0.3, 1.0))), "max_marks": max_marks,
+            "exam_date": date(2024, 4, 1) + timedelta(days=rng.randrange(300)), "remarks": "", "uploaded_at": now,
+        })
+    _insert(Marks, marks)
+
+    _insert(Visit, [{
+        "student_name": _name(rng), "parent_name": _name(rng), "parent_phone": f"9{rng.randrange(10 ** 9):09d}",
+        "student_class": f"{rng.randrange(1, 13)} - Section {rng.choice('AB')}",
+        "visit_date": date.today() + timedelta(days=rng.randrange(-60, 60)),
+        "visit_time": f"{rng.randrange(9, 15)}:00", "purpose": "Admission enquiry",
+        "status": rng.choice(VISIT_STATUSES), "submitted_at": now - timedelta(minutes=rng.randrange(90 * 24 * 60)),
+    } for _ in range(volumes["visits"])])
+
+    _insert(ContactMessage, [{
+        "name": _name(rng), "email": f"parent{n}@example.com", "phone": f"9{rng.randrange(10 ** 9):09d}",
+        "subject": rng.choice(CONTACT_SUBJECTS), "message": f"Question {n} about {rng.choice(SUBJECTS).lower()} classes.",
+        "submitted_at": now - timedelta(minutes=rng.randrange(180 * 24 * 60)),
+    } for n in range(volumes["contacts"])])
+
+    if volumes["visits"]:
+        visit_slots.open_slots(date.today(), 28, capacity=3)
+    report_cards.rebuild_all()
+    db.session.commit()
+    if db.engine.dialect.name == "sqlite":
+        db.session.execute(text("ANALYZE"))
+        db.session.commit()
+    return perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    for name, default in VOLUMES.items():
+        parser.add_argument(f"--{name}", type=int, default=default, help=f"rows to create (default {default})")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="drop every table first (required if there are students)")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        print(f"Database: {db.engine.url}")
+        if args.reset:
+            reset_database()
+        else:
+            db.create_all()
+            if db.session.query(Student.id).first() is not None:
+                raise SystemExit("The database already has students; pass --reset to replace everything.")
+        volumes = {name: getattr(args, name) for name in VOLUMES}
+        elapsed = seed(volumes, random.Random(args.seed))
+    print(", ".join(f"{count} {name}" for name, count in volumes.items()) + f" in {elapsed:.1f} s")
+    print(f"Teacher login: {teacher_login(0)} / {BENCH_PASSWORD}; parent login: {' / '.join(parent_login(0))}")
+
+if __name__ == "__main__":
+    main()
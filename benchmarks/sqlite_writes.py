@@ -0,0 +1,119 @@
+"""
+Concurrent write throughput with SQLite's defaults vs the tuned profile.
+
+Writer threads insert fee payments one transaction at a time, the way
+fee_form() does, while reader threads page through the dashboard. Each
+profile gets a fresh database file with the app's schema and search triggers.
+
+    python -m benchmarks.sqlite_writes --writers 8 --writes 200 --readers 4
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+from datetime import datetime
+from time import perf_counter
+
+from sqlalchemy import create_engine, exc, func, insert, select
+
+from models import FeePayment, db
+from config import Config
+from perf import percentile
+from search import install_search_index
+import sqlite_profile
+
+PROFILES = {
+    "default": {},
+    "tuned": Config.SQLITE_PRAGMAS,
+}
+
+def make_engine(path, pragmas):
+    engine = create_engine(f"sqlite:///{path}", pool_size=32, max_overflow=0)
+    if pragmas:
+        sqlite_profile.install(engine, pragmas)
+    db.metadata.create_all(engine)
+    raw = engine.raw_connection()
+    try:
+        install_search_index(raw.cursor())
+        raw.commit()
+    finally:
+        raw.close()
+    return engine
+
+def writer(engine, worker, writes, latencies, errors):
+    table = FeePayment.__table__
+    for i in range(writes):
+        row = {
+            "student_name": f"Student {worker}-{i}", "roll_no": f"R{worker}-{i}", "student_class": "5",
+            "parent_name": "Parent", "parent_phone": "9999999999", "payment_month": "April",
+            "amount": 1500.0, "paid": False, "submitted_at": datetime.utcnow(),
+        }
+        started = perf_counter()
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(table), row)
+        except exc.OperationalError:
+            errors.append(worker)  # "database is locked"
+            continue
+        latencies.append((perf_counter() - started) * 1000)
+
+def reader(engine, stop, reads, errors):
+    table = FeePayment.__table__
+    while not stop.is_set():
+        try:
+            with engine.connect() as conn:
+                conn.execute(select(func.count()).select_from(table)).scalar()
+                conn.execute(select(table).order_by(table.c.submitted_at.desc(), table.c.id.desc()).limit(50)).all()
+            reads.append(1)
+        except exc.OperationalError:
+            errors.append("reader")
+
+def run(profile, pragmas, writers, writes, readers):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, "bench.db"), pragmas)
+        latencies, write_errors, reads, read_errors = [], [], [], []
+        stop = threading.Event()
+        reader_threads = [threading.Thread(target=reader, args=(engine, stop, reads, read_errors))
+                          for _ in range(readers)]
+        writer_threads = [threading.Thread(target=writer, args=(engine, w, writes, latencies, write_errors))
+                          for w in range(writers)]
+        for t in reader_threads:
+            t.start()
+        started = perf_counter()
+        for t in writer_threads:
+            t.start()
+        for t in writer_threads:
+            t.join()
+        elapsed = perf_counter() - started
+        stop.set()
+        for t in reader_threads:
+            t.join()
+        engine.dispose()
+    latencies.sort()
+    return {
+        "profile": profile,
+        "commits_per_s": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "locked": len(write_errors),
+        "reads_per_s": len(reads) / elapsed,
+        "read_errors": len(read_errors),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200, help="inserts per writer")
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers x {args.writes} inserts, {args.readers} readers")
+    print(f"{'profile':<10}{'commits/s':>11}{'p50 ms':>9}{'p95 ms':>9}{'locked':>8}{'reads/s':>10}{'read err':>10}")
+    for profile, pragmas in PROFILES.items():
+        r = run(profile, pragmas, args.writers, args.writes, args.readers)
+        print(f"{r['profile']:<10}{r['commits_per_s']:>11.0f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+              f"{r['locked']:>8}{r['reads_per_s']:>10.0f}{r['read_errors']:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Build the static assets served from static/dist/ (see assets.py).
+
+1. Tailwind: compile static/src/tailwind.css, which pulls in css/site.css,
+   with tailwind.config.js, so only the classes used in templates/ and
+   static/js/ are emitted, minified.
+2. Icons: cut Font Awesome's all.min.css down to the icons the templates
+   use, and subset its fonts to those glyphs when fontTools is installed.
+3. Fingerprint every output as name.<hash>.ext, write .gz (and .br when the
+   brotli module is installed) next to each text asset, and record the
+   mapping in static/dist/manifest.json.
+
+Needs the tools in package.json (`npm install`), or TAILWIND_CLI pointing at
+the standalone tailwindcss binary. Restart the app and run
+`flask clear-page-cache` afterwards so pages pick up the new file names.
+
+Usage: python build_assets.py [--fontawesome-dir DIR] [--clean]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # optional; gzip variants are always written
+    brotli = None
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+SCAN_DIRS = (os.path.join(BASE_DIR, "templates"), os.path.join(STATIC_DIR, "js"))
+FONTAWESOME_DIR = os.path.join(BASE_DIR, "node_modules", "@fortawesome", "fontawesome-free")
+# Copied into the build unchanged
+PLAIN_ASSETS = ("js/site.js",)
+COMPRESSIBLE = (".css", ".js", ".svg", ".json")
+HASH_LENGTH = 12
+
+ICON_CLASS = re.compile(r"\bfa-[a-z0-9]+(?:-[a-z0-9]+)*")
+ICON_STYLE = re.compile(r"\b(fas|far|fab|fa-solid|fa-regular|fa-brands)\b")
+# `.fa-check:before,.fa-tick:before{content:"\f00c"}`
+ICON_RULE = re.compile(r'((?:\.fa-[a-z0-9-]+::?before,?)+)\{content:"\\([0-9a-f]+)"\}')
+FONT_FACE = re.compile(r"@font-face\{[^}]*\}")
+FONT_FILES = {
+    "fa-solid-900": ("fas", "fa-solid"),
+    "fa-regular-400": ("far", "fa-regular"),
+    "fa-brands-400": ("fab", "fa-brands"),
+}
+
+def used_icon_classes():
+    """fa-* classes and style prefixes (fas, fab, ...) used in templates and scripts."""
+    classes, styles = set(), set()
+    for directory in SCAN_DIRS:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith((".html", ".js")):
+                    with open(os.path.join(root, name), encoding="utf-8") as f:
+                        text = f.read()
+                    classes.update(ICON_CLASS.findall(text))
+                    styles.update(ICON_STYLE.findall(text))
+    return classes, styles
+
+def build_tailwind(output):
+    cli = os.environ.get("TAILWIND_CLI")
+    command = shlex.split(cli) if cli else [os.path.join(BASE_DIR, "node_modules", ".bin", "tailwindcss")]
+    if not shutil.which(command[0]):
+        raise SystemExit("tailwindcss not found: run `npm install` or set TAILWIND_CLI")
+    subprocess.run(
+        command + ["-c", "tailwind.config.js", "-i", "static/src/tailwind.css", "-o", output, "--minify"],
+        cwd=BASE_DIR, check=True,
+    )
+
+def build_icons(fontawesome_dir, css_output, fonts_dir):
+    """Write the trimmed icon CSS and its fonts; returns (icons kept, fonts subset?)."""
+    classes, styles = used_icon_classes()
+    with open(os.path.join(fontawesome_dir, "css", "all.min.css"), encoding="utf-8") as f:
+        css = f.read()
+
+    codepoints = set()
+    def keep_used_icon(match):
+        names = {selector.split(":")[0][1:] for selector in match.group(1).split(",") if selector}
+        if names & classes:
+            codepoints.add(int(match.group(2), 16))
+            return match.group(0)
+        return ""
+    css = ICON_RULE.sub(keep_used_icon, css)
+
+    fonts = {font for font, prefixes in FONT_FILES.items() if styles.intersection(prefixes)}
+    def keep_used_face(match):
+        face = match.group(0)
+        font = re.search(r"webfonts/([a-z0-9-]+)\.woff2", face)
+        # Only the v6 families; the v4/v5 compatibility faces are not used here
+        if '"Font Awesome 6' not in face or not font or font.group(1) not in fonts:
+            return ""
+        return re.sub(r"src:[^;}]+", f'src:url(../webfonts/{font.group(1)}.woff2) format("woff2")', face)
+    css = FONT_FACE.sub(keep_used_face, css)
+
+    with open(css_output, "w", encoding="utf-8") as f:
+        f.write(css)
+    os.makedirs(fonts_dir, exist_ok=True)
+    subset = False
+    for font in sorted(fonts):
+        source = os.path.join(fontawesome_dir, "webfonts", f"{font}.woff2")
+        subset = subset_font(source, os.path.join(fonts_dir, f"{font}.woff2"), codepoints)
+    return len(codepoints), subset
+
+def subset_font(source, target, codepoints):
+    """Keep only the glyphs for codepoints; copies the font whole without fontTools/brotli."""
+    try:
+        from fontTools import subset
+        options = subset.Options()
+        options.flavor = "woff2"
+        font = subset.load_font(source, options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        subset.save_font(font, target, options)
+        return True
+    except ImportError:
+        shutil.copyfile(source, target)
+        return False
+
+def precompress(path, data):
+    variants = [(".gz", gzip.compress(data, 9, mtime=0))]
+    if brotli:
+        variants.append((".br", brotli.compress(data, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            with open(path + suffix, "wb") as f:
+                f.write(compressed)
+
+def fingerprint(staging, relative, data=None):
+    """Copy staging/relative into DIST_DIR as name.<hash>.ext; returns the hashed name."""
+    if data is None:
+        with open(os.path.join(staging, relative), "rb") as f:
+            data = f.read()
+    stem, ext = os.path.splitext(relative)
+    hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+    target = os.path.join(DIST_DIR, *hashed.split("/"))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(data)
+    if ext in COMPRESSIBLE:
+        precompress(target, data)
+    return hashed
+
+def clean(manifest):
+    """Remove built files that the new manifest no longer refers to."""
+    keep = {"manifest.json"}
+    for hashed in manifest.values():
+        keep.update({hashed, hashed + ".gz", hashed + ".br"})
+    for root, _, files in os.walk(DIST_DIR):
+        for name in files:
+            relative = os.path.relpath(os.path.join(root, name), DIST_DIR).replace(os.sep, "/")
+            if relative not in keep:
+                os.remove(os.path.join(root, name))
+
+def build(fontawesome_dir, clean_old=False):
+    manifest = {}
+    with tempfile.TemporaryDirectory() as staging:
+        for sub in ("css", "js", "webfonts"):
+            os.makedirs(os.path.join(staging, sub))
+        build_tailwind(os.path.join(staging, "css", "app.css"))
+        icons, subset = build_icons(fontawesome_dir, os.path.join(staging, "css", "icons.css"),
+                                    os.path.join(staging, "webfonts"))
+        for relative in PLAIN_ASSETS:
+            shutil.copyfile(os.path.join(STATIC_DIR, *relative.split("/")), os.path.join(staging, *relative.split("/")))
+
+        # Fonts first: icons.css must point at their hashed names
+        for name in sorted(os.listdir(os.path.join(staging, "webfonts"))):
+            manifest[f"webfonts/{name}"] = fingerprint(staging, f"webfonts/{name}")
+        with open(os.path.join(staging, "css", "icons.css"), encoding="utf-8") as f:
+            icons_css = f.read()
+        for source, hashed in manifest.items():
+            icons_css = icons_css.replace(f"../{source}", f"../{hashed}")
+        manifest["css/icons.css"] = fingerprint(staging, "css/icons.css", icons_css.encode("utf-8"))
+        manifest["css/app.css"] = fingerprint(staging, "css/app.css")
+        for relative in PLAIN_ASSETS:
+            manifest[relative] = fingerprint(staging, relative)
+
+    with open(os.path.join(DIST_DIR, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    if clean_old:
+        clean(manifest)
+
+    print(f"✓ {icons} icon(s) kept" + ("; fonts subset" if subset else "; fonts copied whole (install fonttools + brotli to subset)"))
+    for source, hashed in sorted(manifest.items()):
+        size = os.path.getsize(os.path.join(DIST_DIR, *hashed.split("/")))
+        gz = os.path.join(DIST_DIR, *hashed.split("/")) + ".gz"
+        note = f", gzip {os.path.getsize(gz) / 1024:.1f} KB" if os.path.exists(gz) else ""
+        print(f"  {source} -> {hashed} ({size / 1024:.1f} KB{note})")
+    print("\n✅ Assets built. Restart the app and run `flask clear-page-cache`.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build fingerprinted, precompressed static assets.")
+    parser.add_argument("--fontawesome-dir", default=FONTAWESOME_DIR,
+                        help="Font Awesome Free package (default: node_modules/@fortawesome/fontawesome-free)")
+    parser.add_argument("--clean", action="store_true", help="delete files from earlier builds")
+    args = parser.parse_args()
+    if not os.path.isfile(os.path.join(args.fontawesome_dir, "css", "all.min.css")):
+        sys.exit(f"Font Awesome not found in {args.fontawesome_dir}: run `npm install`")
+    build(args.fontawesome_dir, args.clean)
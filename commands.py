@@ -0,0 +1,210 @@
+"""
+`flask` maintenance commands.
+
+Only the models, the engine and the app config are imported up front; each
+command imports the rest of what it needs (password hashing, CSV import,
+report cards, thumbnails, ...) when it runs.
+"""
+
+import os
+from datetime import date, datetime, timedelta
+from functools import partial
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from jinja2 import TemplateSyntaxError
+
+from models import db, FeePayment, ReceiptThumbnail, Teacher
+
+@click.command("import-csv")
+# csv_import.IMPORT_KINDS, spelled out so csv_import loads only when the command runs
+@click.argument("kind", type=click.Choice(('students', 'teachers', 'marks')))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@with_appcontext
+def import_csv_command(kind, path):
+    """Bulk-import students, teachers or marks from a CSV file."""
+    from csv_import import import_csv
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        report = import_csv(kind, f)
+    click.echo(f"Imported {report['inserted']} {kind}.")
+    for error in report['errors']:
+        click.echo(f"Row {error['row']}: {error['error']}", err=True)
+
+@click.command("receipt-thumbnails")
+@click.option("--stale-minutes", default=10, show_default=True,
+              help="Treat jobs left running this long (e.g. by a killed worker) as pending again.")
+@with_appcontext
+def receipt_thumbnails_command(stale_minutes):
+    """Queue thumbnails for receipts that have none, retry failures and run pending jobs."""
+    from helpers import run_thumbnail_job
+
+    have_job = db.session.query(ReceiptThumbnail.receipt_sha256)
+    missing = (db.session.query(FeePayment.receipt_sha256, db.func.min(FeePayment.receipt_filename))
+               .filter(FeePayment.receipt_sha256.isnot(None), FeePayment.receipt_sha256.notin_(have_job))
+               .group_by(FeePayment.receipt_sha256).all())
+    db.session.add_all(ReceiptThumbnail(receipt_sha256=digest, receipt_filename=filename)
+                       for digest, filename in missing)
+    stale_before = datetime.utcnow() - timedelta(minutes=stale_minutes)
+    retried = db.session.execute(
+        db.update(ReceiptThumbnail)
+        .where(db.or_(
+            db.and_(ReceiptThumbnail.status == 'running', ReceiptThumbnail.updated_at < stale_before),
+            db.and_(ReceiptThumbnail.status == 'failed',
+                    ReceiptThumbnail.attempts < current_app.config['THUMBNAIL_MAX_ATTEMPTS']),
+        ))
+        .values(status='pending')
+    ).rowcount
+    db.session.commit()
+    click.echo(f"Queued {len(missing)} new and {retried} retried job(s).")
+
+    pending = [d for (d,) in db.session.query(ReceiptThumbnail.receipt_sha256).filter_by(status='pending')]
+    outcomes = {}
+    pool = current_app.extensions['thumbnail_pool']
+    for status in pool.map(partial(run_thumbnail_job, current_app._get_current_object()), pending):
+        if status:
+            outcomes[status] = outcomes.get(status, 0) + 1
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(outcomes.items()))
+    click.echo(f"Processed {len(pending)} job(s){': ' + summary if summary else ''}.")
+
+@click.command("drain-ingest-queue")
+@with_appcontext
+def drain_ingest_queue_command():
+    """Commit everything left in the write-behind queue, even with WRITE_BEHIND off."""
+    from helpers import drain_ingest_queue
+    from write_behind import IngestQueue
+
+    path = current_app.config['WRITE_BEHIND_QUEUE']
+    queue = current_app.extensions.get('ingest_queue')
+    if queue is None and not os.path.exists(path):
+        click.echo("No write-behind queue found.")
+        return
+    queue = queue or IngestQueue(path)
+    app = current_app._get_current_object()
+    total = 0
+    while True:
+        taken = drain_ingest_queue(app, queue)
+        if not taken:
+            break
+        total += taken
+    click.echo(f"Ingested {total} queued submission(s).")
+
+@click.command("report-cards")
+@with_appcontext
+def report_cards_command():
+    """Rebuild the mark_summary report-card table for every section."""
+    import report_cards
+
+    started = datetime.now()
+    rows = report_cards.rebuild_all()
+    db.session.commit()
+    elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+    click.echo(f"Rebuilt {rows} report-card row(s) in {elapsed_ms:.0f} ms.")
+
+@click.command("open-visit-slots")
+@click.option("--days", default=28, show_default=True, help="Days ahead, starting today.")
+@click.option("--capacity", default=3, show_default=True, help="Seats per new slot.")
+@click.option("--saturdays", is_flag=True, help="Open Saturdays as well as Monday to Friday.")
+@with_appcontext
+def open_visit_slots_command(days, capacity, saturdays):
+    """Open the default visit times for the coming days; existing slots are kept."""
+    import visit_slots
+
+    created = visit_slots.open_slots(date.today(), days, capacity, weekdays=range(6) if saturdays else range(5))
+    db.session.commit()
+    click.echo(f"Opened {created} visit slot(s).")
+
+@click.command("precompile-templates")
+@with_appcontext
+def precompile_templates_command():
+    """Compile every template into the Jinja bytecode cache; run once per deploy."""
+    jinja_env = current_app.jinja_env
+    cache = jinja_env.bytecode_cache
+    if cache is None:
+        click.echo("JINJA_BYTECODE_CACHE_DIR is not set; nothing to do.")
+        return
+    started = datetime.now()
+    names = jinja_env.list_templates(extensions=['html'])
+    failed = 0
+    for name in names:
+        try:
+            jinja_env.get_template(name)
+        except TemplateSyntaxError as e:
+            failed += 1
+            click.echo(f"{name}:{e.lineno}: {e.message}", err=True)
+    elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+    click.echo(f"Compiled {len(names) - failed} template(s) into {cache.directory} in {elapsed_ms:.0f} ms.")
+    if failed:
+        raise SystemExit(1)
+
+@click.command("clear-page-cache")
+@with_appcontext
+def clear_page_cache_command():
+    """Drop every cached public page, in every worker using this PAGE_CACHE_STAMP."""
+    current_app.extensions['page_cache'].invalidate()
+    click.echo(f"Page cache cleared; workers drop their copies on their next request "
+               f"(stamp {current_app.config['PAGE_CACHE_STAMP']}).")
+
+@click.command("hash-passwords")
+@click.option("--batch-size", default=200, show_default=True, help="Teachers hashed per transaction.")
+@with_appcontext
+def hash_passwords_command(batch_size):
+    """Replace every plaintext teacher password with a hash (sign-in also does it one by one)."""
+    import passwords
+
+    hasher = passwords.hasher()
+    teachers = [t for t in Teacher.query.all() if not passwords.is_hashed(t.password)]
+    for i in range(0, len(teachers), batch_size):
+        batch = teachers[i:i + batch_size]
+        for teacher, hashed in zip(batch, hasher.hash_many([t.password for t in batch])):
+            teacher.password = hashed
+        db.session.commit()
+    click.echo(f"Hashed {len(teachers)} plaintext password(s) with {hasher.method}.")
+
+@click.command("hash-password")
+@click.password_option()
+@with_appcontext
+def hash_password_command(password):
+    """Print a hash of a password, e.g. for ADMIN_PASSWORD_HASH."""
+    import passwords
+
+    click.echo(passwords.hash_password(password))
+
+@click.command("sqlite-maintenance")
+@with_appcontext
+def sqlite_maintenance_command():
+    """Checkpoint and truncate the WAL, then run PRAGMA optimize."""
+    import sqlite_profile
+
+    if db.engine.dialect.name != "sqlite":
+        click.echo("Not an SQLite database; nothing to do.")
+        return
+    with db.engine.connect() as conn:
+        settings = sqlite_profile.current_pragmas(conn, current_app.config['SQLITE_PRAGMAS'])
+        busy, wal_frames, checkpointed = sqlite_profile.maintenance(conn)
+    click.echo(", ".join(f"{name}={value}" for name, value in settings.items()))
+    if wal_frames < 0:
+        click.echo("Not in WAL mode; statistics refreshed.")
+    elif busy:
+        click.echo(f"Checkpoint incomplete: a reader held the WAL ({checkpointed}/{wal_frames} frames).", err=True)
+    else:
+        click.echo(f"Checkpointed {checkpointed} WAL frame(s); statistics refreshed.")
+
+COMMANDS = (
+    import_csv_command,
+    receipt_thumbnails_command,
+    drain_ingest_queue_command,
+    report_cards_command,
+    open_visit_slots_command,
+    precompile_templates_command,
+    clear_page_cache_command,
+    hash_passwords_command,
+    hash_password_command,
+    sqlite_maintenance_command,
+)
+
+def init_app(app):
+    """Add the maintenance commands to app's `flask` CLI."""
+    for command in COMMANDS:
+        app.cli.add_command(command)
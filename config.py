@@ -9,7 +9,66 @@ class Config:
         "sqlite:///" + os.path.join(BASE_DIR, "navyug.db")
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Applied to every SQLite connection (see sqlite_profile.py); SQLITE_PROFILE=off keeps SQLite's defaults.
+    # busy_timeout comes first so the switch to WAL waits for locks too.
+    SQLITE_PRAGMAS = {} if os.environ.get("SQLITE_PROFILE") == "off" else {
+        "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": "NORMAL",  # durable under WAL except across power loss
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_BYTES", 256 * 1024 * 1024)),
+        "cache_size": -int(os.environ.get("SQLITE_CACHE_KB", 32 * 1024)),  # negative means KiB
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    }
     UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
     ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "pdf"}
+    MAX_RECEIPT_BYTES = int(os.environ.get("MAX_RECEIPT_BYTES", 5 * 1024 * 1024))
+    # Internal nginx location mapped to UPLOAD_FOLDER, e.g. "/protected-uploads";
+    # when set, receipts are sent with X-Accel-Redirect instead of by Flask
+    RECEIPT_ACCEL_REDIRECT = os.environ.get("RECEIPT_ACCEL_REDIRECT")
+    USE_X_SENDFILE = os.environ.get("USE_X_SENDFILE") == "1"  # Apache/lighttpd X-Sendfile
+    # Background threads rendering receipt thumbnails/previews
+    THUMBNAIL_WORKERS = int(os.environ.get("THUMBNAIL_WORKERS", 2))
+    THUMBNAIL_MAX_ATTEMPTS = int(os.environ.get("THUMBNAIL_MAX_ATTEMPTS", 3))
+    # Queue public form posts and commit them in batches from one writer thread (see write_behind.py)
+    WRITE_BEHIND = os.environ.get("WRITE_BEHIND") == "1"
+    WRITE_BEHIND_QUEUE = os.environ.get("WRITE_BEHIND_QUEUE", os.path.join(BASE_DIR, "ingest_queue.db"))
+    WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("WRITE_BEHIND_BATCH_SIZE", 200))
+    # Cache for the anonymous public pages (see page_cache.py). PAGE_CACHE_DIR shares
+    # entries between worker processes; unset keeps them per process.
+    PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE", "1") != "0"
+    PAGE_CACHE_TTL = int(os.environ.get("PAGE_CACHE_TTL", 600))  # seconds
+    PAGE_CACHE_SIZE = int(os.environ.get("PAGE_CACHE_SIZE", 64))  # entries per process
+    PAGE_CACHE_DIR = os.environ.get("PAGE_CACHE_DIR")
+    # Rewritten by `flask clear-page-cache`; each worker drops its cached pages when it changes
+    PAGE_CACHE_STAMP = os.environ.get("PAGE_CACHE_STAMP", os.path.join(BASE_DIR, ".page_cache_generation"))
+    PAGE_CACHE_MAX_AGE = int(os.environ.get("PAGE_CACHE_MAX_AGE", 0))  # browsers revalidate via ETag
+    # Jinja bytecode cache directory; JINJA_BYTECODE_CACHE_DIR=off compiles in memory only
+    JINJA_BYTECODE_CACHE_DIR = None if os.environ.get("JINJA_BYTECODE_CACHE_DIR") == "off" else \
+        os.environ.get("JINJA_BYTECODE_CACHE_DIR", os.path.join(BASE_DIR, ".jinja_cache"))
     ADMIN_USERNAME = os.environ.get("ADMIN_USERNAME", "admin")
-    ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "navyug123")  # change before deploy
\ No newline at end of file
+    ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "navyug123")  # change before deploy
+    # A hash from `flask hash-password` replaces ADMIN_PASSWORD when set
+    ADMIN_PASSWORD_HASH = os.environ.get("ADMIN_PASSWORD_HASH")
+    # Password KDF and cost (see passwords.py; size it with benchmarks/password_cost.py)
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))  # KDF runs at once per process
+    PASSWORD_HASH_QUEUE = int(os.environ.get("PASSWORD_HASH_QUEUE", 64))  # sign-ins waiting for a worker
+    PASSWORD_HASH_WAIT = float(os.environ.get("PASSWORD_HASH_WAIT", 10))  # seconds before "try again"
+    PASSWORD_CACHE_SIZE = int(os.environ.get("PASSWORD_CACHE_SIZE", 512))  # 0 disables the cache
+    PASSWORD_CACHE_TTL = int(os.environ.get("PASSWORD_CACHE_TTL", 900))  # seconds
+    # Failed sign-ins allowed per client IP and per account in each window (see ratelimit.py).
+    # RATE_LIMIT_DB shares the buckets between worker processes; unset keeps them per process.
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT", "1") != "0"
+    RATE_LIMIT_LOGIN_PER_IP = int(os.environ.get("RATE_LIMIT_LOGIN_PER_IP", 30))
+    RATE_LIMIT_LOGIN_PER_ID = int(os.environ.get("RATE_LIMIT_LOGIN_PER_ID", 5))
+    RATE_LIMIT_WINDOW = int(os.environ.get("RATE_LIMIT_WINDOW", 300))  # seconds
+    RATE_LIMIT_STORE_SIZE = int(os.environ.get("RATE_LIMIT_STORE_SIZE", 10000))  # keys per process
+    RATE_LIMIT_DB = os.environ.get("RATE_LIMIT_DB")
+    # Proxies in front of the app that append to X-Forwarded-For (e.g. 1 behind nginx),
+    # so the rate limiter sees the client's address rather than the proxy's
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", 0))
+
+    # Performance instrumentation (see perf.py)
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 200))
+    PERF_SAMPLE_SIZE = int(os.environ.get("PERF_SAMPLE_SIZE", 500))  # requests kept per endpoint
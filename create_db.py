@@ -1,14 +1,32 @@
+from flask import Flask
 from sqlalchemy import inspect
-from app import db, app
+from config import Config
+from models import db
+from search import install_search_index
 
+# Only the config and the database: creating tables needs none of the views,
+# templates or workers that create_app() sets up
+app = Flask(__name__)
+app.config.from_object(Config)
+db.init_app(app)
 with app.app_context():
     db.create_all()
     print("✅ Database created successfully!")
 
+    # Full-text search indexes (SQLite only)
+    if db.engine.dialect.name == "sqlite":
+        conn = db.engine.raw_connection()
+        try:
+            install_search_index(conn.cursor())
+            conn.commit()
+        finally:
+            conn.close()
+        print("🔎 Search indexes ready.")
+
     # Display all table names to confirm creation (SQLAlchemy 2.x compatible)
     inspector = inspect(db.engine)
     tables = inspector.get_table_names()
     if tables:
         print("📋 Tables in the database:", tables)
     else:
-        print("⚠️ No tables found. Check your models or database URI configuration.")
\ No newline at end of file
+        print("⚠️ No tables found. Check your models or database URI configuration.")
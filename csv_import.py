@@ -0,0 +1,170 @@
+"""
+Bulk CSV import of students, teachers and marks, used by the admin upload
+form and `flask import-csv`.
+"""
+
+import csv
+from datetime import datetime
+
+from sqlalchemy import exc
+
+import passwords
+from models import db, Marks, Student, Teacher
+from report_cards import refresh_section
+
+IMPORT_KINDS = ('students', 'teachers', 'marks')
+
+# Rows validated and inserted per transaction; two unique columns x 400 values
+# keeps the collision check under SQLite's 999 bound-parameter limit
+IMPORT_CHUNK_SIZE = 400
+
+def _required(row, fields):
+    data = {f: (row.get(f) or '').strip() for f in fields}
+    missing = [f for f in fields if not data[f]]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    return data
+
+def _parse_import_date(value, field):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"invalid {field} (expected YYYY-MM-DD)")
+
+def _student_row(row):
+    data = _required(row, ('name', 'roll_no', 'admission_number', 'student_class', 'section',
+                           'parent_name', 'parent_phone', 'admission_date'))
+    data['admission_date'] = _parse_import_date(data['admission_date'], 'admission_date')
+    return data
+
+def _teacher_row(row):
+    data = _required(row, ('teacher_id', 'name', 'password', 'assigned_class', 'assigned_section'))
+    data['email'] = (row.get('email') or '').strip() or None
+    data['phone'] = (row.get('phone') or '').strip() or None
+    return data
+
+def _marks_row(row):
+    # roll_no and teacher_id are the human-facing codes, resolved to ids per chunk
+    data = _required(row, ('roll_no', 'teacher_id', 'subject', 'exam_type', 'marks_obtained', 'exam_date'))
+    try:
+        data['marks_obtained'] = float(data['marks_obtained'])
+        data['max_marks'] = float((row.get('max_marks') or '').strip() or 100)
+    except ValueError:
+        raise ValueError("marks_obtained/max_marks must be numbers")
+    data['exam_date'] = _parse_import_date(data['exam_date'], 'exam_date')
+    data['remarks'] = (row.get('remarks') or '').strip()
+    return data
+
+def _importer(kind):
+    """(model, row parser, unique columns) for an import kind."""
+    if kind == 'students':
+        return Student, _student_row, ('roll_no', 'admission_number')
+    if kind == 'teachers':
+        return Teacher, _teacher_row, ('teacher_id',)
+    return Marks, _marks_row, ()
+
+def _resolve_marks(chunk, report):
+    """Swap roll_no/teacher codes for row ids with one IN query per table."""
+    rolls = list({data['roll_no'] for _, data in chunk})
+    codes = list({data['teacher_id'] for _, data in chunk})
+    students = dict(db.session.query(Student.roll_no, Student.id).filter(Student.roll_no.in_(rolls)))
+    teachers = dict(db.session.query(Teacher.teacher_id, Teacher.id).filter(Teacher.teacher_id.in_(codes)))
+    resolved = []
+    for row_no, data in chunk:
+        roll_no, code = data.pop('roll_no'), data['teacher_id']
+        if roll_no not in students:
+            report['errors'].append({'row': row_no, 'error': f"unknown roll_no {roll_no}"})
+        elif code not in teachers:
+            report['errors'].append({'row': row_no, 'error': f"unknown teacher_id {code}"})
+        else:
+            data['student_id'] = students[roll_no]
+            data['teacher_id'] = teachers[code]
+            resolved.append((row_no, data))
+    return resolved
+
+def _sections(student_ids):
+    """Distinct (student_class, section) pairs of the given students."""
+    return (db.session.query(Student.student_class, Student.section)
+            .filter(Student.id.in_(list(set(student_ids)))).distinct().all())
+
+def _import_chunk(kind, chunk, report):
+    model, _, unique_fields = _importer(kind)
+    if kind == 'marks':
+        chunk = _resolve_marks(chunk, report)
+
+    if unique_fields:
+        # One query finds every collision in the chunk, across all unique columns
+        columns = [getattr(model, f) for f in unique_fields]
+        taken = {f: set() for f in unique_fields}
+        for existing in db.session.query(*columns).filter(db.or_(
+                *[c.in_(list({data[f] for _, data in chunk})) for f, c in zip(unique_fields, columns)])):
+            for f, value in zip(unique_fields, existing):
+                taken[f].add(value)
+        kept = []
+        for row_no, data in chunk:
+            clash = next((f for f in unique_fields if data[f] in taken[f]), None)
+            if clash:
+                report['errors'].append({'row': row_no, 'error': f"{clash} {data[clash]} already exists"})
+                continue
+            for f in unique_fields:
+                taken[f].add(data[f])  # later duplicates within the file
+            kept.append((row_no, data))
+        chunk = kept
+
+    if not chunk:
+        return
+    if kind == 'teachers':
+        for (_, data), hashed in zip(chunk, passwords.hasher().hash_many([data['password'] for _, data in chunk])):
+            data['password'] = hashed
+    try:
+        db.session.execute(db.insert(model), [data for _, data in chunk])
+        if kind == 'marks':
+            for student_class, section in _sections(data['student_id'] for _, data in chunk):
+                refresh_section(student_class, section)
+        db.session.commit()
+    except exc.IntegrityError as e:
+        db.session.rollback()
+        for row_no, _ in chunk:
+            report['errors'].append({'row': row_no, 'error': f"not inserted: {e.orig}"})
+        return
+    report['inserted'] += len(chunk)
+
+def _read_rows(lines, report):
+    """(row number, row) for each CSV record, up to the first that cannot be decoded or parsed.
+
+    Reading stops there, with an error on the report; the rows before it are
+    still imported.
+    """
+    row_no = 1
+    try:
+        for row_no, row in enumerate(csv.DictReader(lines), 2):
+            yield row_no, row
+    except UnicodeDecodeError:
+        error = "file is not UTF-8 text (save it as CSV UTF-8)"
+    except csv.Error as e:
+        error = f"malformed CSV: {e}"
+    else:
+        return
+    report['errors'].append({'row': row_no + 1, 'error': f"{error}; this row and the rest were not imported"})
+
+def import_csv(kind, lines, chunk_size=IMPORT_CHUNK_SIZE):
+    """Stream-parse CSV lines into Student/Teacher/Marks rows, committing per chunk.
+
+    Returns {'kind', 'inserted', 'errors': [{'row', 'error'}]} where row is the
+    1-based line in the file (the header is row 1).
+    """
+    _, parse_row, _ = _importer(kind)
+    report = {'kind': kind, 'inserted': 0, 'errors': []}
+    chunk = []
+    for row_no, row in _read_rows(lines, report):
+        try:
+            chunk.append((row_no, parse_row(row)))
+        except ValueError as e:
+            report['errors'].append({'row': row_no, 'error': str(e)})
+        if len(chunk) >= chunk_size:
+            _import_chunk(kind, chunk, report)
+            chunk = []
+    if chunk:
+        _import_chunk(kind, chunk, report)
+    report['errors'].sort(key=lambda e: e['row'])
+    return report
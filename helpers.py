@@ -0,0 +1,261 @@
+"""
+Helpers shared by the blueprints: session auth, receipt thumbnail jobs, the
+write-behind ingest glue and the public page cache.
+
+The per-process pieces (thumbnail pool, ingest queue, page cache) are created
+by init_app() and kept in app.extensions, so each app from create_app() owns
+its own.
+"""
+
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date
+from functools import partial, wraps
+
+from flask import Response, current_app, g, make_response, request, session
+from sqlalchemy import exc
+
+from models import db, ReceiptThumbnail, IngestCheckpoint, Student, Teacher
+from page_cache import PageCache, make_page
+from thumbnails import ThumbnailUnsupported, render_thumbnails
+
+# IDs per IN (...) clause, well under SQLite's bound-parameter limit (999 on older builds)
+BULK_CHUNK_SIZE = 500
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+# ---- Admin simple auth ----
+def admin_logged_in():
+    return session.get("admin_logged_in") == True
+
+# ---- Teacher simple auth ----
+def teacher_logged_in():
+    return session.get("teacher_logged_in") == True
+
+def get_current_teacher():
+    # Looked up once per request and reused by every caller
+    if teacher_logged_in():
+        if 'current_teacher' not in g:
+            teacher_id = session.get("teacher_id")
+            g.current_teacher = Teacher.query.filter_by(teacher_id=teacher_id).first()
+        return g.current_teacher
+    return None
+
+# ---- Parent simple auth ----
+def parent_logged_in():
+    return session.get("parent_logged_in") == True
+
+def get_current_student():
+    if parent_logged_in():
+        if 'current_student' not in g:
+            student_id = session.get("student_id")
+            g.current_student = db.session.get(Student, student_id) if student_id else None
+        return g.current_student
+    return None
+
+# ---- Receipt thumbnails ----
+# Rendering runs on the app's pool so fee_form() returns as soon as the upload is stored
+def enqueue_thumbnail(digest, filename):
+    """Record a render job for a stored receipt and hand it to the pool."""
+    if not digest:
+        return
+    try:
+        db.session.add(ReceiptThumbnail(receipt_sha256=digest, receipt_filename=filename))
+        db.session.commit()
+    except exc.IntegrityError:
+        db.session.rollback()  # same file uploaded before; its job already exists
+        return
+    app = current_app._get_current_object()
+    app.extensions['thumbnail_pool'].submit(run_thumbnail_job, app, digest)
+
+def run_thumbnail_job(app, digest):
+    """Claim the pending job for digest and render it; a job claimed elsewhere is skipped."""
+    with app.app_context():
+        claimed = db.session.execute(
+            db.update(ReceiptThumbnail)
+            .where(ReceiptThumbnail.receipt_sha256 == digest, ReceiptThumbnail.status == 'pending')
+            .values(status='running', attempts=ReceiptThumbnail.attempts + 1, updated_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return None
+        job = ReceiptThumbnail.query.filter_by(receipt_sha256=digest).one()
+        source = os.path.join(app.config['UPLOAD_FOLDER'], *job.receipt_filename.split('/'))
+        try:
+            if not os.path.isfile(source):
+                raise FileNotFoundError(f"{job.receipt_filename} is missing")
+            render_thumbnails(source, app.config['UPLOAD_FOLDER'], digest)
+            job.status, job.error = 'done', None
+        except FileNotFoundError as e:
+            job.status, job.error = 'failed', str(e)
+        except ThumbnailUnsupported as e:
+            job.status, job.error = 'unsupported', str(e)
+        except Exception as e:
+            app.logger.exception("thumbnail job %s failed", digest)
+            job.status, job.error = 'failed', str(e)[:300]
+        job.updated_at = datetime.utcnow()
+        db.session.commit()
+        return job.status
+
+def ready_thumbnails(digests):
+    """The subset of receipt hashes whose thumbnails have been rendered."""
+    digests = list({d for d in digests if d})
+    ready = set()
+    for chunk in chunked(digests, BULK_CHUNK_SIZE):
+        ready.update(d for (d,) in db.session.query(ReceiptThumbnail.receipt_sha256)
+                     .filter(ReceiptThumbnail.receipt_sha256.in_(chunk), ReceiptThumbnail.status == 'done'))
+    return ready
+
+# ---- Write-behind ingest ----
+# Public form tables that may be written through the ingest queue (see write_behind.py)
+INGEST_TABLES = ('fee_payment', 'contact_message', 'visit')
+
+def ingest_queue():
+    """This app's IngestQueue, or None when WRITE_BEHIND is off."""
+    return current_app.extensions.get('ingest_queue')
+
+def save_submission(row):
+    """Insert a public form's row now, or queue it when WRITE_BEHIND is on.
+
+    Returns True when the row was committed here (and so has an id).
+    """
+    queue = ingest_queue()
+    if queue is None:
+        db.session.add(row)
+        db.session.commit()
+        return True
+    payload = {c.name: getattr(row, c.key) for c in row.__table__.columns if getattr(row, c.key) is not None}
+    payload.setdefault('submitted_at', datetime.utcnow())  # when the parent submitted, not when ingested
+    queue.put(row.__tablename__, payload)
+    return False
+
+def queued_submissions(kind, limit=100):
+    """Rows of one table still waiting in the write-behind queue ("pending ingest")."""
+    queue = ingest_queue()
+    return queue.pending(kind, limit) if queue is not None else []
+
+def ingest_values(table, payload):
+    """Column values for table from a queued payload, with ISO dates parsed back."""
+    values = {}
+    for name, value in payload.items():
+        column_type = table.c[name].type
+        if value is not None and isinstance(column_type, db.DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and isinstance(column_type, db.Date):
+            value = date.fromisoformat(value)
+        values[name] = value
+    return values
+
+def insert_queued(rows):
+    # One executemany per run of same-table rows, keeping queue order
+    for kind, group in itertools.groupby(rows, key=lambda row: row.kind):
+        if kind not in INGEST_TABLES:
+            raise KeyError(f"unknown submission kind {kind!r}")
+        table = db.metadata.tables[kind]
+        db.session.execute(db.insert(table), [ingest_values(table, row.payload) for row in group])
+
+def drain_ingest_queue(app, queue, batch_size=None):
+    """Commit one batch of queued submissions; returns how many queue rows it consumed.
+
+    The batch and the new high-water mark go in one transaction. The mark is
+    moved with a compare-and-set, so when several processes drain the same
+    queue only one of them takes each batch.
+    """
+    batch_size = batch_size or app.config['WRITE_BEHIND_BATCH_SIZE']
+    with app.app_context():
+        last_id = db.session.query(IngestCheckpoint.last_id).filter_by(name=queue.name).scalar()
+        if last_id is None:
+            try:
+                db.session.add(IngestCheckpoint(name=queue.name, last_id=0))
+                db.session.commit()
+            except exc.IntegrityError:
+                db.session.rollback()
+                return 0
+            last_id = 0
+        queue.purge(last_id)  # committed before a crash, not yet purged
+        rows = queue.batch(last_id, batch_size)
+        if not rows:
+            return 0
+        claimed = db.session.execute(
+            db.update(IngestCheckpoint)
+            .where(IngestCheckpoint.name == queue.name, IngestCheckpoint.last_id == last_id)
+            .values(last_id=rows[-1].id)
+        ).rowcount
+        if not claimed:
+            db.session.rollback()
+            return 0
+
+        failures = []
+        try:
+            with db.session.begin_nested():
+                insert_queued(rows)
+        except (exc.SQLAlchemyError, KeyError, ValueError):
+            # Find the offending rows one at a time; the rest still go in
+            for row in rows:
+                try:
+                    with db.session.begin_nested():
+                        insert_queued([row])
+                except (exc.SQLAlchemyError, KeyError, ValueError) as e:
+                    error = str(getattr(e, 'orig', None) or e)  # the driver error, without bound values
+                    app.logger.error("write-behind row %s (%s) refused: %s", row.id, row.kind, error)
+                    failures.append((row, error))
+        db.session.commit()
+        queue.bury(failures)
+        queue.purge(rows[-1].id)
+
+        failed_ids = {row.id for row, _ in failures}
+        for row in rows:
+            if row.kind == 'fee_payment' and row.id not in failed_ids:
+                enqueue_thumbnail(row.payload.get('receipt_sha256'), row.payload.get('receipt_filename'))
+        return len(rows)
+
+def start_ingest_writer():
+    # Started lazily so each server process (after any fork) gets its own writer
+    queue = ingest_queue()
+    if queue is not None:
+        queue.start(partial(drain_ingest_queue, current_app._get_current_object(), queue))
+
+# ---- Public page cache ----
+def cached_page(view):
+    """Serve anonymous GETs of a public page from the page cache, keyed on the path.
+
+    Logged-in visitors and requests with pending flash messages get a fresh
+    render, since only those change what the page shows.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if (request.method not in ('GET', 'HEAD') or current_app.debug or not current_app.config['PAGE_CACHE_ENABLED']
+                or admin_logged_in() or teacher_logged_in() or parent_logged_in() or session.get('_flashes')):
+            return view(*args, **kwargs)
+        page_cache = current_app.extensions['page_cache']
+        page = page_cache.get(request.path)
+        state = 'hit'
+        if page is None:
+            rendered = make_response(view(*args, **kwargs))
+            if rendered.status_code != 200:
+                return rendered
+            page = make_page(rendered.get_data(), rendered.mimetype)
+            page_cache.set(request.path, page)
+            state = 'miss'
+        response = Response(page.body, mimetype=page.mimetype)
+        response.set_etag(page.etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config['PAGE_CACHE_MAX_AGE']
+        response.headers['X-Page-Cache'] = state
+        return response.make_conditional(request)
+    return wrapper
+
+def init_app(app):
+    """Create app's thumbnail pool, ingest queue and page cache, and start the writer per request."""
+    app.extensions['thumbnail_pool'] = ThreadPoolExecutor(max_workers=app.config['THUMBNAIL_WORKERS'],
+                                                          thread_name_prefix="thumbnails")
+    app.extensions['ingest_queue'] = None
+    if app.config['WRITE_BEHIND']:
+        from write_behind import IngestQueue
+        app.extensions['ingest_queue'] = IngestQueue(app.config['WRITE_BEHIND_QUEUE'])
+    app.extensions['page_cache'] = PageCache(app.config['PAGE_CACHE_SIZE'], app.config['PAGE_CACHE_TTL'],
+                                             app.config['PAGE_CACHE_STAMP'], app.config['PAGE_CACHE_DIR'])
+    app.before_request(start_ingest_writer)
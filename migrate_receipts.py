@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the receipt_sha256 column to fee_payment and
+move existing receipts from the flat uploads folder into content-addressed,
+hash-sharded storage (uploads/ab/cd/<sha256>.<ext>).
+
+Usage: python migrate_receipts.py [path/to/navyug.db] [path/to/uploads]
+"""
+
+import sqlite3
+import os
+import shutil
+import sys
+
+from config import Config
+from receipts import hash_file, receipt_path
+
+def migrate_receipts(db_path='navyug.db', upload_folder=Config.UPLOAD_FOLDER):
+    if not os.path.exists(db_path):
+        print(f"Database file {db_path} not found!")
+        return False
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(fee_payment)")
+        columns = [column[1] for column in cursor.fetchall()]
+        if 'receipt_sha256' not in columns:
+            print("Adding 'receipt_sha256' column to fee_payment table...")
+            cursor.execute("ALTER TABLE fee_payment ADD COLUMN receipt_sha256 VARCHAR(64)")
+            conn.commit()
+            print("✓ receipt_sha256 column added successfully")
+        else:
+            print("✓ receipt_sha256 column already exists")
+
+        cursor.execute(
+            "SELECT id, receipt_filename FROM fee_payment "
+            "WHERE receipt_filename IS NOT NULL AND receipt_sha256 IS NULL"
+        )
+        pending = cursor.fetchall()
+        moved = missing = 0
+        for payment_id, filename in pending:
+            source = os.path.join(upload_folder, *filename.split('/'))
+            if not os.path.isfile(source):
+                missing += 1
+                print(f"  ! payment {payment_id}: {filename} not found, left as is")
+                continue
+            digest = hash_file(source)
+            relative = receipt_path(digest, filename.rsplit('.', 1)[-1].lower())
+            target = os.path.join(upload_folder, *relative.split('/'))
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+            cursor.execute(
+                "UPDATE fee_payment SET receipt_filename = ?, receipt_sha256 = ? WHERE id = ?",
+                (relative, digest, payment_id)
+            )
+            # The old name goes only once the row points at the new one,
+            # so an interrupted run can simply be started again
+            conn.commit()
+            if os.path.abspath(source) != os.path.abspath(target):
+                os.remove(source)
+            moved += 1
+
+        print(f"✓ {moved} receipt(s) moved to sharded storage, {missing} missing")
+        print("\n✅ Database updated successfully!")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        if conn:
+            conn.close()
+    return False
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    ok = migrate_receipts(*args[:2]) if args else migrate_receipts()
+    sys.exit(0 if ok else 1)
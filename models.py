@@ -0,0 +1,214 @@
+"""
+Database models, shared by the web app, the CLI commands and the scripts.
+
+Only Flask-SQLAlchemy is imported here, so a maintenance command or a
+migration script can load the schema without the views and their helpers.
+"""
+
+from datetime import datetime
+
+from flask_sqlalchemy import SQLAlchemy
+
+db = SQLAlchemy()
+
+class FeePayment(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    student_name = db.Column(db.String(120), nullable=False)
+    roll_no = db.Column(db.String(50), nullable=False)
+    student_class = db.Column(db.String(50), nullable=False)
+    parent_name = db.Column(db.String(120), nullable=False)
+    parent_phone = db.Column(db.String(30), nullable=False)
+    payment_month = db.Column(db.String(20), nullable=False)
+    amount = db.Column(db.Float, nullable=False)
+    receipt_filename = db.Column(db.String(300))
+    receipt_sha256 = db.Column(db.String(64))  # content hash of the stored receipt
+    paid = db.Column(db.Boolean, default=False)
+    submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_fee_payment_submitted_at_id', 'submitted_at', 'id'),  # dashboard keyset pages
+        db.Index('ix_fee_payment_roll_no_submitted_at', 'roll_no', 'submitted_at'),  # per-student history
+        db.Index('ix_fee_payment_class_submitted_at', 'student_class', 'submitted_at'),  # class filter
+        db.Index('ix_fee_payment_paid_submitted_at', 'paid', 'submitted_at'),  # status filter
+    )
+
+    def __repr__(self):
+        return f"<FeePayment {self.id} {self.student_name} {self.roll_no}>"
+
+class ReceiptThumbnail(db.Model):
+    """Render job for a stored receipt's thumbnail and preview, one per content hash."""
+    id = db.Column(db.Integer, primary_key=True)
+    receipt_sha256 = db.Column(db.String(64), unique=True, nullable=False)
+    receipt_filename = db.Column(db.String(300), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, done, failed, unsupported
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.String(300))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_receipt_thumbnail_status_updated_at', 'status', 'updated_at'),  # job pickup
+    )
+
+    def __repr__(self):
+        return f"<ReceiptThumbnail {self.receipt_sha256[:12]} {self.status}>"
+
+class IngestCheckpoint(db.Model):
+    """Id of the last write-behind queue row committed to this database, per queue file."""
+    name = db.Column(db.String(50), primary_key=True)  # IngestQueue.name
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+
+class ContactMessage(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    phone = db.Column(db.String(20))
+    subject = db.Column(db.String(50))
+    message = db.Column(db.Text, nullable=False)
+    submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_contact_message_submitted_at', 'submitted_at'),
+        db.Index('ix_contact_message_subject_submitted_at', 'subject', 'submitted_at'),
+    )
+    
+    @property
+    def created_this_week(self):
+        from datetime import datetime, timedelta
+        week_ago = datetime.utcnow() - timedelta(days=7)
+        return self.submitted_at >= week_ago
+
+class Student(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    admission_number = db.Column(db.String(50), unique=True, nullable=False)
+    roll_no = db.Column(db.String(20), unique=True, nullable=False)
+    name = db.Column(db.String(120), nullable=False)
+    student_class = db.Column(db.String(50), nullable=False)
+    section = db.Column(db.String(10), nullable=False)  # A, B, C, etc.
+    parent_name = db.Column(db.String(120), nullable=False)
+    parent_phone = db.Column(db.String(20), nullable=False)
+    admission_date = db.Column(db.Date, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_student_class_section_roll_no', 'student_class', 'section', 'roll_no'),  # teacher views
+        db.Index('ix_student_class_section_name', 'student_class', 'section', 'name'),  # admin roster
+    )
+
+    def __repr__(self):
+        return f"<Student {self.name} ({self.roll_no})>"
+
+class VisitSlot(db.Model):
+    """One bookable visit time; see visit_slots.py."""
+    __tablename__ = 'visit_slot'
+    id = db.Column(db.Integer, primary_key=True)
+    slot_date = db.Column(db.Date, nullable=False)
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
+    capacity = db.Column(db.Integer, nullable=False)
+    booked = db.Column(db.Integer, nullable=False, default=0)  # only changed by conditional UPDATEs
+
+    __table_args__ = (
+        # also serves the per-day availability range scans
+        db.UniqueConstraint('slot_date', 'start_time', name='uq_visit_slot_date_time'),
+        db.CheckConstraint('booked >= 0 AND booked <= capacity', name='ck_visit_slot_booked'),
+    )
+
+    def __repr__(self):
+        return f"<VisitSlot {self.slot_date} {self.start_time} {self.booked}/{self.capacity}>"
+
+class Visit(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    student_name = db.Column(db.String(120), nullable=False)
+    parent_name = db.Column(db.String(120), nullable=False)
+    parent_phone = db.Column(db.String(20), nullable=False)
+    student_class = db.Column(db.String(50), nullable=False)
+    visit_date = db.Column(db.Date, nullable=False)
+    visit_time = db.Column(db.String(20), nullable=False)
+    purpose = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), default='scheduled')  # scheduled, completed, cancelled
+    notes = db.Column(db.Text)
+    submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    slot_id = db.Column(db.Integer, db.ForeignKey('visit_slot.id', ondelete='SET NULL'))  # None for free-text visits
+
+    __table_args__ = (
+        db.Index('ix_visit_date_time', 'visit_date', 'visit_time'),
+        db.Index('ix_visit_status_date_time', 'status', 'visit_date', 'visit_time'),
+    )
+
+    def __repr__(self):
+        return f"<Visit {self.student_name} - {self.visit_date}>"
+
+class Teacher(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    teacher_id = db.Column(db.String(50), unique=True, nullable=False)
+    name = db.Column(db.String(120), nullable=False)
+    password = db.Column(db.String(255), nullable=False)  # hash, see passwords.py
+    assigned_class = db.Column(db.String(50), nullable=False)
+    assigned_section = db.Column(db.String(10), nullable=False)
+    email = db.Column(db.String(120))
+    phone = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_teacher_class_section_name', 'assigned_class', 'assigned_section', 'name'),
+    )
+
+    def __repr__(self):
+        return f"<Teacher {self.name} ({self.teacher_id})>"
+
+class Marks(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
+    teacher_id = db.Column(db.Integer, db.ForeignKey('teacher.id'), nullable=False)
+    subject = db.Column(db.String(100), nullable=False)
+    exam_type = db.Column(db.String(50), nullable=False)  # Unit Test, Mid Term, Final Exam, etc.
+    marks_obtained = db.Column(db.Float, nullable=False)
+    max_marks = db.Column(db.Float, nullable=False, default=100)
+    exam_date = db.Column(db.Date, nullable=False)
+    remarks = db.Column(db.Text)
+    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    student = db.relationship('Student', backref='marks')
+    teacher = db.relationship('Teacher', backref='marks_uploaded')
+
+    __table_args__ = (
+        db.Index('ix_marks_student_exam_date', 'student_id', 'exam_date'),  # parent dashboard
+        db.Index('ix_marks_teacher_uploaded_at', 'teacher_id', 'uploaded_at'),  # teacher dashboard
+        db.Index('ix_marks_teacher_exam_date', 'teacher_id', 'exam_date', 'uploaded_at'),  # teacher marks list
+    )
+
+    def __repr__(self):
+        return f"<Marks {self.student_id} - {self.subject} - {self.exam_type}>"
+
+class MarkSummary(db.Model):
+    """Precomputed report-card numbers for one student in one scope (see report_cards.py).
+
+    subject and exam_type are '' when the row covers every subject or every
+    exam type, so the ('', '') row is the student's overall result.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id', ondelete='CASCADE'), nullable=False)
+    student_class = db.Column(db.String(50), nullable=False)
+    section = db.Column(db.String(10), nullable=False)
+    subject = db.Column(db.String(100), nullable=False, default='')
+    exam_type = db.Column(db.String(50), nullable=False, default='')
+    exams = db.Column(db.Integer, nullable=False)  # marks rows in this scope
+    total_obtained = db.Column(db.Float, nullable=False)
+    total_max = db.Column(db.Float, nullable=False)
+    percentage = db.Column(db.Float)  # 100 * total_obtained / total_max
+    class_rank = db.Column(db.Integer)  # within (student_class, section); ties share a rank
+    class_size = db.Column(db.Integer)  # students ranked in this scope
+    class_average = db.Column(db.Float)  # mean percentage of those students
+    percentile = db.Column(db.Float)  # share of them at or below this percentage
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    student = db.relationship('Student')
+
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'subject', 'exam_type', name='uq_mark_summary_student_scope'),
+        db.Index('ix_mark_summary_section_scope_rank', 'student_class', 'section', 'subject', 'exam_type', 'class_rank'),  # teacher dashboard
+    )
+
+    def __repr__(self):
+        return f"<MarkSummary {self.student_id} {self.subject or '*'}/{self.exam_type or '*'} {self.percentage}>"
@@ -0,0 +1,116 @@
+"""
+Response cache for the public pages.
+
+index(), about() and the GET side of the public forms render the same HTML
+for every anonymous visitor. PageCache keeps rendered pages in an in-process
+LRU with a TTL and, when a directory is given, in a file cache shared by all
+worker processes on the host. Entries carry an ETag so browsers and proxies
+can revalidate with a 304.
+
+invalidate() empties the cache everywhere: it clears this process's LRU and
+the shared files, and rewrites a stamp file (PAGE_CACHE_STAMP) that every
+worker checks on each lookup, dropping its own LRU when the stamp has
+changed. The stamp is used with or without a shared directory, so
+`flask clear-page-cache` reaches the LRUs of running workers either way.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import namedtuple
+
+from lru import LRUCache
+
+CachedPage = namedtuple("CachedPage", "body mimetype etag")
+
+def make_page(body, mimetype):
+    """A CachedPage for a rendered body, with a strong ETag from its content."""
+    return CachedPage(body, mimetype, hashlib.sha256(body).hexdigest()[:32])
+
+class FileCache:
+    """CachedPages as files in a directory shared by worker processes; expiry by mtime."""
+
+    def __init__(self, directory, ttl):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                return CachedPage(f.read(), header["mimetype"], header["etag"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key, page):
+        # Header line, then the body; written aside and renamed so readers never see half a page
+        fd, tmp_path = tempfile.mkstemp(prefix=".page-", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps({"mimetype": page.mimetype, "etag": page.etag}).encode() + b"\n")
+                f.write(page.body)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+class PageCache:
+    """LRU in front of an optional shared FileCache, with cross-process invalidation."""
+
+    def __init__(self, maxsize, ttl, stamp, directory=None):
+        self.local = LRUCache(maxsize, ttl)
+        self.shared = FileCache(directory, ttl) if directory else None
+        self._stamp = stamp
+        self._seen_stamp = self._read_stamp()
+
+    def _read_stamp(self):
+        try:
+            return os.stat(self._stamp).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_stamp(self):
+        # One stat per lookup: another worker may have invalidated since our last one
+        stamp = self._read_stamp()
+        if stamp != self._seen_stamp:
+            self._seen_stamp = stamp
+            self.local.clear()
+
+    def get(self, key):
+        self._check_stamp()
+        page = self.local.get(key)
+        if page is None and self.shared:
+            page = self.shared.get(key)
+            if page is not None:
+                self.local.set(key, page)
+        return page
+
+    def set(self, key, page):
+        self.local.set(key, page)
+        if self.shared:
+            self.shared.set(key, page)
+
+    def invalidate(self):
+        self.local.clear()
+        if self.shared:
+            self.shared.clear()
+        os.makedirs(os.path.dirname(os.path.abspath(self._stamp)), exist_ok=True)
+        with open(self._stamp, "w") as f:
+            f.write(str(time.time_ns()))
+        self._seen_stamp = self._read_stamp()
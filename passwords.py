@@ -0,0 +1,122 @@
+"""
+Password hashing for teacher and admin sign-in.
+
+Hashes are werkzeug's "method$salt$hash" strings, so PASSWORD_HASH_METHOD
+picks the KDF and its cost ("scrypt:32768:8:1", "pbkdf2:sha256:600000", ...);
+size it with `python -m benchmarks.password_cost`. Rows still holding a
+plaintext password (everything created before hashing) are accepted once and
+replaced by a hash on that successful sign-in, as are hashes made with an
+older method or cost. `flask hash-passwords` converts the rest in one go.
+
+KDF work runs on a small per-process thread pool (PASSWORD_HASH_WORKERS)
+rather than in the request thread. hashlib releases the GIL while it hashes,
+so the pool caps how many cores and, for scrypt, how much memory
+(128 * n * r bytes per hash) sign-ins take at once, however many requests
+arrive. Up to PASSWORD_HASH_QUEUE more wait their turn; beyond that a sign-in
+waits PASSWORD_HASH_WAIT seconds for room and then fails with HasherBusy
+instead of piling up.
+
+Successful verifications are remembered for PASSWORD_CACHE_TTL seconds, so
+a teacher signing in again (another device, an expired session) costs no KDF
+run. Entries are HMACs of the stored hash and the password under a key that
+never leaves the process; a changed password has a new stored hash and so
+misses. Failures are never cached.
+"""
+
+import hashlib
+import hmac
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from lru import LRUCache
+
+# werkzeug's "method$salt$hash"; anything else in a password column is legacy plaintext
+HASH_PATTERN = re.compile(r"^(pbkdf2:[a-z0-9_]+(:\d+)?|scrypt(:\d+:\d+:\d+)?)\$[^$]+\$[0-9a-f]+$")
+
+class HasherBusy(Exception):
+    """Raised when the KDF queue stays full for PASSWORD_HASH_WAIT seconds."""
+
+def is_hashed(stored):
+    return bool(stored) and HASH_PATTERN.match(stored) is not None
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a bounded pool, with a cache of recent successes."""
+
+    def __init__(self, method, workers, queue_size, wait, cache_size, cache_ttl):
+        self.method = method
+        # Hash of a random password for burn(); made now so a bad method fails at startup
+        self._dummy = generate_password_hash(os.urandom(16).hex(), method)
+        # werkzeug fills in left-out parameters ("scrypt" is stored as "scrypt:32768:8:1"),
+        # so stored hashes are compared with the prefix it really writes
+        self.prefix = self._dummy.split("$", 1)[0]
+        self.wait = wait
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="passwords")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._verified = LRUCache(cache_size, cache_ttl) if cache_size else None
+        self._key = os.urandom(32)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.wait):
+            raise HasherBusy()
+        try:
+            return self._pool.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def _cache_key(self, stored, password):
+        return hmac.new(self._key, f"{stored}\0{password}".encode(), hashlib.sha256).digest()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def hash_many(self, passwords):
+        """Hashes of several passwords, spread over the pool (bulk imports, migrations)."""
+        return list(self._pool.map(lambda password: generate_password_hash(password, self.method), passwords))
+
+    def needs_rehash(self, stored):
+        return not is_hashed(stored) or stored.split("$", 1)[0] != self.prefix
+
+    def verify(self, stored, password):
+        """(ok, replacement) for a password against a stored hash or legacy plaintext.
+
+        replacement is a fresh hash to store when ok and the stored value is
+        plaintext or uses another method/cost, else None.
+        """
+        if not stored or not password:
+            return False, None
+        if not is_hashed(stored):
+            if not hmac.compare_digest(stored.encode(), password.encode()):
+                return False, None
+            return True, self.hash(password)
+        key = self._cache_key(stored, password)
+        if self._verified is not None and self._verified.get(key):
+            ok = True
+        else:
+            ok = self._run(check_password_hash, stored, password)
+            if ok and self._verified is not None:
+                self._verified.set(key, True)
+        if ok and self.needs_rehash(stored):
+            return True, self.hash(password)
+        return ok, None
+
+    def burn(self, password):
+        """Spend one verification's work, so unknown sign-in IDs take as long as known ones."""
+        self._run(check_password_hash, self._dummy, password)
+
+def hasher():
+    return current_app.extensions['passwords']
+
+def hash_password(password):
+    return hasher().hash(password)
+
+def init_app(app):
+    """Create app's password hasher and its KDF pool."""
+    app.extensions['passwords'] = PasswordHasher(
+        app.config['PASSWORD_HASH_METHOD'], app.config['PASSWORD_HASH_WORKERS'],
+        app.config['PASSWORD_HASH_QUEUE'], app.config['PASSWORD_HASH_WAIT'],
+        app.config['PASSWORD_CACHE_SIZE'], app.config['PASSWORD_CACHE_TTL'])
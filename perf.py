@@ -0,0 +1,130 @@
+"""
+Per-request performance instrumentation.
+
+Every query executed while a request is active is counted and timed, and
+template rendering is timed through Flask's render signals. The totals go
+out on each response as a Server-Timing header, and a rolling window of
+samples per endpoint feeds the admin performance page. Statements slower
+than SLOW_QUERY_THRESHOLD_MS are logged with their bound values redacted.
+"""
+
+import logging
+import threading
+from collections import defaultdict, deque
+from time import perf_counter
+
+from flask import before_render_template, current_app, g, has_app_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("perf")
+
+# endpoint -> deque of (total_ms, db_ms, render_ms, queries)
+_samples = defaultdict(deque)
+_samples_lock = threading.Lock()
+
+def redact(parameters, executemany=False):
+    """Describe bound parameters by type only, so no values reach the log."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    return [type(value).__name__ for value in parameters or ()]
+
+def _request_stats():
+    """The current request's counters, or None outside an instrumented request."""
+    if has_app_context():
+        return g.get("_perf")
+    return None
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (perf_counter() - conn.info["query_start"].pop()) * 1000
+    stats = _request_stats()
+    if stats is not None:
+        stats["queries"] += 1
+        stats["db_ms"] += elapsed_ms
+    threshold = current_app.config.get("SLOW_QUERY_THRESHOLD_MS") if has_app_context() else None
+    if threshold is not None and elapsed_ms >= threshold:
+        logger.warning("slow query %.1fms: %s params=%s", elapsed_ms, " ".join(statement.split()),
+                       redact(parameters, executemany))
+
+@event.listens_for(Engine, "handle_error")
+def _query_failed(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+def _render_started(sender, template, context, **extra):
+    stats = _request_stats()
+    if stats is not None:
+        stats["render_stack"].append(perf_counter())
+
+def _render_finished(sender, template, context, **extra):
+    stats = _request_stats()
+    if stats is not None and stats["render_stack"]:
+        started = stats["render_stack"].pop()
+        if not stats["render_stack"]:  # only count the outermost render
+            stats["render_ms"] += (perf_counter() - started) * 1000
+
+def _start_request():
+    g._perf = {"start": perf_counter(), "queries": 0, "db_ms": 0.0, "render_ms": 0.0, "render_stack": []}
+
+def _finish_request(response):
+    stats = g.pop("_perf", None)
+    if stats is None:
+        return response
+    total_ms = (perf_counter() - stats["start"]) * 1000
+    response.headers["Server-Timing"] = ", ".join([
+        f'db;dur={stats["db_ms"]:.1f};desc="{stats["queries"]} queries"',
+        f'render;dur={stats["render_ms"]:.1f}',
+        f'total;dur={total_ms:.1f}',
+    ])
+    endpoint = request.endpoint
+    if endpoint and endpoint != "static":
+        window = current_app.config.get("PERF_SAMPLE_SIZE", 500)
+        with _samples_lock:
+            samples = _samples[endpoint]
+            samples.append((total_ms, stats["db_ms"], stats["render_ms"], stats["queries"]))
+            while len(samples) > window:
+                samples.popleft()
+    return response
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+def endpoint_summary():
+    """p50/p95 latency and average DB work per endpoint, slowest p95 first."""
+    with _samples_lock:
+        snapshot = {endpoint: list(samples) for endpoint, samples in _samples.items()}
+    rows = []
+    for endpoint, samples in snapshot.items():
+        totals = sorted(s[0] for s in samples)
+        db_times = sorted(s[1] for s in samples)
+        rows.append({
+            "endpoint": endpoint,
+            "requests": len(samples),
+            "p50_ms": percentile(totals, 50),
+            "p95_ms": percentile(totals, 95),
+            "db_p95_ms": percentile(db_times, 95),
+            "render_avg_ms": sum(s[2] for s in samples) / len(samples),
+            "queries_avg": sum(s[3] for s in samples) / len(samples),
+        })
+    rows.sort(key=lambda r: r["p95_ms"], reverse=True)
+    return rows
+
+def init_app(app):
+    """Hook request timing and template render timing into app."""
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_render_started, app)
+    template_rendered.connect(_render_finished, app)
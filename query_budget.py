@@ -0,0 +1,136 @@
+"""
+Query counting helpers for catching N+1 regressions.
+
+    with assert_max_queries(db.engine, 3):
+        client.get("/teacher/marks")
+
+ROUTE_QUERY_BUDGETS holds the ceiling for each logged-in page. The numbers
+must not depend on how many rows the tables hold; a route that starts
+issuing one query per row will blow its budget as soon as there is data.
+tests/test_query_budgets.py checks every budget against seeded data, so
+`python -m pytest` fails on an N+1 regression.
+
+route_table_scans() runs EXPLAIN QUERY PLAN on the statements a route really
+executed, with the parameters it bound, and reports the ones that read a
+whole table. add_indexes.py and tests/test_query_plans.py use it.
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event, inspect, text
+
+# route -> maximum SQL statements for one GET with admin, teacher and parent
+# all logged in on the same session
+ROUTE_QUERY_BUDGETS = {
+    '/admin/dashboard': 4,
+    '/admin/students': 1,
+    '/admin/api/roster': 1,
+    '/admin/api/roster/students?student_class=5&section=A': 2,
+    '/admin/teachers': 1,
+    '/admin/visits': 3,
+    '/admin/contacts': 2,
+    '/teacher/dashboard': 6,
+    '/teacher/students': 2,
+    '/teacher/marks': 5,
+    '/teacher/marks/grid': 2,
+    '/parent/dashboard': 4,
+}
+
+# Pages whose queries must all be answered from an index: the budgeted routes
+# plus their filtered and searched variants. A (route, form) pair is POSTed;
+# {student_id} and {roll_no} are the first student's.
+ROUTE_PLAN_CHECKS = tuple(ROUTE_QUERY_BUDGETS) + (
+    '/admin/dashboard?query=sharma',
+    '/admin/dashboard?filter_class=5&filter_status=paid',
+    '/admin/dashboard?filter_status=pending',
+    '/admin/stats',
+    '/admin/students?filter_class=5',
+    '/admin/visits?filter_status=scheduled',
+    '/admin/visits?filter_date=2024-06-03',
+    '/admin/contacts?query=fee',
+    '/admin/contacts?filter_subject=fee',
+    '/schedule_visit/availability',
+    '/admin/student_details/{student_id}',
+    ('/payment_history', {'roll_no': '{roll_no}'}),
+)
+
+# (route, table) pairs that read the whole table by design: the unfiltered
+# summary cards add up every payment
+EXPECTED_TABLE_SCANS = {
+    ('/admin/dashboard', 'fee_payment'),
+    ('/admin/stats', 'fee_payment'),
+}
+
+@contextmanager
+def record_queries(engine):
+    """Collect (statement, parameters) for every SQL statement executed on engine inside the block."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+def route_table_scans(client, engine, routes=ROUTE_PLAN_CHECKS, expected=EXPECTED_TABLE_SCANS):
+    """Request each route and return (route, plan step, statement) for every full table scan it ran.
+
+    "SCAN t USING [COVERING] INDEX ..." walks an index and passes; a plain
+    "SCAN t" on one of the app's tables reads every row and is reported,
+    unless (route, t) is in expected.
+    """
+    tables = set(inspect(engine).get_table_names())
+    with engine.connect() as conn:
+        student = conn.execute(text("SELECT id, roll_no FROM student ORDER BY id LIMIT 1")).first()
+    values = {'student_id': student.id, 'roll_no': student.roll_no} if student else {'student_id': 0, 'roll_no': ''}
+    failures = []
+    for check in routes:
+        route, form = check if isinstance(check, tuple) else (check, None)
+        url = route.format(**values)
+        with record_queries(engine) as executed:
+            if form is None:
+                client.get(url)
+            else:
+                client.post(url, data={name: value.format(**values) for name, value in form.items()})
+        with engine.connect() as conn:
+            for statement, parameters in executed:
+                if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                    continue
+                for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters):
+                    detail = row[-1]
+                    words = detail.split()
+                    if (words[0] == "SCAN" and "INDEX" not in detail and words[1] in tables
+                            and (route, words[1]) not in expected):
+                        failures.append((url, detail, statement))
+    return failures
+
+@contextmanager
+def count_queries(engine):
+    """Count the SQL statements executed on engine inside the block; the yielded function returns the count so far."""
+    with record_queries(engine) as executed:
+        yield lambda: len(executed)
+
+@contextmanager
+def assert_max_queries(engine, limit, label="block"):
+    """Fail with the offending statements if the block runs more than limit queries."""
+    with record_queries(engine) as executed:
+        yield executed
+    if len(executed) > limit:
+        listing = "\n".join(f"  {i}. {statement}" for i, (statement, _) in enumerate(executed, 1))
+        raise AssertionError(f"{label} ran {len(executed)} queries (max {limit}):\n{listing}")
+
+def check_route_budgets(client, engine, budgets=ROUTE_QUERY_BUDGETS):
+    """GET every budgeted route and return the AssertionErrors for those over budget."""
+    failures = []
+    for route, limit in budgets.items():
+        try:
+            with assert_max_queries(engine, limit, route):
+                response = client.get(route)
+            if response.status_code != 200:
+                raise AssertionError(f"{route} returned {response.status_code}")
+        except AssertionError as e:
+            failures.append(e)
+    return failures
@@ -0,0 +1,202 @@
+"""
+Token-bucket throttling for the sign-in forms.
+
+Each key (the client IP, or the username/teacher ID/admission number being
+tried) has a bucket of `capacity` tokens that refills at `rate` tokens per
+second. A sign-in attempt takes one token from every bucket it touches; an
+attempt that finds any bucket empty is turned away with 429 before the view
+runs, so guessing costs no database query and no password hash. A successful
+sign-in gives its tokens back, so only failures count against the limit and a
+staff room full of teachers behind one school IP is not locked out.
+
+Buckets live in one of two stores:
+
+- MemoryStore, per process, capped at RATE_LIMIT_STORE_SIZE keys (least
+  recently used go first; an evicted key just starts over with a full bucket).
+- SQLiteStore, a small SQLite file at RATE_LIMIT_DB shared by every worker on
+  the host, so the limit holds however gunicorn spreads the attempts.
+  Buckets that have refilled completely are pruned now and then.
+
+A bucket is just (tokens, last update); the refill is worked out when it is
+read, so a check costs one dict lookup (or one primary-key row) per key and
+nothing runs in the background.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, flash, g, render_template, request
+
+def _refill(tokens, updated, now, capacity, rate):
+    return min(capacity, tokens + (now - updated) * rate)
+
+def _wait(tokens, rate):
+    """Seconds until a bucket holding `tokens` has a whole token again."""
+    return (1 - tokens) / rate if rate else float('inf')
+
+class MemoryStore:
+    """Buckets in an LRU dict of at most maxsize keys, for single-process deployments."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        """Take a token from key's bucket; returns 0, or the seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens = _refill(*self._buckets.get(key, (capacity, now)), now, capacity, rate)
+            if tokens < 1:
+                return _wait(tokens, rate)
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return 0
+
+    def give_back(self, key, capacity, rate):
+        now = time.monotonic()
+        with self._lock:
+            if key in self._buckets:
+                tokens = _refill(*self._buckets[key], now, capacity, rate)
+                self._buckets[key] = (min(capacity, tokens + 1), now)
+
+class SQLiteStore:
+    """Buckets in a SQLite file shared by the worker processes on one host."""
+
+    # Prune refilled buckets about once per this many writes
+    PRUNE_EVERY = 500
+
+    def __init__(self, path):
+        self.path = path
+        self._writes = 0
+        self._local = threading.local()
+        conn = sqlite3.connect(path, timeout=5)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS bucket ("
+                         "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL) WITHOUT ROWID")
+        finally:
+            conn.close()
+
+    def _connection(self):
+        """This thread's connection, opened on first use (so never shared across a fork)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit, so BEGIN IMMEDIATE below is the only transaction. Losing
+            # the last few buckets to a power cut only forgives some failed sign-ins.
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous = OFF")
+        return conn
+
+    def _update(self, key, capacity, rate, change):
+        """Apply change(tokens) -> new tokens or None (leave as is) to key's bucket atomically."""
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM bucket WHERE key = ?", (key,)).fetchone()
+            tokens = _refill(*(row or (capacity, now)), now, capacity, rate)
+            new_tokens = change(tokens)
+            if new_tokens is not None:
+                conn.execute("INSERT OR REPLACE INTO bucket (key, tokens, updated) VALUES (?, ?, ?)",
+                             (key, new_tokens, now))
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0 and rate:
+                    # Untouched for capacity / rate seconds means full again, same as no row
+                    conn.execute("DELETE FROM bucket WHERE updated < ?", (now - capacity / rate,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return tokens
+
+    def take(self, key, capacity, rate):
+        """Take a token from key's bucket; returns 0, or the seconds until one is available."""
+        tokens = self._update(key, capacity, rate, lambda tokens: tokens - 1 if tokens >= 1 else None)
+        return 0 if tokens >= 1 else _wait(tokens, rate)
+
+    def give_back(self, key, capacity, rate):
+        self._update(key, capacity, rate, lambda tokens: min(capacity, tokens + 1))
+
+class LoginLimiter:
+    """Buckets allowing per_ip failed sign-ins per client IP and per_identifier per account, each per window seconds."""
+
+    def __init__(self, store, per_ip, per_identifier, window):
+        self.store = store
+        self.limits = {'ip': (per_ip, per_ip / window), 'id': (per_identifier, per_identifier / window)}
+
+    def _buckets(self, scope, identifier):
+        buckets = [(f"{scope}:ip:{request.remote_addr}", self.limits['ip'])]
+        if identifier:
+            buckets.append((f"{scope}:id:{identifier.strip().lower()}", self.limits['id']))
+        return buckets
+
+    def take(self, scope, identifier):
+        """0 once a token is taken from each of the attempt's buckets, else seconds to wait."""
+        taken = []
+        for key, (capacity, rate) in self._buckets(scope, identifier):
+            wait = self.store.take(key, capacity, rate)
+            if wait:
+                # A turned-away attempt costs nothing from the buckets it did pass
+                for taken_key, limit in taken:
+                    self.store.give_back(taken_key, *limit)
+                return wait
+            taken.append((key, (capacity, rate)))
+        return 0
+
+    def give_back(self, scope, identifier):
+        for key, (capacity, rate) in self._buckets(scope, identifier):
+            self.store.give_back(key, capacity, rate)
+
+def limiter():
+    return current_app.extensions.get('login_limiter')
+
+def throttled_login(scope, identifier, template):
+    """Turn away POSTs to a sign-in view whose IP or identifier has run out of attempts.
+
+    identifier(form) names the account being tried. The view calls
+    login_succeeded() on a successful sign-in to give the attempt back.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            login_limiter = limiter()
+            if login_limiter is None or request.method != "POST":
+                return view(*args, **kwargs)
+            name = identifier(request.form)
+            wait = login_limiter.take(scope, name)
+            if wait:
+                retry_after = max(1, int(wait + 0.999))
+                flash(f"Too many sign-in attempts. Please try again in {retry_after} seconds.", "danger")
+                return render_template(template), 429, {"Retry-After": str(retry_after)}
+            g.login_attempt = (scope, name)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def login_succeeded():
+    """Return the current sign-in attempt's tokens; it does not count as a failure."""
+    attempt = g.pop('login_attempt', None)
+    if attempt is not None:
+        limiter().give_back(*attempt)
+
+def init_app(app):
+    """Create app's sign-in limiter, in memory or in the shared RATE_LIMIT_DB file."""
+    app.extensions['login_limiter'] = None
+    if not app.config['RATE_LIMIT_ENABLED']:
+        return
+    for name in ('RATE_LIMIT_LOGIN_PER_IP', 'RATE_LIMIT_LOGIN_PER_ID', 'RATE_LIMIT_WINDOW', 'RATE_LIMIT_STORE_SIZE'):
+        if app.config[name] < 1:
+            raise ValueError(f"{name} must be at least 1, got {app.config[name]!r} (set RATE_LIMIT=0 to turn limiting off)")
+    if app.config['RATE_LIMIT_DB']:
+        store = SQLiteStore(app.config['RATE_LIMIT_DB'])
+    else:
+        store = MemoryStore(app.config['RATE_LIMIT_STORE_SIZE'])
+    app.extensions['login_limiter'] = LoginLimiter(store, app.config['RATE_LIMIT_LOGIN_PER_IP'],
+                                                   app.config['RATE_LIMIT_LOGIN_PER_ID'],
+                                                   app.config['RATE_LIMIT_WINDOW'])
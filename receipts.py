@@ -0,0 +1,65 @@
+"""
+Content-addressed storage for uploaded fee receipts.
+
+Uploads are streamed to disk in fixed-size chunks while their SHA-256 is
+computed, then stored once under UPLOAD_FOLDER/ab/cd/<sha256>.<ext>. Two
+parents uploading the same PDF share one file, and no directory grows past
+a few hundred entries.
+"""
+
+import hashlib
+import os
+import tempfile
+
+CHUNK_SIZE = 64 * 1024
+
+class ReceiptTooLarge(Exception):
+    """Raised when an upload is bigger than the configured receipt size limit."""
+
+def receipt_path(digest, ext):
+    """Relative, '/'-separated storage path for a receipt with this hash."""
+    return f"{digest[:2]}/{digest[2:4]}/{digest}.{ext}"
+
+def hash_file(path):
+    """SHA-256 hex digest of a file on disk, read in chunks."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def place_file(tmp_path, upload_folder, digest, ext):
+    """Move a fully written file to its content address, dropping it if already stored."""
+    relative = receipt_path(digest, ext)
+    final = os.path.join(upload_folder, *relative.split("/"))
+    if os.path.exists(final):
+        os.remove(tmp_path)
+    else:
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        os.replace(tmp_path, final)
+    return relative
+
+def store_receipt(stream, upload_folder, ext, max_bytes):
+    """Stream an upload into content-addressed storage.
+
+    Returns (relative path, sha256 hex). Raises ReceiptTooLarge, leaving
+    nothing behind, once more than max_bytes have been read.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    # Write next to the final location so the move is an atomic rename
+    fd, tmp_path = tempfile.mkstemp(prefix=".upload-", dir=upload_folder)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ReceiptTooLarge(f"receipt is larger than {max_bytes} bytes")
+                hasher.update(chunk)
+                out.write(chunk)
+        digest = hasher.hexdigest()
+        return place_file(tmp_path, upload_folder, digest, ext), digest
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,106 @@
+"""
+Report-card analytics, materialised in the mark_summary table.
+
+For every student there is one row per scope: overall, per subject, per exam
+type and per subject and exam type. Totals come from one GROUP BY per scope;
+percentage, class rank (RANK), percentile (CUME_DIST) and class average (AVG)
+are window functions over the scope within the student's (student_class,
+section). SQLite needs 3.25+ for window functions.
+
+A write to Marks only moves the numbers of its own section, so the routes
+that write marks call refresh_section() before committing, in the same
+transaction, and the dashboards read finished rows. `flask report-cards`
+rebuilds every section, e.g. after add_report_cards.py.
+"""
+
+from datetime import datetime
+
+from models import db, MarkSummary, Marks, Student
+
+# (group by subject?, group by exam_type?): overall, per subject, per exam type, per paper
+SCOPES = ((False, False), (True, False), (False, True), (True, True))
+
+COLUMNS = ('student_id', 'student_class', 'section', 'subject', 'exam_type', 'exams', 'total_obtained',
+           'total_max', 'percentage', 'class_rank', 'class_size', 'class_average', 'percentile', 'updated_at')
+
+def _scope_totals(by_subject, by_exam, student_class=None, section=None):
+    subject = Marks.subject if by_subject else db.literal('')
+    exam_type = Marks.exam_type if by_exam else db.literal('')
+    query = (db.select(Marks.student_id, Student.student_class, Student.section,
+                       subject.label('subject'), exam_type.label('exam_type'),
+                       db.func.count(Marks.id).label('exams'),
+                       db.func.sum(Marks.marks_obtained).label('total_obtained'),
+                       db.func.sum(Marks.max_marks).label('total_max'))
+             .join(Student, Student.id == Marks.student_id)
+             .group_by(Marks.student_id, Student.student_class, Student.section,
+                       *([Marks.subject] if by_subject else []), *([Marks.exam_type] if by_exam else [])))
+    if student_class is not None:
+        query = query.where(Student.student_class == student_class, Student.section == section)
+    return query
+
+def summary_rows(student_class=None, section=None):
+    """SELECT producing mark_summary rows (in COLUMNS order) for one section, or all when none is given."""
+    totals = db.union_all(*[_scope_totals(by_subject, by_exam, student_class, section)
+                            for by_subject, by_exam in SCOPES]).subquery()
+    percentage = 100.0 * totals.c.total_obtained / db.func.nullif(totals.c.total_max, 0)
+    scope = [totals.c.student_class, totals.c.section, totals.c.subject, totals.c.exam_type]
+    return db.select(
+        totals.c.student_id, totals.c.student_class, totals.c.section, totals.c.subject, totals.c.exam_type,
+        totals.c.exams, totals.c.total_obtained, totals.c.total_max,
+        percentage.label('percentage'),
+        db.func.rank().over(partition_by=scope, order_by=percentage.desc()).label('class_rank'),
+        db.func.count().over(partition_by=scope).label('class_size'),
+        db.func.avg(percentage).over(partition_by=scope).label('class_average'),
+        (100.0 * db.func.cume_dist().over(partition_by=scope, order_by=percentage)).label('percentile'),
+        db.literal(datetime.utcnow(), db.DateTime).label('updated_at'),
+    )
+
+def refresh_section(student_class, section):
+    """Recompute the summary rows of one section inside the caller's transaction."""
+    db.session.flush()  # marks added or changed in this transaction count too
+    db.session.execute(
+        db.delete(MarkSummary)
+        .where(MarkSummary.student_class == student_class, MarkSummary.section == section)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(db.insert(MarkSummary).from_select(COLUMNS, summary_rows(student_class, section)))
+
+def rebuild_all():
+    """Recompute every section; returns the number of summary rows. The caller commits."""
+    db.session.execute(db.delete(MarkSummary).execution_options(synchronize_session=False))
+    db.session.execute(db.insert(MarkSummary).from_select(COLUMNS, summary_rows()))
+    return db.session.query(db.func.count(MarkSummary.id)).scalar()
+
+def student_report(student_id):
+    """A student's report card in one query: the overall row and the per-subject, per-exam and per-paper rows."""
+    report = {'overall': None, 'subjects': [], 'exams': [], 'papers': []}
+    rows = (MarkSummary.query.filter_by(student_id=student_id)
+            .order_by(MarkSummary.subject, MarkSummary.exam_type).all())
+    for row in rows:
+        if row.subject and row.exam_type:
+            report['papers'].append(row)
+        elif row.subject:
+            report['subjects'].append(row)
+        elif row.exam_type:
+            report['exams'].append(row)
+        else:
+            report['overall'] = row
+    return report
+
+def section_ranking(student_class, section):
+    """Overall summary rows of a section, best first, with their students loaded."""
+    return (MarkSummary.query
+            .filter_by(student_class=student_class, section=section, subject='', exam_type='')
+            .options(db.joinedload(MarkSummary.student))
+            .order_by(MarkSummary.class_rank, MarkSummary.student_id).all())
+
+def section_subjects(student_class, section):
+    """Per-subject class average, highest and lowest percentage for a section."""
+    return (db.session.query(MarkSummary.subject,
+                             db.func.max(MarkSummary.class_average).label('class_average'),
+                             db.func.max(MarkSummary.percentage).label('highest'),
+                             db.func.min(MarkSummary.percentage).label('lowest'),
+                             db.func.count(MarkSummary.id).label('students'))
+            .filter(MarkSummary.student_class == student_class, MarkSummary.section == section,
+                    MarkSummary.subject != '', MarkSummary.exam_type == '')
+            .group_by(MarkSummary.subject).order_by(MarkSummary.subject).all())
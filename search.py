@@ -0,0 +1,123 @@
+"""
+Full-text search over fee payments and contact messages.
+
+On SQLite each searchable table gets an external-content FTS5 index
+(<table>_fts) kept in sync by triggers. Searches become ranked prefix
+matches against that index; on other backends, or before the index has
+been installed, they fall back to the old ILIKE filters.
+"""
+
+import time
+
+from sqlalchemy import column, or_, select, table, text
+
+# table name -> columns indexed for search
+SEARCH_COLUMNS = {
+    'fee_payment': ('student_name', 'roll_no', 'parent_name'),
+    'contact_message': ('name', 'email', 'subject', 'message'),
+}
+
+# (bind url, table) -> True once the FTS index is found, or the monotonic time
+# before which a missing index is not looked up again
+_available = {}
+
+# A worker started before add_search_index.py ran notices the new index within this long
+MISSING_INDEX_RECHECK_SECONDS = 30
+
+def search_index_ddl(tablename):
+    """SQL statements creating the FTS5 table and sync triggers for one table."""
+    fts = f"{tablename}_fts"
+    cols = SEARCH_COLUMNS[tablename]
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{col_list}, content='{tablename}', content_rowid='id', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tablename} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tablename} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); END",
+        # Only fire when a searched column changes, so status updates stay cheap
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {tablename} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+    ]
+
+def install_search_index(cursor):
+    """Create any missing FTS indexes on a SQLite DB-API cursor and backfill them.
+
+    Returns the names of the indexes that were created.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    existing = {row[0] for row in cursor.fetchall()}
+    created = []
+    for tablename in SEARCH_COLUMNS:
+        fts = f"{tablename}_fts"
+        if tablename not in existing:
+            continue
+        for statement in search_index_ddl(tablename):
+            cursor.execute(statement)
+        if fts not in existing:
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            created.append(fts)
+    _available.clear()
+    return created
+
+def search_available(session, tablename):
+    """True when the bound database is SQLite and has the FTS index for tablename.
+
+    A found index is remembered for the life of the process; a missing one is
+    looked up again after MISSING_INDEX_RECHECK_SECONDS.
+    """
+    bind = session.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return False
+    key = (str(bind.url), tablename)
+    state = _available.get(key)
+    if state is True:
+        return True
+    if state is not None and time.monotonic() < state:
+        return False
+    found = session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': f"{tablename}_fts"}
+    ).first() is not None
+    _available[key] = True if found else time.monotonic() + MISSING_INDEX_RECHECK_SECONDS
+    return found
+
+def match_expression(terms):
+    """Turn free text into an FTS5 prefix query: every word must match a prefix."""
+    words = [w.replace('"', '') for w in terms.split()]
+    return " ".join(f'"{w}"*' for w in words if w)
+
+def _matches(model, expression):
+    fts = f"{model.__tablename__}_fts"
+    return (
+        select(column('rowid'), column('rank'))
+        .select_from(table(fts))
+        .where(text(f"{fts} MATCH :fts_query").bindparams(fts_query=expression))
+    )
+
+def _like_filter(query, terms, like_columns):
+    return query.filter(or_(*[c.ilike(f'%{terms}%') for c in like_columns]))
+
+def filter_by_search(query, model, terms, like_columns):
+    """Restrict query to rows matching terms, keeping the caller's ordering."""
+    expression = match_expression(terms)
+    if not expression:
+        return query
+    if not search_available(query.session, model.__tablename__):
+        return _like_filter(query, terms, like_columns)
+    matches = _matches(model, expression).with_only_columns(column('rowid'))
+    return query.filter(model.id.in_(matches))
+
+def rank_by_search(query, model, terms, like_columns):
+    """Restrict query to rows matching terms, best matches first (bm25 rank)."""
+    expression = match_expression(terms)
+    if not expression:
+        return query
+    if not search_available(query.session, model.__tablename__):
+        return _like_filter(query, terms, like_columns)
+    matches = _matches(model, expression).subquery()
+    return query.join(matches, model.id == matches.c.rowid).order_by(matches.c.rank)
@@ -0,0 +1,60 @@
+"""
+SQLite runtime profile.
+
+Out of the box SQLite uses a rollback journal, so a writer locks out readers
+and concurrent form posts fail with "database is locked". init_app() applies
+SQLITE_PRAGMAS to every new DB-API connection through the engine's `connect`
+event: WAL lets readers run alongside the single writer, busy_timeout makes
+writers queue instead of failing, and mmap/cache/temp_store keep hot pages in
+memory. WAL files grow until checkpointed, so run `flask sqlite-maintenance`
+periodically (e.g. nightly from cron).
+"""
+
+import re
+
+from sqlalchemy import event
+
+_VALUE = re.compile(r"^-?\w+$")
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """Run each PRAGMA name = value on a raw sqlite3 connection, in order."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if not name.isidentifier() or not _VALUE.match(str(value)):
+                raise ValueError(f"invalid SQLite pragma {name}={value!r}")
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+def install(engine, pragmas):
+    """Apply pragmas to every connection engine opens from now on."""
+    @event.listens_for(engine, "connect")
+    def _apply_profile(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+def current_pragmas(connection, names):
+    """{name: value} as SQLite reports them on an open SQLAlchemy connection."""
+    return {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
+
+def maintenance(connection):
+    """Checkpoint the WAL back into the database file and refresh planner statistics.
+
+    Returns (busy, wal_frames, checkpointed_frames); the frame counts are -1
+    when the database is not in WAL mode.
+    """
+    # TRUNCATE reports zeros once the log is reset, so count frames with a passive pass first
+    _, wal_frames, checkpointed = connection.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)").one()
+    busy = connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").one()[0]
+    connection.exec_driver_sql("PRAGMA optimize")
+    return busy, wal_frames, checkpointed
+
+def init_app(app, db):
+    """Install the SQLITE_PRAGMAS profile on db's engine when it is SQLite."""
+    pragmas = app.config.get("SQLITE_PRAGMAS")
+    if not pragmas:
+        return
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name == "sqlite":
+        install(engine, pragmas)
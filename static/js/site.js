@@ -0,0 +1,74 @@
+// Site-wide behaviour for base.html; loaded with defer, so the DOM is parsed when this runs
+
+// Enhanced mobile menu with animation
+const menuBtn = document.getElementById("menuBtn");
+const mobileMenu = document.getElementById("mobileMenu");
+const line1 = document.getElementById("line1");
+const line2 = document.getElementById("line2");
+const line3 = document.getElementById("line3");
+let isMenuOpen = false;
+
+menuBtn.addEventListener("click", () => {
+  isMenuOpen = !isMenuOpen;
+
+  // Animate hamburger to X
+  if (isMenuOpen) {
+    line1.style.transform = 'rotate(45deg) translate(5px, 5px)';
+    line2.style.opacity = '0';
+    line3.style.transform = 'rotate(-45deg) translate(7px, -6px)';
+  } else {
+    line1.style.transform = 'none';
+    line2.style.opacity = '1';
+    line3.style.transform = 'none';
+  }
+
+  mobileMenu.classList.toggle("hidden");
+});
+
+// Navbar hide on scroll down, show on scroll up
+let lastScrollTop = 0;
+const navbar = document.getElementById("navbar");
+window.addEventListener("scroll", function() {
+  let scrollTop = window.scrollY;
+  if (scrollTop > lastScrollTop && scrollTop > 60) {
+    navbar.classList.remove("nav-visible");
+    navbar.classList.add("nav-hidden");
+  } else {
+    navbar.classList.remove("nav-hidden");
+    navbar.classList.add("nav-visible");
+  }
+  lastScrollTop = scrollTop;
+});
+
+// Add parallax effect to background
+window.addEventListener("scroll", () => {
+  const scrolled = window.pageYOffset;
+  const parallax = document.querySelector('body::before');
+  if (parallax) {
+    const speed = 0.5;
+    parallax.style.transform = `translateY(${scrolled * speed}px)`;
+  }
+});
+
+// Add intersection observer for animations
+const observerOptions = {
+  threshold: 0.1,
+  rootMargin: '0px 0px -50px 0px'
+};
+
+const observer = new IntersectionObserver((entries) => {
+  entries.forEach(entry => {
+    if (entry.isIntersecting) {
+      entry.target.classList.add('slide-in-up');
+    }
+  });
+}, observerOptions);
+
+// Observe elements for animation
+document.addEventListener('DOMContentLoaded', () => {
+  const animateElements = document.querySelectorAll('.hover-lift, .glass');
+  animateElements.forEach(el => observer.observe(el));
+});
+
+// Footer year
+document.getElementById("year").textContent = new Date().getFullYear();
@@ -0,0 +1,8 @@
+/** Tailwind build config used by build_assets.py: only classes found in these files are emitted. */
+module.exports = {
+  content: ["./templates/**/*.html", "./static/js/**/*.js"],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};
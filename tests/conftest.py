@@ -0,0 +1,72 @@
+"""
+Shared fixtures: an app on a temporary SQLite database filled by
+benchmarks.seed_data, and a client signed in as admin, teacher and parent.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from benchmarks import seed_data  # noqa: E402
+from config import Config  # noqa: E402
+from models import db, Student  # noqa: E402
+
+# Small but with several rows per section, so per-row queries show up as extra statements
+TEST_VOLUMES = {"students": 120, "teachers": 24, "payments": 600, "marks": 1200, "visits": 60, "contacts": 60}
+
+def make_app(tmp_path, **settings):
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        UPLOAD_FOLDER = str(tmp_path / "uploads")
+        JINJA_BYTECODE_CACHE_DIR = None
+        PAGE_CACHE_DIR = None
+        PAGE_CACHE_STAMP = str(tmp_path / "page_cache_generation")
+        WRITE_BEHIND = False
+        RATE_LIMIT_DB = None
+        SLOW_QUERY_THRESHOLD_MS = float("inf")
+        PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"  # the KDF cost is not under test
+    for name, value in settings.items():
+        setattr(TestConfig, name, value)
+    return create_app(TestConfig)
+
+@pytest.fixture(scope="session")
+def seeded_app(tmp_path_factory):
+    """App with TEST_VOLUMES of seeded rows, shared by the read-only tests."""
+    app = make_app(tmp_path_factory.mktemp("seeded"))
+    with app.app_context():
+        seed_data.reset_database()
+        seed_data.seed(TEST_VOLUMES, random.Random(42))
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+@pytest.fixture
+def app(tmp_path):
+    """App on an empty database of its own, for tests that write."""
+    app = make_app(tmp_path)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+@pytest.fixture
+def signed_in_client(seeded_app):
+    """Client whose session is admin, a seeded teacher and a seeded parent at once."""
+    client = seeded_app.test_client()
+    _, roll_no = seed_data.parent_login(0)
+    with seeded_app.app_context():
+        student_id = db.session.query(Student.id).filter_by(roll_no=roll_no).scalar()
+    with client.session_transaction() as session:
+        session["admin_logged_in"] = True
+        session["teacher_logged_in"] = True
+        session["teacher_id"] = seed_data.teacher_login(0)
+        session["parent_logged_in"] = True
+        session["student_id"] = student_id
+    return client
@@ -0,0 +1,45 @@
+"""add_indexes.py on the shipped database, before and after the migrations it depends on."""
+
+import os
+import shutil
+import sqlite3
+
+from add_indexes import INDEXES, add_indexes
+from add_ingest_checkpoint import add_ingest_checkpoint
+from add_report_cards import add_report_cards
+from add_search_index import add_search_index
+from add_thumbnail_jobs import add_thumbnail_jobs
+from add_visit_slots import add_visit_slots
+from migrate_receipts import migrate_receipts
+
+SHIPPED_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "navyug.db")
+
+def index_names(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    finally:
+        conn.close()
+
+def test_names_missing_migrations_and_changes_nothing(tmp_path, capsys):
+    db_path = str(tmp_path / "navyug.db")
+    shutil.copy(SHIPPED_DB, db_path)
+    before = index_names(db_path)
+
+    assert not add_indexes(db_path)
+
+    out = capsys.readouterr().out
+    assert "migrate_receipts.py, add_thumbnail_jobs.py" in out
+    assert "add_search_index.py" in out
+    assert index_names(db_path) == before
+
+def test_adds_indexes_once_migrated(tmp_path):
+    db_path = str(tmp_path / "navyug.db")
+    shutil.copy(SHIPPED_DB, db_path)
+    # The shipped database already has update_database.py's columns
+    assert migrate_receipts(db_path, str(tmp_path / "uploads"))
+    for migrate in (add_thumbnail_jobs, add_ingest_checkpoint, add_report_cards, add_visit_slots, add_search_index):
+        assert migrate(db_path), migrate.__name__
+
+    assert add_indexes(db_path)
+    assert {name for name, _, _ in INDEXES} <= index_names(db_path)
@@ -0,0 +1,35 @@
+"""Admin CSV uploads that cannot be read are reported, not a server error."""
+
+import io
+
+from models import Student
+
+HEADER = "name,roll_no,admission_number,student_class,section,parent_name,parent_phone,admission_date\n"
+
+def student_line(i, name="Asha"):
+    return f"{name},R{i},A{i},5,A,Parent {i},98000000{i:02d},2024-04-01\n"
+
+def upload(app, data):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["admin_logged_in"] = True
+    response = client.post("/admin/import/students?format=json",
+                           data={"file": (io.BytesIO(data), "students.csv")})
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_latin1_upload_is_reported(app):
+    report = upload(app, (HEADER + student_line(1, "José")).encode("latin-1"))
+    assert report["inserted"] == 0
+    assert len(report["errors"]) == 1
+    assert "not UTF-8" in report["errors"][0]["error"]
+
+def test_rows_before_a_malformed_record_are_imported(app):
+    too_long = "x" * 200_000  # over csv's field size limit
+    data = HEADER + student_line(1) + student_line(2) + f'"{too_long}",R3\n' + student_line(4)
+    report = upload(app, data.encode())
+    assert report["inserted"] == 2
+    assert [error["row"] for error in report["errors"]] == [4]
+    assert "malformed CSV" in report["errors"][0]["error"]
+    with app.app_context():
+        assert sorted(s.roll_no for s in Student.query) == ["R1", "R2"]
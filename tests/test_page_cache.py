@@ -0,0 +1,24 @@
+"""`flask clear-page-cache` reaches the page caches of workers already running."""
+
+import pytest
+
+from conftest import make_app
+
+def cache_state(client, path="/about"):
+    return client.get(path).headers["X-Page-Cache"]
+
+@pytest.mark.parametrize("shared_dir", [False, True])
+def test_clear_page_cache_reaches_other_workers(tmp_path, shared_dir):
+    settings = {"PAGE_CACHE_DIR": str(tmp_path / "pages") if shared_dir else None}
+    # Two apps on one stamp file stand in for a web worker and the CLI process
+    worker = make_app(tmp_path, **settings)
+    cli = make_app(tmp_path, **settings)
+    client = worker.test_client()
+    assert cache_state(client) == "miss"
+    assert cache_state(client) == "hit"
+
+    result = cli.test_cli_runner().invoke(args=["clear-page-cache"])
+    assert result.exit_code == 0, result.output
+
+    assert cache_state(client) == "miss"
+    assert cache_state(client) == "hit"
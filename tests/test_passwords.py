@@ -0,0 +1,52 @@
+"""Password hashing and the admin/teacher sign-in checks."""
+
+import pytest
+
+import passwords
+from models import db, Teacher
+from passwords import PasswordHasher
+
+def make_hasher(method):
+    return PasswordHasher(method, workers=1, queue_size=4, wait=5, cache_size=0, cache_ttl=0)
+
+@pytest.mark.parametrize("method", ["pbkdf2", "pbkdf2:sha256", "pbkdf2:sha256:1000"])
+def test_hash_made_with_shorthand_method_is_current(method):
+    hasher = make_hasher(method)
+    stored = hasher.hash("secret")
+    assert not hasher.needs_rehash(stored)
+    assert hasher.verify(stored, "secret") == (True, None)
+
+def test_other_cost_and_plaintext_are_rehashed():
+    hasher = make_hasher("pbkdf2:sha256:1000")
+    ok, replacement = hasher.verify(make_hasher("pbkdf2:sha256:2000").hash("secret"), "secret")
+    assert ok and replacement.startswith("pbkdf2:sha256:1000$")
+    ok, replacement = hasher.verify("secret", "secret")
+    assert ok and passwords.is_hashed(replacement)
+
+def test_teacher_sign_in_keeps_a_current_hash(app):
+    app.extensions["passwords"] = make_hasher("pbkdf2:sha256")
+    with app.app_context():
+        db.session.add(Teacher(teacher_id="T1", name="Asha", password="plain", assigned_class="5",
+                               assigned_section="A"))
+        db.session.commit()
+    form = {"login_type": "teacher", "teacher_id": "T1", "password": "plain"}
+    stored = []
+    for _ in range(3):
+        assert app.test_client().post("/admin/login", data=form).headers["Location"].endswith("/teacher/dashboard")
+        with app.app_context():
+            stored.append(Teacher.query.one().password)
+    # Migrated from plaintext on the first sign-in, then left alone
+    assert passwords.is_hashed(stored[0]) and stored[0] == stored[1] == stored[2]
+
+@pytest.mark.parametrize("username", ["admin", "someone-else"])
+def test_admin_password_is_checked_whatever_the_username(app, monkeypatch, username):
+    hasher = make_hasher("pbkdf2:sha256:1000")
+    app.config["ADMIN_PASSWORD_HASH"] = hasher.hash("navyug123")
+    app.extensions["passwords"] = hasher
+    checked = []
+    verify = hasher.verify
+    monkeypatch.setattr(hasher, "verify", lambda stored, password: checked.append(password) or verify(stored, password))
+    response = app.test_client().post("/admin/login", data={"login_type": "admin", "username": username,
+                                                            "password": "wrong"})
+    assert response.status_code == 302
+    assert checked == ["wrong"]
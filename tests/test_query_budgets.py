@@ -0,0 +1,9 @@
+"""ROUTE_QUERY_BUDGETS hold on seeded data, so an N+1 regression fails the suite."""
+
+from models import db
+from query_budget import check_route_budgets
+
+def test_route_query_budgets(seeded_app, signed_in_client):
+    with seeded_app.app_context():
+        failures = check_route_budgets(signed_in_client, db.engine)
+    assert not failures, "\n\n".join(str(f) for f in failures)
@@ -0,0 +1,9 @@
+"""The queries the pages really run are answered from indexes, not full table scans."""
+
+from models import db
+from query_budget import route_table_scans
+
+def test_route_queries_use_indexes(seeded_app, signed_in_client):
+    with seeded_app.app_context():
+        failures = route_table_scans(signed_in_client, db.engine)
+    assert not failures, "\n".join(f"{route}: {detail}\n  {statement}" for route, detail, statement in failures)
@@ -0,0 +1,17 @@
+"""Sign-in throttling and its configuration."""
+
+import pytest
+
+from conftest import make_app
+
+@pytest.mark.parametrize("name", ["RATE_LIMIT_WINDOW", "RATE_LIMIT_LOGIN_PER_IP", "RATE_LIMIT_LOGIN_PER_ID",
+                                  "RATE_LIMIT_STORE_SIZE"])
+def test_non_positive_limits_are_rejected(tmp_path, name):
+    with pytest.raises(ValueError, match=name):
+        make_app(tmp_path, **{name: 0})
+
+def test_failed_parent_sign_ins_are_throttled(app):
+    client = app.test_client()
+    form = {"admission_number": "ADM1", "roll_number": "R1"}
+    statuses = [client.post("/parent/login", data=form).status_code for _ in range(app.config["RATE_LIMIT_LOGIN_PER_ID"] + 1)]
+    assert statuses[-1] == 429 and set(statuses[:-1]) == {302}
@@ -0,0 +1,30 @@
+"""Receipt uploads on the public fee form."""
+
+import io
+import os
+
+import pytest
+
+from models import FeePayment
+
+FEE_FORM = {"student_name": "Asha", "roll_no": "R1", "student_class": "5", "parent_name": "Ravi",
+            "parent_phone": "9000000000", "payment_month": "April", "amount": "1500"}
+
+@pytest.mark.parametrize("filename", ["receipt.pdf", ".pdf", "..png", "scan.JPG"])
+def test_receipt_is_stored_under_its_extension(app, filename):
+    # secure_filename() strips dot-leading names to nothing; the extension must not depend on it
+    response = app.test_client().post("/fee", data=dict(FEE_FORM, receipt=(io.BytesIO(b"%PDF-1.4 test"), filename)),
+                                      content_type="multipart/form-data")
+    assert response.status_code == 302
+    with app.app_context():
+        payment = FeePayment.query.one()
+    ext = filename.rsplit(".", 1)[1].lower()
+    assert payment.receipt_filename.endswith("." + ext)
+    assert os.path.exists(os.path.join(app.config["UPLOAD_FOLDER"], payment.receipt_filename))
+
+def test_receipt_with_other_extension_is_refused(app):
+    response = app.test_client().post("/fee", data=dict(FEE_FORM, receipt=(io.BytesIO(b"MZ"), "setup.exe")),
+                                      content_type="multipart/form-data")
+    assert response.status_code == 302
+    with app.app_context():
+        assert FeePayment.query.count() == 0
@@ -0,0 +1,39 @@
+"""Admin search gives the same rows with and without the FTS index."""
+
+import sqlite3
+
+import search
+from models import db, ContactMessage
+from search import rank_by_search, search_index_ddl
+
+LIKE_COLUMNS = [ContactMessage.name, ContactMessage.email, ContactMessage.subject, ContactMessage.message]
+
+def _build_index_elsewhere(app):
+    # As add_search_index.py would, from another process: this one is not told
+    path = app.config["SQLALCHEMY_DATABASE_URI"].removeprefix("sqlite:///")
+    conn = sqlite3.connect(path)
+    for statement in search_index_ddl("contact_message"):
+        conn.execute(statement)
+    conn.execute("INSERT INTO contact_message_fts(contact_message_fts) VALUES ('rebuild')")
+    conn.commit()
+    conn.close()
+
+def _search(terms):
+    return sorted(c.id for c in rank_by_search(ContactMessage.query, ContactMessage, terms, LIKE_COLUMNS))
+
+def test_contact_search_matches_with_and_without_index(app, monkeypatch):
+    monkeypatch.setattr(search, "MISSING_INDEX_RECHECK_SECONDS", 0)
+    with app.app_context():
+        db.session.add_all([
+            ContactMessage(name="Meena", email="meena@example.com", subject="transport", message="Bus timing?"),
+            ContactMessage(name="Arjun", email="arjun@example.com", subject="fees", message="Receipt copy"),
+            ContactMessage(name="Kiran", email="kiran@example.com", subject="general", message="About transport"),
+        ])
+        db.session.commit()
+        assert not search.search_available(db.session, "contact_message")
+        without_index = {terms: _search(terms) for terms in ("transport", "fees", "meena")}
+
+        _build_index_elsewhere(app)
+        assert search.search_available(db.session, "contact_message")
+        assert {terms: _search(terms) for terms in without_index} == without_index
+        assert without_index["transport"] == [1, 3]
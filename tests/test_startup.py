@@ -0,0 +1,37 @@
+"""create_db.py and the `flask` commands load only what they use."""
+
+import os
+import subprocess
+import sys
+
+import commands
+from csv_import import IMPORT_KINDS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOADED_AFTER_CREATE_DB = """
+import runpy, sys
+runpy.run_path("create_db.py", run_name="__main__")
+print(sorted(m for m in ("app", "views", "helpers", "passwords", "csv_import") if m in sys.modules))
+"""
+
+def test_create_db_skips_the_web_app(tmp_path):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'new.db'}")
+    result = subprocess.run([sys.executable, "-c", LOADED_AFTER_CREATE_DB], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    assert "Database created successfully" in result.stdout
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+def test_commands_module_imports_no_command_dependencies():
+    code = "import sys, commands; print(sorted(m for m in ('passwords', 'csv_import', 'report_cards') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+def test_import_csv_kinds_match_csv_import():
+    kind = next(param for param in commands.import_csv_command.params if param.name == "kind")
+    assert tuple(kind.type.choices) == IMPORT_KINDS
+
+def test_commands_import_what_they_need(seeded_app):
+    result = seeded_app.test_cli_runner().invoke(args=["hash-password"], input="secret\nsecret\n")
+    assert result.exit_code == 0, result.output
+    assert result.output.strip().splitlines()[-1].startswith("pbkdf2:sha256:1000$")
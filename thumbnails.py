@@ -0,0 +1,76 @@
+"""
+Thumbnails and first-page previews for uploaded receipts.
+
+Rendering happens in background workers, never on the upload request. Each
+receipt gets a small thumbnail for the fee dashboard and a larger preview of
+its first page, written next to the originals under
+UPLOAD_FOLDER/thumbs/ab/cd/<sha256>-<variant>.jpg. Images are handled with
+Pillow and PDFs are rasterised with poppler's pdftoppm; both are optional,
+and a receipt that cannot be rendered here raises ThumbnailUnsupported.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+# variant -> bounding box in pixels, largest first
+VARIANTS = {
+    "preview": (800, 1100),
+    "thumb": (160, 160),
+}
+JPEG_QUALITY = 80
+PDF_DPI = 100
+PDF_TIMEOUT_SECONDS = 60
+
+class ThumbnailUnsupported(Exception):
+    """Raised when this server cannot render a receipt of that type."""
+
+def thumbnail_path(digest, variant):
+    """Relative, '/'-separated storage path for a rendered variant."""
+    return f"thumbs/{digest[:2]}/{digest[2:4]}/{digest}-{variant}.jpg"
+
+def _first_page(pdf_path, workdir):
+    """Rasterise page one of a PDF to a JPEG in workdir and return its path."""
+    pdftoppm = shutil.which("pdftoppm")
+    if not pdftoppm:
+        raise ThumbnailUnsupported("pdftoppm is not installed")
+    prefix = os.path.join(workdir, "page")
+    subprocess.run(
+        [pdftoppm, "-jpeg", "-r", str(PDF_DPI), "-f", "1", "-l", "1", "-singlefile", pdf_path, prefix],
+        check=True, capture_output=True, timeout=PDF_TIMEOUT_SECONDS,
+    )
+    return prefix + ".jpg"
+
+def render_thumbnails(source, upload_folder, digest):
+    """Write every variant of the receipt at source; returns {variant: relative path}."""
+    # Imported here: only the processes that render pay for loading Pillow
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:  # Pillow is optional; receipts then keep the plain link
+        raise ThumbnailUnsupported("Pillow is not installed")
+    with tempfile.TemporaryDirectory(prefix=".thumbs-", dir=upload_folder) as workdir:
+        page = _first_page(source, workdir) if source.lower().endswith(".pdf") else source
+        with Image.open(page) as img:
+            # Let the JPEG decoder downscale while reading; far cheaper than a full decode
+            img.draft("RGB", VARIANTS["preview"])
+            img = ImageOps.exif_transpose(img).convert("RGB")
+            written = {}
+            for variant, size in VARIANTS.items():
+                img.thumbnail(size)  # in place, so each smaller variant starts from the last
+                relative = thumbnail_path(digest, variant)
+                final = os.path.join(upload_folder, *relative.split("/"))
+                os.makedirs(os.path.dirname(final), exist_ok=True)
+                tmp_path = os.path.join(workdir, f"{variant}.jpg")
+                img.save(tmp_path, "JPEG", quality=JPEG_QUALITY, optimize=True)
+                os.replace(tmp_path, final)
+                written[variant] = relative
+    return written
+
+def remove_thumbnails(upload_folder, digest):
+    """Delete every rendered variant of a receipt, ignoring ones that are missing."""
+    for variant in VARIANTS:
+        try:
+            os.remove(os.path.join(upload_folder, *thumbnail_path(digest, variant).split("/")))
+        except OSError:
+            pass
@@ -0,0 +1,11 @@
+"""
+Blueprints for the web app, one module per audience. Routes keep their
+original URLs; endpoints are named <blueprint>.<view>, e.g.
+url_for('admin.admin_dashboard').
+"""
+
+def init_app(app):
+    """Register the public, admin, teacher and parent blueprints on app."""
+    from views import admin, parent, public, teacher
+    for module in (public, admin, teacher, parent):
+        app.register_blueprint(module.bp)
@@ -0,0 +1,885 @@
+"""
+Admin pages: fee dashboard, students, teachers, visits, contacts, imports and
+the performance page. Teacher sign-in also goes through admin_login().
+"""
+
+import base64
+import csv
+import hmac
+import io
+import os
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+from flask import (Blueprint, Response, abort, current_app, flash, jsonify, redirect, render_template, request,
+                   send_from_directory, session, stream_with_context, url_for)
+
+import passwords
+import perf
+from csv_import import IMPORT_KINDS, import_csv
+from helpers import BULK_CHUNK_SIZE, admin_logged_in, chunked, queued_submissions, ready_thumbnails
+from models import db, ContactMessage, FeePayment, ReceiptThumbnail, Student, Teacher, Visit
+from ratelimit import login_succeeded, throttled_login
+from search import filter_by_search, rank_by_search
+from thumbnails import remove_thumbnails
+import visit_slots
+
+bp = Blueprint("admin", __name__)
+
+# Page sizes offered on the admin fee dashboard
+DASHBOARD_PAGE_SIZES = (25, 50, 100, 200)
+DEFAULT_PAGE_SIZE = 50
+
+def filter_payments(payments_query, query='', filter_class='', filter_status=''):
+    """Apply the dashboard search/class/status filters to a FeePayment query."""
+    if query:
+        # Full-text match keeps the keyset (submitted_at, id) order intact
+        payments_query = filter_by_search(
+            payments_query, FeePayment, query,
+            [FeePayment.student_name, FeePayment.roll_no, FeePayment.parent_name]
+        )
+    if filter_class:
+        payments_query = payments_query.filter(FeePayment.student_class == filter_class)
+    if filter_status == 'paid':
+        payments_query = payments_query.filter(FeePayment.paid == True)
+    elif filter_status == 'pending':
+        payments_query = payments_query.filter(FeePayment.paid == False)
+    return payments_query
+
+def encode_cursor(payment):
+    """Opaque keyset cursor for a payment's (submitted_at, id) position."""
+    raw = f"{payment.submitted_at.isoformat()}|{payment.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(token):
+    """Return (submitted_at, id) from a cursor, or None if it is missing/invalid."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        submitted_at, payment_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(submitted_at), int(payment_id)
+    except ValueError:
+        return None
+
+# ---- Student roster ----
+# Students per request of the roster API
+ROSTER_PAGE_SIZE = 50
+ROSTER_MAX_PAGE_SIZE = 200
+EMPTY_FEE_SUMMARY = {'payments': 0, 'paid': 0, 'pending': 0, 'paid_amount': 0, 'pending_amount': 0, 'last_payment': None}
+
+def roster_tree():
+    """[{student_class, students, sections: [{section, students}]}] from one GROUP BY.
+
+    The (student_class, section, name) index covers it, so no student row is read.
+    """
+    rows = (db.session.query(Student.student_class, Student.section, db.func.count(Student.id))
+            .group_by(Student.student_class, Student.section)
+            .order_by(Student.student_class, Student.section).all())
+    tree = []
+    for student_class, section, count in rows:
+        if not tree or tree[-1]['student_class'] != student_class:
+            tree.append({'student_class': student_class, 'students': 0, 'sections': []})
+        tree[-1]['students'] += count
+        tree[-1]['sections'].append({'section': section, 'students': count})
+    return tree
+
+def encode_student_cursor(student):
+    """Opaque keyset cursor for a student's (name, id) position in the roster."""
+    raw = f"{student.id}|{student.name}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_student_cursor(token):
+    """Return (name, id) from a roster cursor, or None if it is missing/invalid."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        student_id, name = raw.split("|", 1)
+        return name, int(student_id)
+    except ValueError:
+        return None
+
+def roster_page(student_class, section, after, limit):
+    """A section's students in (name, id) order after the cursor, and the next page's cursor."""
+    query = Student.query.filter(Student.student_class == student_class, Student.section == section)
+    if after:
+        name, student_id = after
+        query = query.filter(db.or_(Student.name > name, db.and_(Student.name == name, Student.id > student_id)))
+    students = query.order_by(Student.name, Student.id).limit(limit + 1).all()
+    next_cursor = encode_student_cursor(students[limit - 1]) if len(students) > limit else None
+    return students[:limit], next_cursor
+
+def fee_summaries(students):
+    """{(roll_no, student_class): fee totals} for the given students in one grouped query.
+
+    Payments are matched on roll number and class, as on the details popup.
+    """
+    if not students:
+        return {}
+    is_paid = FeePayment.paid == True
+    rows = (db.session.query(
+                FeePayment.roll_no, FeePayment.student_class,
+                db.func.count(FeePayment.id),
+                db.func.coalesce(db.func.sum(db.case((is_paid, 1), else_=0)), 0),
+                db.func.coalesce(db.func.sum(db.case((is_paid, FeePayment.amount), else_=0)), 0),
+                db.func.coalesce(db.func.sum(db.case((is_paid, 0), else_=FeePayment.amount)), 0),
+                db.func.max(FeePayment.submitted_at))
+            .filter(FeePayment.roll_no.in_({student.roll_no for student in students}))
+            .group_by(FeePayment.roll_no, FeePayment.student_class).all())
+    return {
+        (roll_no, student_class): {
+            'payments': payments, 'paid': paid, 'pending': payments - paid,
+            'paid_amount': paid_amount, 'pending_amount': pending_amount,
+            'last_payment': last.strftime('%d-%m-%Y') if last else None,
+        } for roll_no, student_class, payments, paid, paid_amount, pending_amount, last in rows
+    }
+
+def parse_ids(values):
+    """Distinct integer ids from form values, ignoring anything non-numeric."""
+    ids = set()
+    for value in values:
+        try:
+            ids.add(int(value))
+        except (TypeError, ValueError):
+            continue
+    return sorted(ids)
+
+def remove_receipts(filenames):
+    """Delete receipt files no payment refers to any more.
+
+    Receipts are stored once per content hash, so a file can be shared by
+    several payments; call this after the deleting transaction commits.
+    """
+    filenames = list(set(filenames))
+    still_used = set()
+    if filenames:
+        # Submissions still in the write-behind queue may share a stored file
+        still_used.update(row.payload.get('receipt_filename') for row in queued_submissions('fee_payment', limit=-1))
+    for chunk in chunked(filenames, BULK_CHUNK_SIZE):
+        still_used.update(name for (name,) in db.session.query(FeePayment.receipt_filename)
+                          .filter(FeePayment.receipt_filename.in_(chunk)))
+    for filename in filenames:
+        if filename in still_used:
+            continue
+        try:
+            os.remove(os.path.join(current_app.config['UPLOAD_FOLDER'], *filename.split('/')))
+        except OSError:
+            pass
+    removed = [name for name in filenames if name not in still_used]
+    for chunk in chunked(removed, BULK_CHUNK_SIZE):
+        jobs = ReceiptThumbnail.query.filter(ReceiptThumbnail.receipt_filename.in_(chunk)).all()
+        for job in jobs:
+            remove_thumbnails(current_app.config['UPLOAD_FOLDER'], job.receipt_sha256)
+            db.session.delete(job)
+    db.session.commit()
+
+def paginate_payments(payments_query, per_page, after=None, before=None):
+    """Keyset pagination over (submitted_at, id), newest first.
+
+    Returns (payments, next_cursor, prev_cursor). Only one of after/before
+    is honoured; before walks back towards newer rows.
+    """
+    position = db.tuple_(FeePayment.submitted_at, FeePayment.id)
+    if before:
+        page_query = payments_query.filter(position > before).order_by(
+            FeePayment.submitted_at.asc(), FeePayment.id.asc())
+    else:
+        if after:
+            payments_query = payments_query.filter(position < after)
+        page_query = payments_query.order_by(
+            FeePayment.submitted_at.desc(), FeePayment.id.desc())
+
+    rows = page_query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    payments = rows[:per_page]
+    if before:
+        payments.reverse()
+
+    if not payments:
+        return payments, None, None
+    has_next = True if before else has_more
+    has_prev = has_more if before else bool(after)
+    next_cursor = encode_cursor(payments[-1]) if has_next else None
+    prev_cursor = encode_cursor(payments[0]) if has_prev else None
+    return payments, next_cursor, prev_cursor
+
+# ---- Dashboard stats ----
+# Summary cards are computed with aggregate/GROUP BY queries over the same
+# filtered query that feeds the page, never by counting rendered rows.
+VISIT_STATUSES = ['scheduled', 'completed', 'cancelled']
+# Days of visit slots shown on the admin visits page
+SLOT_CALENDAR_DAYS = 14
+
+def payment_totals(payments_query):
+    """Count/sum the filtered payments in one aggregate query."""
+    is_paid = FeePayment.paid == True
+    total, paid, revenue = payments_query.order_by(None).with_entities(
+        db.func.count(FeePayment.id),
+        db.func.coalesce(db.func.sum(db.case((is_paid, 1), else_=0)), 0),
+        db.func.coalesce(db.func.sum(db.case((is_paid, FeePayment.amount), else_=0)), 0)
+    ).one()
+    return {'total': total, 'paid': paid, 'pending': total - paid, 'revenue': revenue}
+
+def contact_stats(contacts_query):
+    """Total, per-subject and last-7-days counts in one GROUP BY subject query."""
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    rows = contacts_query.order_by(None).with_entities(
+        ContactMessage.subject,
+        db.func.count(ContactMessage.id),
+        db.func.coalesce(db.func.sum(db.case((ContactMessage.submitted_at >= week_ago, 1), else_=0)), 0)
+    ).group_by(ContactMessage.subject).all()
+    return {
+        'total': sum(count for _, count, _ in rows),
+        'by_subject': {subject or '': count for subject, count, _ in rows},
+        'this_week': sum(recent for _, _, recent in rows)
+    }
+
+def visit_stats(visits_query):
+    """Total and per-status counts in one GROUP BY status query."""
+    rows = visits_query.order_by(None).with_entities(
+        Visit.status, db.func.count(Visit.id)
+    ).group_by(Visit.status).all()
+    by_status = dict.fromkeys(VISIT_STATUSES, 0)
+    for status, count in rows:
+        status = status or 'scheduled'
+        by_status[status] = by_status.get(status, 0) + count
+    return {'total': sum(count for _, count in rows), 'by_status': by_status}
+
+# ---- Routes ----
+# Rows fetched per round trip while streaming the CSV export
+CSV_EXPORT_BATCH_SIZE = 1000
+
+@bp.route("/admin/download_csv")
+def download_csv():
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    # Same filters as the dashboard, so the export matches what the admin sees
+    payments_query = filter_payments(
+        FeePayment.query,
+        request.args.get('query', '').strip(),
+        request.args.get('filter_class', '').strip(),
+        request.args.get('filter_status', '').strip()
+    )
+    rows = payments_query.with_entities(
+        FeePayment.id, FeePayment.student_name, FeePayment.roll_no, FeePayment.student_class,
+        FeePayment.parent_name, FeePayment.parent_phone, FeePayment.payment_month,
+        FeePayment.amount, FeePayment.paid, FeePayment.submitted_at
+    ).order_by(FeePayment.id).yield_per(CSV_EXPORT_BATCH_SIZE)
+
+    def generate():
+        # Reuse one small buffer; only a batch of lines is ever held in memory
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerow(["ID", "Student Name", "Roll No", "Class", "Parent Name", "Phone", "Month", "Amount", "Paid", "Date"])
+        for i, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if i % CSV_EXPORT_BATCH_SIZE == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        yield output.getvalue()
+
+    return Response(stream_with_context(generate()), mimetype="text/csv",
+                    headers={"Content-Disposition": "attachment;filename=fee_data.csv"})
+
+# Serve uploaded receipts (legacy filename URLs, admin only)
+@bp.route("/uploads/<path:filename>")
+def uploaded_file(filename):
+    if not admin_logged_in():
+        abort(403)
+    return send_from_directory(current_app.config['UPLOAD_FOLDER'], filename)
+
+
+def admin_password_ok(password):
+    """Check the admin password against ADMIN_PASSWORD_HASH, or ADMIN_PASSWORD when no hash is set."""
+    stored = current_app.config['ADMIN_PASSWORD_HASH']
+    if stored:
+        return passwords.hasher().verify(stored, password)[0]
+    return hmac.compare_digest(password.encode(), current_app.config['ADMIN_PASSWORD'].encode())
+
+def teacher_password_ok(teacher, password):
+    """Verify a teacher's password, storing a fresh hash when the row is plaintext or outdated."""
+    ok, replacement = passwords.hasher().verify(teacher.password, password)
+    if replacement:
+        teacher.password = replacement
+        db.session.commit()
+    return ok
+
+def login_identifier(form):
+    """The account an admin-page sign-in is for: the admin username or the teacher ID."""
+    if form.get("login_type", "admin") == "admin":
+        return form.get("username", "")
+    return form.get("teacher_id", "")
+
+@bp.route("/admin/login", methods=["GET", "POST"])
+@throttled_login("admin", login_identifier, "admin_login.html")
+def admin_login():
+    if request.method == "POST":
+        login_type = request.form.get("login_type", "admin")
+        
+        try:
+            if login_type == "admin":
+                u = request.form.get("username", "")
+                p = request.form.get("password", "")
+                # Check the password whatever the username, so timing does not reveal a right username
+                password_ok = admin_password_ok(p)
+                if hmac.compare_digest(u.encode(), current_app.config['ADMIN_USERNAME'].encode()) and password_ok:
+                    login_succeeded()
+                    session["admin_logged_in"] = True
+                    flash("Logged in as admin.", "success")
+                    return redirect(url_for("admin.admin_dashboard"))
+                else:
+                    flash("Invalid credentials.", "danger")
+                    return redirect(url_for("admin.admin_login"))
+            else:  # teacher login
+                teacher_id = request.form.get("teacher_id", "")
+                password = request.form.get("password", "")
+                teacher = Teacher.query.filter_by(teacher_id=teacher_id).first()
+                if teacher is None:
+                    passwords.hasher().burn(password)
+                if teacher and teacher_password_ok(teacher, password):
+                    login_succeeded()
+                    session["teacher_logged_in"] = True
+                    session["teacher_id"] = teacher_id
+                    session["teacher_name"] = teacher.name
+                    flash(f"Welcome, {teacher.name}!", "success")
+                    return redirect(url_for("teacher.teacher_dashboard"))
+                else:
+                    flash("Invalid teacher ID or password.", "danger")
+                    return redirect(url_for("admin.admin_login"))
+        except passwords.HasherBusy:
+            login_succeeded()  # not a wrong password, so it does not count against the limit
+            flash("Too many people are signing in right now. Please try again in a moment.", "info")
+            return render_template("admin_login.html"), 503, {"Retry-After": "5"}
+    return render_template("admin_login.html")
+
+@bp.route("/admin/logout")
+def admin_logout():
+    session.pop("admin_logged_in", None)
+    flash("Logged out.", "info")
+    return redirect(url_for("public.index"))
+
+@bp.route("/admin/dashboard")
+def admin_dashboard():
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    # Get query parameters
+    query = request.args.get('query', '').strip()
+    filter_class = request.args.get('filter_class', '').strip()
+    filter_status = request.args.get('filter_status', '').strip()
+    
+    per_page = request.args.get('per_page', DEFAULT_PAGE_SIZE, type=int)
+    if per_page not in DASHBOARD_PAGE_SIZES:
+        per_page = DEFAULT_PAGE_SIZE
+    after = decode_cursor(request.args.get('after', ''))
+    before = None if after else decode_cursor(request.args.get('before', ''))
+    
+    payments_query = filter_payments(FeePayment.query, query, filter_class, filter_status)
+    
+    # Summary cards come from one aggregate query, the table from one keyset page
+    totals = payment_totals(payments_query)
+    payments, next_cursor, prev_cursor = paginate_payments(payments_query, per_page, after, before)
+    
+    # Get unique classes for filter dropdown
+    all_classes = db.session.query(FeePayment.student_class).distinct().all()
+    classes = [c[0] for c in all_classes if c[0]]
+    
+    # Filters carried over into the pagination and export links
+    filter_args = {k: v for k, v in (('query', query), ('filter_class', filter_class),
+                                     ('filter_status', filter_status)) if v}
+    page_args = dict(filter_args, per_page=per_page)
+    
+    return render_template("admin_dashboard.html",
+                         payments=payments,
+                         thumbnails=ready_thumbnails(p.receipt_sha256 for p in payments),
+                         queued=queued_submissions('fee_payment'),
+                         classes=classes,
+                         totals=totals,
+                         per_page=per_page,
+                         page_sizes=DASHBOARD_PAGE_SIZES,
+                         filter_args=filter_args,
+                         page_args=page_args,
+                         next_cursor=next_cursor,
+                         prev_cursor=prev_cursor)
+
+@bp.route("/admin/bulk_mark_paid", methods=["POST"])
+def admin_bulk_mark_paid():
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    payment_ids = parse_ids(request.form.getlist('payment_ids'))
+    if not payment_ids:
+        flash("No payments selected.", "danger")
+        return redirect(url_for("admin.admin_dashboard"))
+    
+    # One UPDATE per chunk; rows already paid are left alone and not counted
+    updated_count = 0
+    for chunk in chunked(payment_ids, BULK_CHUNK_SIZE):
+        updated_count += FeePayment.query.filter(
+            FeePayment.id.in_(chunk),
+            FeePayment.paid.isnot(True)
+        ).update({FeePayment.paid: True}, synchronize_session=False)
+    db.session.commit()
+    
+    skipped = len(payment_ids) - updated_count
+    message = f"{updated_count} payment(s) marked as PAID."
+    if skipped:
+        message += f" {skipped} already paid or not found."
+    flash(message, "success")
+    return redirect(url_for("admin.admin_dashboard"))
+
+@bp.route("/admin/bulk_delete", methods=["POST"])
+def admin_bulk_delete():
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    payment_ids = parse_ids(request.form.getlist('payment_ids'))
+    if not payment_ids:
+        flash("No payments selected.", "danger")
+        return redirect(url_for("admin.admin_dashboard"))
+    
+    deleted_count = 0
+    receipts = []
+    for chunk in chunked(payment_ids, BULK_CHUNK_SIZE):
+        stmt = db.delete(FeePayment).where(FeePayment.id.in_(chunk)).execution_options(synchronize_session=False)
+        if db.engine.dialect.delete_returning:
+            rows = db.session.execute(stmt.returning(FeePayment.receipt_filename)).all()
+            deleted_count += len(rows)
+            receipts.extend(r.receipt_filename for r in rows if r.receipt_filename)
+        else:
+            # Older SQLite without RETURNING: read the filenames first
+            receipts.extend(
+                name for (name,) in db.session.query(FeePayment.receipt_filename)
+                .filter(FeePayment.id.in_(chunk), FeePayment.receipt_filename.isnot(None))
+            )
+            deleted_count += db.session.execute(stmt).rowcount
+    db.session.commit()
+    
+    # Files go only once the rows are gone for good
+    remove_receipts(receipts)
+    flash(f"{deleted_count} payment(s) deleted.", "info")
+    return redirect(url_for("admin.admin_dashboard"))
+
+@bp.route("/admin/mark_paid/<int:payment_id>", methods=["POST"])
+def admin_mark_paid(payment_id):
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    payment = FeePayment.query.get_or_404(payment_id)
+    payment.paid = True
+    db.session.commit()
+    flash(f"Payment {payment_id} marked as PAID.", "success")
+    return redirect(url_for("admin.admin_dashboard"))
+
+@bp.route("/admin/delete/<int:payment_id>", methods=["POST"])
+def admin_delete(payment_id):
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    payment = FeePayment.query.get_or_404(payment_id)
+    receipt_filename = payment.receipt_filename
+    db.session.delete(payment)
+    db.session.commit()
+    # delete receipt file if exists
+    if receipt_filename:
+        remove_receipts([receipt_filename])
+    flash(f"Payment {payment_id} deleted.", "info")
+    return redirect(url_for("admin.admin_dashboard"))
+@bp.route("/admin/students")
+def admin_students():
+    """The roster shell: the class/section tree only; sections load their students on demand."""
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    filter_class = request.args.get('filter_class', '').strip()
+    tree = roster_tree()
+    shown = [node for node in tree if node['student_class'] == filter_class] if filter_class else tree
+    
+    return render_template("admin_students.html", 
+                         tree=shown, 
+                         classes=[node['student_class'] for node in tree], 
+                         selected_class=filter_class,
+                         total_students=sum(node['students'] for node in shown),
+                         page_size=ROSTER_PAGE_SIZE)
+
+@bp.route("/admin/api/roster")
+def admin_roster_api():
+    """Class/section tree with student counts as JSON."""
+    if not admin_logged_in():
+        return jsonify({'error': 'unauthorized'}), 401
+    tree = roster_tree()
+    return jsonify({'total': sum(node['students'] for node in tree), 'classes': tree})
+
+@bp.route("/admin/api/roster/students")
+def admin_roster_students_api():
+    """One page of a section's students with their fee summaries.
+
+    ?student_class=&section= pick the section, ?after= is the `next` cursor of
+    the previous page and ?limit= the page size (at most ROSTER_MAX_PAGE_SIZE).
+    """
+    if not admin_logged_in():
+        return jsonify({'error': 'unauthorized'}), 401
+    student_class = request.args.get('student_class', '').strip()
+    section = request.args.get('section', '').strip()
+    if not (student_class and section):
+        return jsonify({'error': 'student_class and section are required'}), 400
+    limit = min(max(request.args.get('limit', ROSTER_PAGE_SIZE, type=int), 1), ROSTER_MAX_PAGE_SIZE)
+    
+    students, next_cursor = roster_page(student_class, section, decode_student_cursor(request.args.get('after', '')), limit)
+    fees = fee_summaries(students)
+    return jsonify({
+        'students': [{
+            'id': student.id,
+            'roll_no': student.roll_no,
+            'admission_number': student.admission_number,
+            'name': student.name,
+            'student_class': student.student_class,
+            'section': student.section,
+            'parent_name': student.parent_name,
+            'parent_phone': student.parent_phone,
+            'admission_date': student.admission_date.strftime('%d-%m-%Y') if student.admission_date else 'N/A',
+            'fees': fees.get((student.roll_no, student.student_class), dict(EMPTY_FEE_SUMMARY)),
+            'details_url': url_for('admin.admin_student_details', student_id=student.id),
+            'delete_url': url_for('admin.admin_delete_student', student_id=student.id),
+        } for student in students],
+        'next': next_cursor,
+    })
+
+@bp.route("/admin/add_student", methods=["POST"])
+def admin_add_student():
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+
+    name = request.form.get("name")
+    roll_no = request.form.get("roll_no")
+    admission_number = request.form.get("admission_number")
+    student_class = request.form.get("student_class")
+    section = request.form.get("section")
+    parent_name = request.form.get("parent_name")
+    parent_phone = request.form.get("parent_phone")
+    admission_date_str = request.form.get("admission_date")
+
+    if not (name and roll_no and admission_number and student_class and section and parent_name and parent_phone and admission_date_str):
+        flash("Please fill all fields.", "danger")
+        return redirect(url_for("admin.admin_students"))
+
+    # Check if roll number already exists
+    if Student.query.filter_by(roll_no=roll_no).first():
+        flash("Roll number already exists!", "danger")
+        return redirect(url_for("admin.admin_students"))
+    
+    # Check if admission number already exists
+    if Student.query.filter_by(admission_number=admission_number).first():
+        flash("Admission number already exists!", "danger")
+        return redirect(url_for("admin.admin_students"))
+
+    try:
+        admission_date = datetime.strptime(admission_date_str, '%Y-%m-%d').date()
+    except ValueError:
+        flash("Invalid admission date format.", "danger")
+        return redirect(url_for("admin.admin_students"))
+
+    student = Student(
+        name=name,
+        roll_no=roll_no,
+        admission_number=admission_number,
+        student_class=student_class,
+        section=section,
+        parent_name=parent_name,
+        parent_phone=parent_phone,
+        admission_date=admission_date
+    )
+    db.session.add(student)
+    db.session.commit()
+    flash("Student added successfully.", "success")
+    return redirect(url_for("admin.admin_students"))
+
+@bp.route("/admin/delete_student/<int:student_id>", methods=["POST"])
+def admin_delete_student(student_id):
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    student = Student.query.get_or_404(student_id)
+    db.session.delete(student)
+    db.session.commit()
+    flash(f"Deleted student {student.name}.", "info")
+    return redirect(url_for("admin.admin_students"))
+
+@bp.route("/admin/student_details/<int:student_id>")
+def admin_student_details(student_id):
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    student = Student.query.get_or_404(student_id)
+    
+    # Get fee payment history for this student
+    fee_payments = FeePayment.query.filter_by(
+        roll_no=student.roll_no,
+        student_class=student.student_class
+    ).order_by(FeePayment.submitted_at.desc()).all()
+    thumbnails = ready_thumbnails(payment.receipt_sha256 for payment in fee_payments)
+    
+    student_data = {
+        'id': student.id,
+        'admission_number': student.admission_number,
+        'roll_no': student.roll_no,
+        'name': student.name,
+        'student_class': student.student_class,
+        'section': student.section,
+        'parent_name': student.parent_name,
+        'parent_phone': student.parent_phone,
+        'admission_date': student.admission_date.strftime('%d-%m-%Y') if student.admission_date else 'N/A',
+        'fee_payments': [
+            {
+                'payment_month': payment.payment_month,
+                'amount': payment.amount,
+                'paid': payment.paid,
+                'submitted_at': payment.submitted_at.strftime('%d-%m-%Y %H:%M') if payment.submitted_at else 'N/A',
+                'receipt_filename': payment.receipt_filename,
+                'receipt_url': url_for('public.receipt_file', payment_id=payment.id) if payment.receipt_filename else None,
+                'thumbnail_url': url_for('public.receipt_thumbnail', payment_id=payment.id, variant='thumb') if payment.receipt_sha256 in thumbnails else None,
+                'preview_url': url_for('public.receipt_thumbnail', payment_id=payment.id, variant='preview') if payment.receipt_sha256 in thumbnails else None
+            } for payment in fee_payments
+        ]
+    }
+    
+    return jsonify(student_data)
+
+@bp.route("/admin/visits")
+def admin_visits():
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    # Get filter parameters
+    filter_status = request.args.get('filter_status', '').strip()
+    filter_date = request.args.get('filter_date', '').strip()
+    
+    # Start with base query
+    visits_query = Visit.query
+    
+    # Apply filters
+    if filter_status:
+        visits_query = visits_query.filter_by(status=filter_status)
+    
+    if filter_date:
+        try:
+            filter_date_obj = datetime.strptime(filter_date, '%Y-%m-%d').date()
+            visits_query = visits_query.filter(Visit.visit_date == filter_date_obj)
+        except ValueError:
+            pass  # Invalid date format, ignore filter
+    
+    # Order by visit date and time
+    visits = visits_query.order_by(Visit.visit_date.asc(), Visit.visit_time.asc()).all()
+    
+    today = date.today()
+    return render_template("admin_visits.html", 
+                         visits=visits, 
+                         stats=visit_stats(visits_query),
+                         queued=queued_submissions('visit'),
+                         calendar=visit_slots.calendar(today, today + timedelta(days=SLOT_CALENDAR_DAYS - 1)),
+                         today=today,
+                         statuses=VISIT_STATUSES, 
+                         selected_status=filter_status,
+                         selected_date=filter_date)
+
+@bp.route("/admin/visit_slots", methods=["POST"])
+def admin_open_visit_slots():
+    """Open the default visit times, with the given capacity, over a range of days."""
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    try:
+        start = datetime.strptime(request.form.get("start_date", ""), '%Y-%m-%d').date()
+        days = int(request.form.get("days", ""))
+        capacity = int(request.form.get("capacity", ""))
+    except ValueError:
+        flash("Please give a start date, a number of days and a capacity.", "danger")
+        return redirect(url_for("admin.admin_visits"))
+    if not (1 <= days <= visit_slots.MAX_AVAILABILITY_DAYS and capacity >= 1):
+        flash(f"Open between 1 and {visit_slots.MAX_AVAILABILITY_DAYS} days, with at least one seat per slot.", "danger")
+        return redirect(url_for("admin.admin_visits"))
+    
+    weekdays = range(6) if request.form.get("saturdays") else range(5)
+    created = visit_slots.open_slots(start, days, capacity, weekdays=weekdays)
+    db.session.commit()
+    flash(f"Opened {created} visit slot(s)." if created else "Those visit slots are already open.", "success")
+    return redirect(url_for("admin.admin_visits"))
+
+@bp.route("/admin/update_visit_status/<int:visit_id>", methods=["POST"])
+def admin_update_visit_status(visit_id):
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    visit = Visit.query.get_or_404(visit_id)
+    new_status = request.form.get("status")
+    
+    if new_status in VISIT_STATUSES:
+        # A cancelled visit does not hold a seat; reinstating one needs a free seat again
+        was_cancelled, cancelled = visit.status == 'cancelled', new_status == 'cancelled'
+        if visit.slot_id and cancelled and not was_cancelled:
+            visit_slots.release_seat(visit.slot_id)
+        elif visit.slot_id and was_cancelled and not cancelled and not visit_slots.book_seat(visit.slot_id):
+            db.session.rollback()
+            flash("That visit slot is now full, so the visit stays cancelled.", "danger")
+            return redirect(url_for("admin.admin_visits"))
+        visit.status = new_status
+        db.session.commit()
+        flash(f"Visit status updated to {new_status}.", "success")
+    else:
+        flash("Invalid status.", "danger")
+    
+    return redirect(url_for("admin.admin_visits"))
+
+@bp.route("/admin/delete_visit/<int:visit_id>", methods=["POST"])
+def admin_delete_visit(visit_id):
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    visit = Visit.query.get_or_404(visit_id)
+    if visit.slot_id and visit.status != 'cancelled':
+        visit_slots.release_seat(visit.slot_id)
+    db.session.delete(visit)
+    db.session.commit()
+    flash(f"Deleted visit for {visit.student_name}.", "info")
+    
+    return redirect(url_for("admin.admin_visits"))
+
+@bp.route("/admin/teachers")
+def admin_teachers():
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    teachers = Teacher.query.order_by(Teacher.assigned_class, Teacher.assigned_section, Teacher.name).all()
+    
+    return render_template("admin_teachers.html", teachers=teachers)
+
+@bp.route("/admin/contacts")
+def admin_contacts():
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    # Get query parameters
+    query = request.args.get('query', '').strip()
+    filter_subject = request.args.get('filter_subject', '').strip()
+    
+    # Start with base query
+    contacts_query = ContactMessage.query
+    
+    # Apply search filters (best matches first, then newest)
+    if query:
+        contacts_query = rank_by_search(
+            contacts_query, ContactMessage, query,
+            [ContactMessage.name, ContactMessage.email, ContactMessage.subject, ContactMessage.message]
+        )
+    
+    if filter_subject:
+        contacts_query = contacts_query.filter(ContactMessage.subject == filter_subject)
+    
+    # Order and execute
+    contacts = contacts_query.order_by(ContactMessage.submitted_at.desc()).all()
+    
+    return render_template("admin_contacts.html", contacts=contacts, stats=contact_stats(contacts_query),
+                           queued=queued_submissions('contact_message'))
+
+@bp.route("/admin/stats")
+def admin_stats():
+    """Dashboard summary numbers as JSON, for widgets that poll without a page load."""
+    if not admin_logged_in():
+        return jsonify({'error': 'unauthorized'}), 401
+    return jsonify({
+        'payments': payment_totals(FeePayment.query),
+        'contacts': contact_stats(ContactMessage.query),
+        'visits': visit_stats(Visit.query)
+    })
+
+@bp.route("/admin/perf")
+def admin_perf():
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    return render_template("admin_perf.html",
+                         endpoints=perf.endpoint_summary(),
+                         threshold=current_app.config['SLOW_QUERY_THRESHOLD_MS'],
+                         window=current_app.config['PERF_SAMPLE_SIZE'])
+
+@bp.route("/admin/delete_contact/<int:contact_id>", methods=["POST"])
+def admin_delete_contact(contact_id):
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    contact = ContactMessage.query.get_or_404(contact_id)
+    db.session.delete(contact)
+    db.session.commit()
+    flash(f"Contact from {contact.name} deleted.", "info")
+    return redirect(url_for("admin.admin_contacts"))
+
+@bp.route("/admin/add_teacher", methods=["POST"])
+def admin_add_teacher():
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    teacher_id = request.form.get("teacher_id", "").strip()
+    name = request.form.get("name", "").strip()
+    password = request.form.get("password", "").strip()
+    assigned_class = request.form.get("assigned_class", "").strip()
+    assigned_section = request.form.get("assigned_section", "").strip()
+    email = request.form.get("email", "").strip()
+    phone = request.form.get("phone", "").strip()
+    
+    if not (teacher_id and name and password and assigned_class and assigned_section):
+        flash("Please fill all required fields.", "danger")
+        return redirect(url_for("admin.admin_teachers"))
+    
+    # Check if teacher ID already exists
+    if Teacher.query.filter_by(teacher_id=teacher_id).first():
+        flash("Teacher ID already exists!", "danger")
+        return redirect(url_for("admin.admin_teachers"))
+    
+    teacher = Teacher(
+        teacher_id=teacher_id,
+        name=name,
+        password=passwords.hash_password(password),
+        assigned_class=assigned_class,
+        assigned_section=assigned_section,
+        email=email if email else None,
+        phone=phone if phone else None
+    )
+    db.session.add(teacher)
+    db.session.commit()
+    flash(f"Teacher {name} added successfully.", "success")
+    return redirect(url_for("admin.admin_teachers"))
+
+@bp.route("/admin/delete_teacher/<int:teacher_id>", methods=["POST"])
+def admin_delete_teacher(teacher_id):
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    teacher = Teacher.query.get_or_404(teacher_id)
+    teacher_name = teacher.name
+    db.session.delete(teacher)
+    db.session.commit()
+    flash(f"Teacher {teacher_name} deleted.", "info")
+    return redirect(url_for("admin.admin_teachers"))
+
+@bp.route("/admin/import/<kind>", methods=["POST"])
+def admin_import(kind):
+    if not admin_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    if kind not in IMPORT_KINDS:
+        abort(404)
+
+    back = url_for("admin.admin_teachers") if kind == 'teachers' else url_for("admin.admin_students")
+    upload = request.files.get("file")
+    if not upload or upload.filename == "":
+        flash("Please choose a CSV file to import.", "danger")
+        return redirect(back)
+
+    report = import_csv(kind, io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline=''))
+    if request.args.get('format') == 'json':
+        return jsonify(report)
+
+    flash(f"Imported {report['inserted']} {kind}.", "success" if report['inserted'] else "info")
+    for error in report['errors'][:10]:
+        flash(f"Row {error['row']}: {error['error']}", "danger")
+    if len(report['errors']) > 10:
+        flash(f"...and {len(report['errors']) - 10} more rows with errors.", "danger")
+    return redirect(back)
@@ -0,0 +1,73 @@
+"""
+Parent sign-in and dashboard, keyed on the child's admission and roll numbers.
+"""
+
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+
+from helpers import get_current_student, parent_logged_in
+from models import FeePayment, Marks, Student
+from ratelimit import login_succeeded, throttled_login
+from report_cards import student_report
+
+bp = Blueprint("parent", __name__)
+
+@bp.route("/parent/login", methods=["GET", "POST"])
+@throttled_login("parent", lambda form: form.get("admission_number", ""), "parent_login.html")
+def parent_login():
+    if request.method == "POST":
+        admission_number = request.form.get("admission_number", "").strip()
+        roll_number = request.form.get("roll_number", "").strip()
+        
+        if not (admission_number and roll_number):
+            flash("Please fill all fields.", "danger")
+            return redirect(url_for("parent.parent_login"))
+        
+        # Find student by admission number and roll number
+        student = Student.query.filter_by(
+            admission_number=admission_number,
+            roll_no=roll_number
+        ).first()
+        
+        if student:
+            login_succeeded()
+            session["parent_logged_in"] = True
+            session["student_id"] = student.id
+            flash(f"Welcome! You are now logged in for {student.name}.", "success")
+            return redirect(url_for("parent.parent_dashboard"))
+        else:
+            flash("Invalid admission number or roll number.", "danger")
+            return redirect(url_for("parent.parent_login"))
+    
+    return render_template("parent_login.html")
+
+@bp.route("/parent/logout")
+def parent_logout():
+    session.pop("parent_logged_in", None)
+    session.pop("student_id", None)
+    flash("Logged out.", "info")
+    return redirect(url_for("public.index"))
+
+@bp.route("/parent/dashboard")
+def parent_dashboard():
+    if not parent_logged_in():
+        return redirect(url_for("parent.parent_login"))
+    
+    student = get_current_student()
+    if not student:
+        flash("Student not found.", "danger")
+        return redirect(url_for("parent.parent_logout"))
+    
+    # Get student's fee payments
+    fee_payments = FeePayment.query.filter_by(roll_no=student.roll_no).order_by(FeePayment.submitted_at.desc()).all()
+    
+    # Get student's marks
+    marks = Marks.query.filter_by(student_id=student.id).order_by(Marks.exam_date.desc()).limit(10).all()
+    
+    # Totals, rank and percentile come precomputed from mark_summary
+    report = student_report(student.id)
+    
+    return render_template("parent_dashboard.html", 
+                         student=student, 
+                         fee_payments=fee_payments,
+                         marks=marks,
+                         report=report)
@@ -0,0 +1,282 @@
+"""
+Public pages and forms, and the receipt files shown to admins and parents.
+"""
+
+import mimetypes
+import os
+from datetime import date, datetime, timedelta
+
+from flask import (Blueprint, Response, abort, current_app, flash, jsonify, redirect, render_template, request,
+                   send_file, url_for)
+from werkzeug.utils import safe_join
+
+from helpers import (admin_logged_in, cached_page, enqueue_thumbnail, get_current_student, parent_logged_in,
+                     save_submission)
+from models import db, ContactMessage, FeePayment, Visit
+from receipts import ReceiptTooLarge, store_receipt
+from thumbnails import thumbnail_path
+import visit_slots
+
+bp = Blueprint("public", __name__)
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+
+# Room for the text fields of the fee form on top of the receipt itself
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+def receipt_too_large_message():
+    limit = current_app.config['MAX_RECEIPT_BYTES']
+    if limit >= 1024 * 1024:
+        return f"Receipt must be smaller than {limit // (1024 * 1024)} MB."
+    return f"Receipt must be smaller than {limit // 1024} KB."
+
+@bp.route("/")
+@cached_page
+def index():
+    return render_template("index.html", school_name="Nav Yug Higher Secondary School")
+
+@bp.route("/about")
+@cached_page
+def about():
+    return render_template("about.html")
+
+@bp.route("/contact", methods=["GET", "POST"])
+@cached_page
+def contact():
+    if request.method == "POST":
+        name = request.form.get("name")
+        email = request.form.get("email")
+        phone = request.form.get("phone")
+        subject = request.form.get("subject")
+        message = request.form.get("message")
+
+        if not (name and email and message):
+            flash("Please fill all required fields.", "danger")
+            return redirect(url_for("public.contact"))
+
+        msg = ContactMessage(name=name, email=email, phone=phone, subject=subject, message=message)
+        save_submission(msg)
+        flash("Your message has been sent successfully!", "success")
+        return redirect(url_for("public.contact"))
+    return render_template("contact.html")
+
+@bp.route("/schedule_visit", methods=["GET", "POST"])
+@cached_page
+def schedule_visit():
+    if request.method == "POST":
+        student_name = request.form.get("student_name", "").strip()
+        parent_name = request.form.get("parent_name", "").strip()
+        parent_phone = request.form.get("parent_phone", "").strip()
+        student_class = request.form.get("student_class", "").strip()
+        section = request.form.get("section", "").strip()
+        visit_date_str = request.form.get("visit_date", "").strip()
+        visit_time = request.form.get("visit_time", "").strip()
+        purpose = request.form.get("purpose", "").strip()
+
+        if not (student_name and parent_name and parent_phone and student_class and section and visit_date_str and visit_time and purpose):
+            flash("Please fill all fields.", "danger")
+            return redirect(url_for("public.schedule_visit"))
+
+        try:
+            visit_date = datetime.strptime(visit_date_str, '%Y-%m-%d').date()
+        except ValueError:
+            flash("Invalid date format.", "danger")
+            return redirect(url_for("public.schedule_visit"))
+
+        visit = Visit(
+            student_name=student_name,
+            parent_name=parent_name,
+            parent_phone=parent_phone,
+            student_class=f"{student_class} - Section {section}",
+            visit_date=visit_date,
+            visit_time=visit_time,
+            purpose=purpose
+        )
+        if visit_slots.slots_enabled():
+            slot = visit_slots.find_slot(visit_date, visit_time)
+            if slot is None or visit_date < date.today():
+                flash("Visits are not offered at that time. Please pick one of the open times.", "danger")
+                return redirect(url_for("public.schedule_visit"))
+            # Seat and visit commit together; a full slot matches no row
+            if not visit_slots.book_seat(slot.id):
+                db.session.rollback()
+                flash("Sorry, that time has just been fully booked. Please pick another.", "danger")
+                return redirect(url_for("public.schedule_visit"))
+            visit.slot_id = slot.id
+            db.session.add(visit)
+            db.session.commit()
+        else:
+            save_submission(visit)
+        flash("Your visit has been scheduled successfully! We will contact you to confirm.", "success")
+        return redirect(url_for("public.schedule_visit"))
+    
+    return render_template("schedule_visit.html")
+
+@bp.route("/schedule_visit/availability")
+def visit_availability():
+    """Open visit slots per day as JSON, for the live times on the visit form.
+
+    ?start=YYYY-MM-DD (default today, never earlier) and ?days=N (default 14).
+    """
+    today = date.today()
+    try:
+        start = max(datetime.strptime(request.args['start'], '%Y-%m-%d').date(), today) \
+            if request.args.get('start') else today
+    except ValueError:
+        return jsonify({'error': 'start must be YYYY-MM-DD'}), 400
+    days = min(max(request.args.get('days', 14, type=int), 1), visit_slots.MAX_AVAILABILITY_DAYS)
+    end = start + timedelta(days=days - 1)
+    response = jsonify({
+        'enabled': visit_slots.slots_enabled(),
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'days': [dict(day, date=day['date'].isoformat()) for day in visit_slots.availability(start, end)],
+    })
+    response.cache_control.no_cache = True  # seats change with every booking
+    return response
+
+@bp.route("/payment_history", methods=["GET", "POST"])
+def payment_history():
+    payments = None
+    if request.method == "POST":
+        roll_no = request.form.get("roll_no")
+        if roll_no:
+            payments = FeePayment.query.filter_by(roll_no=roll_no).all()
+    return render_template("payment_history.html", payments=payments)
+
+@bp.route("/fee", methods=["GET", "POST"])
+def fee_form():
+    if request.method == "POST":
+        # Refuse oversized bodies before the multipart form is parsed
+        if request.content_length and request.content_length > current_app.config['MAX_RECEIPT_BYTES'] + FORM_OVERHEAD_BYTES:
+            flash(receipt_too_large_message(), "danger")
+            return redirect(url_for("public.fee_form"))
+        
+        # Collect form data
+        student_name = request.form.get("student_name", "").strip()
+        roll_no = request.form.get("roll_no", "").strip()
+        student_class = request.form.get("student_class", "").strip()
+        parent_name = request.form.get("parent_name", "").strip()
+        parent_phone = request.form.get("parent_phone", "").strip()
+        payment_month = request.form.get("payment_month", "").strip()
+        amount = request.form.get("amount", "").strip()
+
+        # Basic validation
+        if not (student_name and roll_no and student_class and parent_name and parent_phone and payment_month and amount):
+            flash("Please fill all required fields.", "danger")
+            return redirect(url_for("public.fee_form"))
+
+        try:
+            amount_val = float(amount)
+        except ValueError:
+            flash("Amount must be a number.", "danger")
+            return redirect(url_for("public.fee_form"))
+
+        # Handle file upload (optional)
+        receipt_file = request.files.get("receipt")
+        filename_on_disk = None
+        receipt_sha256 = None
+        if receipt_file and receipt_file.filename != "":
+            if allowed_file(receipt_file.filename):
+                ext = receipt_file.filename.rsplit('.', 1)[1].lower()
+                # stored once per content hash; re-submitting the same file reuses it
+                try:
+                    filename_on_disk, receipt_sha256 = store_receipt(
+                        receipt_file.stream, current_app.config['UPLOAD_FOLDER'], ext, current_app.config['MAX_RECEIPT_BYTES'])
+                except ReceiptTooLarge:
+                    flash(receipt_too_large_message(), "danger")
+                    return redirect(url_for("public.fee_form"))
+            else:
+                flash("Receipt must be png/jpg/pdf.", "danger")
+                return redirect(url_for("public.fee_form"))
+
+        payment = FeePayment(
+            student_name=student_name,
+            roll_no=roll_no,
+            student_class=student_class,
+            parent_name=parent_name,
+            parent_phone=parent_phone,
+            payment_month=payment_month,
+            amount=amount_val,
+            receipt_filename=filename_on_disk,
+            receipt_sha256=receipt_sha256,
+            paid=False  # default false — admin will verify or you can implement auto verify
+        )
+        if save_submission(payment):
+            enqueue_thumbnail(receipt_sha256, filename_on_disk)
+        flash("Fee submission saved. Admin will verify and update status.", "success")
+        return redirect(url_for("public.index"))
+
+    return render_template("fee_form.html")
+
+# ---- Receipts ----
+# Receipts are content-addressed, so a URL's bytes never change
+RECEIPT_MAX_AGE = 365 * 24 * 60 * 60
+
+def can_view_receipt(payment):
+    if admin_logged_in():
+        return True
+    student = get_current_student()
+    return student is not None and student.roll_no == payment.roll_no
+
+def viewable_payment(payment_id):
+    """The payment whose receipt the current admin/parent may see, else abort."""
+    if not (admin_logged_in() or parent_logged_in()):
+        abort(403)
+    payment = db.session.get(FeePayment, payment_id)
+    if not payment or not payment.receipt_filename:
+        abort(404)
+    if not can_view_receipt(payment):
+        abort(403)
+    return payment
+
+def send_stored_file(relative, etag):
+    """Send a file from UPLOAD_FOLDER with private, long-lived caching.
+
+    Strong ETag (when given), If-None-Match/304 and Range requests. With
+    RECEIPT_ACCEL_REDIRECT set the bytes are handed to the front proxy via
+    X-Accel-Redirect; with USE_X_SENDFILE Flask emits X-Sendfile instead.
+    """
+    accel_prefix = current_app.config.get('RECEIPT_ACCEL_REDIRECT')
+    if accel_prefix and etag:
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(mimetype=mimetypes.guess_type(relative)[0] or 'application/octet-stream')
+            response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{relative}"
+        response.set_etag(etag)
+    else:
+        path = safe_join(current_app.config['UPLOAD_FOLDER'], relative)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        # Legacy rows without a hash fall back to Werkzeug's mtime/size ETag
+        response = send_file(path, etag=etag or True, conditional=True, max_age=RECEIPT_MAX_AGE)
+
+    # Private: the bytes sit behind a login, so shared proxies must not keep them
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.max_age = RECEIPT_MAX_AGE
+    if etag:
+        response.cache_control.immutable = True
+    return response
+
+@bp.route("/receipts/<int:payment_id>")
+def receipt_file(payment_id):
+    """Serve a payment's receipt to an admin or the owning parent."""
+    payment = viewable_payment(payment_id)
+    return send_stored_file(payment.receipt_filename, payment.receipt_sha256)
+
+@bp.route("/receipts/<int:payment_id>/<any(thumb, preview):variant>")
+def receipt_thumbnail(payment_id, variant):
+    """Serve a rendered thumbnail or first-page preview; 404 until the job is done."""
+    payment = viewable_payment(payment_id)
+    if not payment.receipt_sha256:
+        abort(404)
+    return send_stored_file(thumbnail_path(payment.receipt_sha256, variant),
+                            f"{payment.receipt_sha256}-{variant}")
+
+# ---- Error handlers ----
+@bp.app_errorhandler(404)
+def page_not_found(e):
+    return render_template("404.html"), 404
@@ -0,0 +1,351 @@
+"""
+Teacher pages: class roster and marks entry. Teachers sign in through
+admin.admin_login().
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+
+from helpers import get_current_teacher, teacher_logged_in
+from models import db, Marks, Student
+from report_cards import refresh_section, section_ranking, section_subjects
+
+bp = Blueprint("teacher", __name__)
+
+@bp.route("/teacher/logout")
+def teacher_logout():
+    session.pop("teacher_logged_in", None)
+    session.pop("teacher_id", None)
+    session.pop("teacher_name", None)
+    flash("Logged out.", "info")
+    return redirect(url_for("public.index"))
+
+@bp.route("/teacher/dashboard")
+def teacher_dashboard():
+    if not teacher_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    teacher = get_current_teacher()
+    if not teacher:
+        flash("Teacher not found.", "danger")
+        return redirect(url_for("teacher.teacher_logout"))
+    
+    # Get students in teacher's class
+    students = Student.query.filter_by(
+        student_class=teacher.assigned_class,
+        section=teacher.assigned_section
+    ).order_by(Student.roll_no).all()
+    
+    # Get recent marks uploaded by this teacher
+    recent_marks = Marks.query.filter_by(teacher_id=teacher.id).options(
+        db.joinedload(Marks.student)
+    ).order_by(Marks.uploaded_at.desc()).limit(10).all()
+    
+    # Get statistics
+    total_students = len(students)
+    total_marks_uploaded = Marks.query.filter_by(teacher_id=teacher.id).count()
+    
+    # Class performance comes precomputed from mark_summary
+    ranking = section_ranking(teacher.assigned_class, teacher.assigned_section)
+    subject_stats = section_subjects(teacher.assigned_class, teacher.assigned_section)
+    
+    return render_template("teacher_dashboard.html", 
+                         teacher=teacher, 
+                         students=students,
+                         recent_marks=recent_marks,
+                         total_students=total_students,
+                         total_marks_uploaded=total_marks_uploaded,
+                         ranking=ranking,
+                         subject_stats=subject_stats)
+
+@bp.route("/teacher/students")
+def teacher_students():
+    if not teacher_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    teacher = get_current_teacher()
+    if not teacher:
+        flash("Teacher not found.", "danger")
+        return redirect(url_for("teacher.teacher_logout"))
+    
+    # Get students in teacher's class
+    students = Student.query.filter_by(
+        student_class=teacher.assigned_class,
+        section=teacher.assigned_section
+    ).order_by(Student.roll_no).all()
+    
+    return render_template("teacher_students.html", 
+                         teacher=teacher, 
+                         students=students)
+
+@bp.route("/teacher/marks", methods=["GET", "POST"])
+def teacher_marks():
+    if not teacher_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    teacher = get_current_teacher()
+    if not teacher:
+        flash("Teacher not found.", "danger")
+        return redirect(url_for("teacher.teacher_logout"))
+    
+    if request.method == "POST":
+        # Handle bulk marks upload
+        student_id = request.form.get("student_id")
+        subject = request.form.get("subject", "").strip()
+        exam_type = request.form.get("exam_type", "").strip()
+        marks_obtained = request.form.get("marks_obtained", "").strip()
+        max_marks = request.form.get("max_marks", "100").strip()
+        exam_date_str = request.form.get("exam_date", "").strip()
+        remarks = request.form.get("remarks", "").strip()
+        
+        if not (student_id and subject and exam_type and marks_obtained and exam_date_str):
+            flash("Please fill all required fields.", "danger")
+            return redirect(url_for("teacher.teacher_marks"))
+        
+        # Verify student is in teacher's class
+        student = Student.query.get(int(student_id))
+        if not student or student.student_class != teacher.assigned_class or student.section != teacher.assigned_section:
+            flash("Invalid student selection.", "danger")
+            return redirect(url_for("teacher.teacher_marks"))
+        
+        try:
+            marks_val = float(marks_obtained)
+            max_marks_val = float(max_marks)
+            exam_date = datetime.strptime(exam_date_str, '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            flash("Invalid marks or date format.", "danger")
+            return redirect(url_for("teacher.teacher_marks"))
+        
+        mark = Marks(
+            student_id=student.id,
+            teacher_id=teacher.id,
+            subject=subject,
+            exam_type=exam_type,
+            marks_obtained=marks_val,
+            max_marks=max_marks_val,
+            exam_date=exam_date,
+            remarks=remarks
+        )
+        db.session.add(mark)
+        refresh_section(student.student_class, student.section)
+        db.session.commit()
+        flash(f"Marks uploaded successfully for {student.name}.", "success")
+        return redirect(url_for("teacher.teacher_marks"))
+    
+    # Get students in teacher's class
+    students = Student.query.filter_by(
+        student_class=teacher.assigned_class,
+        section=teacher.assigned_section
+    ).order_by(Student.roll_no).all()
+    
+    # Get all marks uploaded by this teacher
+    marks_query = Marks.query.filter_by(teacher_id=teacher.id)
+    
+    # Apply filters
+    filter_student = request.args.get('filter_student', '').strip()
+    filter_subject = request.args.get('filter_subject', '').strip()
+    filter_exam_type = request.args.get('filter_exam_type', '').strip()
+    
+    if filter_student:
+        marks_query = marks_query.filter_by(student_id=int(filter_student))
+    if filter_subject:
+        marks_query = marks_query.filter(Marks.subject.ilike(f'%{filter_subject}%'))
+    if filter_exam_type:
+        marks_query = marks_query.filter_by(exam_type=filter_exam_type)
+    
+    # The list renders mark.student, so load the students in the same query
+    marks = marks_query.options(db.joinedload(Marks.student)).order_by(
+        Marks.exam_date.desc(), Marks.uploaded_at.desc()).all()
+    
+    # Get unique subjects and exam types for filters
+    all_subjects = db.session.query(Marks.subject).filter_by(teacher_id=teacher.id).distinct().all()
+    subjects = [s[0] for s in all_subjects if s[0]]
+    
+    all_exam_types = db.session.query(Marks.exam_type).filter_by(teacher_id=teacher.id).distinct().all()
+    exam_types = [e[0] for e in all_exam_types if e[0]]
+    
+    return render_template("teacher_marks.html", 
+                         teacher=teacher, 
+                         students=students,
+                         marks=marks,
+                         subjects=subjects,
+                         exam_types=exam_types)
+
+EXAM_TYPES = ['Unit Test', 'Mid Term', 'Final Exam', 'Assignment', 'Quiz', 'Project']
+
+@bp.route("/teacher/marks/grid", methods=["GET", "POST"])
+def teacher_marks_grid():
+    """Enter one exam's marks for the whole section in a single submission."""
+    if not teacher_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    teacher = get_current_teacher()
+    if not teacher:
+        flash("Teacher not found.", "danger")
+        return redirect(url_for("teacher.teacher_logout"))
+    
+    form = request.form if request.method == "POST" else request.args
+    subject = form.get("subject", "").strip()
+    exam_type = form.get("exam_type", "").strip()
+    exam_date_str = form.get("exam_date", "").strip()
+    max_marks = form.get("max_marks", "100").strip()
+    
+    exam_date = None
+    if exam_date_str:
+        try:
+            exam_date = datetime.strptime(exam_date_str, '%Y-%m-%d').date()
+        except ValueError:
+            flash("Invalid date format.", "danger")
+            return redirect(url_for("teacher.teacher_marks_grid"))
+    exam_selected = bool(subject and exam_type and exam_date)
+    
+    if request.method == "POST":
+        if not exam_selected:
+            flash("Please choose subject, exam type and exam date.", "danger")
+            return redirect(url_for("teacher.teacher_marks_grid"))
+        try:
+            max_marks_val = float(max_marks)
+        except ValueError:
+            flash("Max marks must be a number.", "danger")
+            return redirect(url_for("teacher.teacher_marks_grid", subject=subject, exam_type=exam_type, exam_date=exam_date_str))
+        
+        # Collect the filled-in cells; blank cells are left untouched
+        entries = {}
+        for key, value in request.form.items():
+            if not key.startswith("marks_") or not value.strip():
+                continue
+            try:
+                entries[int(key[len("marks_"):])] = float(value)
+            except ValueError:
+                flash("Marks must be numbers.", "danger")
+                return redirect(url_for("teacher.teacher_marks_grid", subject=subject, exam_type=exam_type,
+                                        exam_date=exam_date_str, max_marks=max_marks))
+        if not entries:
+            flash("No marks entered.", "danger")
+            return redirect(url_for("teacher.teacher_marks_grid", subject=subject, exam_type=exam_type,
+                                    exam_date=exam_date_str, max_marks=max_marks))
+        
+        # One set query confirms every student belongs to this teacher's section
+        valid_ids = {sid for (sid,) in db.session.query(Student.id).filter(
+            Student.id.in_(list(entries)),
+            Student.student_class == teacher.assigned_class,
+            Student.section == teacher.assigned_section
+        )}
+        if len(valid_ids) != len(entries):
+            flash("Invalid student selection.", "danger")
+            return redirect(url_for("teacher.teacher_marks_grid", subject=subject, exam_type=exam_type,
+                                    exam_date=exam_date_str, max_marks=max_marks))
+        
+        # Existing rows for this exam are updated in place rather than duplicated
+        existing = {m.student_id: m for m in Marks.query.filter(
+            Marks.teacher_id == teacher.id,
+            Marks.subject == subject,
+            Marks.exam_type == exam_type,
+            Marks.exam_date == exam_date,
+            Marks.student_id.in_(list(entries))
+        )}
+        created = updated = 0
+        for student_id, marks_val in entries.items():
+            remarks = request.form.get(f"remarks_{student_id}", "").strip()
+            mark = existing.get(student_id)
+            if mark:
+                mark.marks_obtained = marks_val
+                mark.max_marks = max_marks_val
+                mark.remarks = remarks
+                updated += 1
+            else:
+                db.session.add(Marks(
+                    student_id=student_id,
+                    teacher_id=teacher.id,
+                    subject=subject,
+                    exam_type=exam_type,
+                    marks_obtained=marks_val,
+                    max_marks=max_marks_val,
+                    exam_date=exam_date,
+                    remarks=remarks
+                ))
+                created += 1
+        refresh_section(teacher.assigned_class, teacher.assigned_section)
+        db.session.commit()
+        flash(f"Saved marks for {created + updated} student(s) ({created} new, {updated} updated).", "success")
+        return redirect(url_for("teacher.teacher_marks_grid", subject=subject, exam_type=exam_type,
+                                exam_date=exam_date_str, max_marks=max_marks))
+    
+    students = Student.query.filter_by(
+        student_class=teacher.assigned_class,
+        section=teacher.assigned_section
+    ).order_by(Student.roll_no).all()
+    
+    # Prefill the grid with what is already recorded for this exam
+    existing = {}
+    if exam_selected:
+        existing = {m.student_id: m for m in Marks.query.filter_by(
+            teacher_id=teacher.id, subject=subject, exam_type=exam_type, exam_date=exam_date)}
+        if existing and "max_marks" not in request.args:
+            max_marks = "%g" % next(iter(existing.values())).max_marks
+    
+    return render_template("teacher_marks_grid.html",
+                         teacher=teacher,
+                         students=students,
+                         existing=existing,
+                         exam_types=EXAM_TYPES,
+                         exam_selected=exam_selected,
+                         subject=subject,
+                         exam_type=exam_type,
+                         exam_date=exam_date_str,
+                         max_marks=max_marks)
+
+@bp.route("/teacher/marks/delete/<int:mark_id>", methods=["POST"])
+def teacher_delete_mark(mark_id):
+    if not teacher_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    teacher = get_current_teacher()
+    if not teacher:
+        flash("Teacher not found.", "danger")
+        return redirect(url_for("teacher.teacher_logout"))
+    
+    mark = Marks.query.get_or_404(mark_id)
+    
+    # Verify teacher owns this mark
+    if mark.teacher_id != teacher.id:
+        flash("Unauthorized action.", "danger")
+        return redirect(url_for("teacher.teacher_marks"))
+    
+    student = mark.student
+    db.session.delete(mark)
+    refresh_section(student.student_class, student.section)
+    db.session.commit()
+    flash(f"Marks deleted for {student.name}.", "info")
+    return redirect(url_for("teacher.teacher_marks"))
+
+@bp.route("/teacher/marks/edit/<int:mark_id>", methods=["POST"])
+def teacher_edit_mark(mark_id):
+    if not teacher_logged_in():
+        return redirect(url_for("admin.admin_login"))
+    
+    teacher = get_current_teacher()
+    if not teacher:
+        flash("Teacher not found.", "danger")
+        return redirect(url_for("teacher.teacher_logout"))
+    
+    mark = Marks.query.get_or_404(mark_id)
+    
+    # Verify teacher owns this mark
+    if mark.teacher_id != teacher.id:
+        flash("Unauthorized action.", "danger")
+        return redirect(url_for("teacher.teacher_marks"))
+    
+    # Update mark
+    mark.subject = request.form.get("subject", "").strip()
+    mark.exam_type = request.form.get("exam_type", "").strip()
+    mark.marks_obtained = float(request.form.get("marks_obtained", "0"))
+    mark.max_marks = float(request.form.get("max_marks", "100"))
+    mark.exam_date = datetime.strptime(request.form.get("exam_date", ""), '%Y-%m-%d').date()
+    mark.remarks = request.form.get("remarks", "").strip()
+    
+    refresh_section(mark.student.student_class, mark.student.section)
+    db.session.commit()
+    flash("Marks updated successfully.", "success")
+    return redirect(url_for("teacher.teacher_marks"))
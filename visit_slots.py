@@ -0,0 +1,117 @@
+"""
+Visit slots: the times the school offers for visits, each with a capacity.
+
+A VisitSlot is one (date, start time) with `capacity` seats and a `booked`
+counter. Booking is a single conditional UPDATE ... SET booked = booked + 1
+WHERE booked < capacity in the same transaction as the Visit insert, so two
+parents racing for the last seat cannot both get it: the database serialises
+the updates and the loser matches no row. Cancelling or deleting a visit
+gives its seat back the same way.
+
+The public form keeps its date and time fields; the time label selects the
+slot. Until an admin opens slots there are none, and visits are accepted as
+free text like before. Slot bookings always commit directly, even with
+WRITE_BEHIND on, because the parent has to be told whether the seat was free.
+"""
+
+from datetime import datetime, time, timedelta
+
+from models import db, VisitSlot
+
+# (start, end) of the times on the public form, opened for each day by default
+DEFAULT_SLOT_TIMES = (
+    (time(9), time(10)), (time(10), time(11)), (time(11), time(12)), (time(12), time(13)),
+    (time(14), time(15)), (time(15), time(16)), (time(16), time(17)),
+)
+
+# Longest range the public availability endpoint answers for
+MAX_AVAILABILITY_DAYS = 62
+
+def time_label(t):
+    """'9:00 AM' style, as used by the form and stored in Visit.visit_time."""
+    return f"{t.hour % 12 or 12}:{t.minute:02d} {'AM' if t.hour < 12 else 'PM'}"
+
+def slot_label(start, end):
+    return f"{time_label(start)} - {time_label(end)}"
+
+def parse_slot_label(label):
+    """Start time of a '9:00 AM - 10:00 AM' label, or None if it is not one."""
+    try:
+        return datetime.strptime(label.split(" - ")[0].strip(), "%I:%M %p").time()
+    except ValueError:
+        return None
+
+def slots_enabled():
+    """Whether any slot exists; without slots visits are taken as free text."""
+    return db.session.query(VisitSlot.id).first() is not None
+
+def find_slot(visit_date, label):
+    start = parse_slot_label(label)
+    if start is None:
+        return None
+    return VisitSlot.query.filter_by(slot_date=visit_date, start_time=start).first()
+
+def book_seat(slot_id):
+    """Take one seat of the slot inside the caller's transaction; False if it is full."""
+    return db.session.execute(
+        db.update(VisitSlot)
+        .where(VisitSlot.id == slot_id, VisitSlot.booked < VisitSlot.capacity)
+        .values(booked=VisitSlot.booked + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+
+def release_seat(slot_id):
+    """Give one seat back inside the caller's transaction."""
+    db.session.execute(
+        db.update(VisitSlot)
+        .where(VisitSlot.id == slot_id, VisitSlot.booked > 0)
+        .values(booked=VisitSlot.booked - 1)
+        .execution_options(synchronize_session=False)
+    )
+
+def open_slots(start, days, capacity, times=DEFAULT_SLOT_TIMES, weekdays=range(5)):
+    """Create the missing slots for `days` days from start on the given weekdays (Monday is 0).
+
+    Existing slots keep their capacity and bookings. Returns the number created.
+    The caller commits.
+    """
+    end = start + timedelta(days=days - 1)
+    existing = set(db.session.query(VisitSlot.slot_date, VisitSlot.start_time)
+                   .filter(VisitSlot.slot_date.between(start, end)))
+    rows = [
+        {'slot_date': day, 'start_time': begins, 'end_time': ends, 'capacity': capacity, 'booked': 0}
+        for day in (start + timedelta(days=i) for i in range(days)) if day.weekday() in weekdays
+        for begins, ends in times if (day, begins) not in existing
+    ]
+    if rows:
+        db.session.execute(db.insert(VisitSlot), rows)
+    return len(rows)
+
+def availability(start, end):
+    """Open slots between start and end (inclusive), grouped by day, in one query.
+
+    [{'date': date, 'seats': remaining seats that day, 'slots': [{'id', 'time', 'remaining'}]}]
+    """
+    remaining = (VisitSlot.capacity - VisitSlot.booked).label('remaining')
+    rows = (db.session.query(VisitSlot.id, VisitSlot.slot_date, VisitSlot.start_time, VisitSlot.end_time, remaining)
+            .filter(VisitSlot.slot_date.between(start, end), VisitSlot.booked < VisitSlot.capacity)
+            .order_by(VisitSlot.slot_date, VisitSlot.start_time).all())
+    days = []
+    for row in rows:
+        if not days or days[-1]['date'] != row.slot_date:
+            days.append({'date': row.slot_date, 'seats': 0, 'slots': []})
+        days[-1]['seats'] += row.remaining
+        days[-1]['slots'].append({'id': row.id, 'time': slot_label(row.start_time, row.end_time),
+                                  'remaining': row.remaining})
+    return days
+
+def calendar(start, end):
+    """Per-day slot, seat and booking totals between start and end, one GROUP BY query."""
+    return (db.session.query(
+                VisitSlot.slot_date,
+                db.func.count(VisitSlot.id).label('slots'),
+                db.func.sum(db.case((VisitSlot.booked < VisitSlot.capacity, 1), else_=0)).label('open_slots'),
+                db.func.sum(VisitSlot.capacity).label('capacity'),
+                db.func.sum(VisitSlot.booked).label('booked'))
+            .filter(VisitSlot.slot_date.between(start, end))
+            .group_by(VisitSlot.slot_date).order_by(VisitSlot.slot_date).all())
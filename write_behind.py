@@ -0,0 +1,162 @@
+"""
+Write-behind queue for public form submissions.
+
+With WRITE_BEHIND on, contact(), schedule_visit() and fee_form() append the
+validated row to a small SQLite queue database of its own, so the request
+never waits on the main database's writer lock, and return at once. A single
+writer thread per process drains the queue in batches, one main-database
+transaction per batch.
+
+Delivery is exactly-once: the caller commits each batch together with the id
+of its last queue row (a high-water mark kept in the main database under the
+queue file's random name), and rows at or below that mark are only purged
+from the queue afterwards. A crash between the two steps leaves rows that the
+next drain skips and purges. A recreated queue file gets a new name, so its
+ids never meet an old file's mark.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date, datetime
+
+logger = logging.getLogger("write_behind")
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS queue_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS submission ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+    "enqueued_at TEXT NOT NULL)",
+    # Rows the main database refused, kept for an admin to inspect
+    "CREATE TABLE IF NOT EXISTS failed_submission ("
+    "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+    "enqueued_at TEXT NOT NULL, error TEXT, failed_at TEXT NOT NULL)",
+)
+
+def _encode(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"cannot queue {type(value).__name__}")
+
+class QueuedRow:
+    """One queued submission: id, kind (table name), payload dict and enqueue time."""
+
+    __slots__ = ("id", "kind", "payload", "enqueued_at")
+
+    def __init__(self, id, kind, payload, enqueued_at):
+        self.id = id
+        self.kind = kind
+        self.payload = json.loads(payload)
+        self.enqueued_at = datetime.fromisoformat(enqueued_at)
+
+class IngestQueue:
+    """Durable FIFO of pending submissions in its own SQLite file, identified by .name."""
+
+    def __init__(self, path):
+        self.path = path
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+            conn.execute("INSERT OR IGNORE INTO queue_meta (key, value) VALUES ('name', ?)", (uuid.uuid4().hex,))
+            self.name = conn.execute("SELECT value FROM queue_meta WHERE key = 'name'").fetchone()[0]
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # Autocommit; synchronous stays FULL so an acknowledged submission survives power loss
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def put(self, kind, payload):
+        """Append a submission and wake the writer; returns its queue id."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "INSERT INTO submission (kind, payload, enqueued_at) VALUES (?, ?, ?)",
+                (kind, json.dumps(payload, default=_encode), datetime.utcnow().isoformat()),
+            )
+            queue_id = cursor.lastrowid
+        finally:
+            conn.close()
+        self._wakeup.set()
+        return queue_id
+
+    def batch(self, after_id, size):
+        """The oldest queued rows with id above after_id."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT id, kind, payload, enqueued_at FROM submission WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, size),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [QueuedRow(*row) for row in rows]
+
+    def pending(self, kind, limit=100):
+        """Queued rows of one kind, newest first, for the admin views."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT id, kind, payload, enqueued_at FROM submission WHERE kind = ? ORDER BY id DESC LIMIT ?",
+                (kind, limit),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [QueuedRow(*row) for row in rows]
+
+    def purge(self, upto_id):
+        """Drop rows the main database has already committed."""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM submission WHERE id <= ?", (upto_id,))
+        finally:
+            conn.close()
+
+    def bury(self, failures):
+        """Keep refused rows in failed_submission; failures is [(QueuedRow, error)]."""
+        if not failures:
+            return
+        now = datetime.utcnow().isoformat()
+        conn = self._connect()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO failed_submission (id, kind, payload, enqueued_at, error, failed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(row.id, row.kind, json.dumps(row.payload), row.enqueued_at.isoformat(), error[:500], now)
+                 for row, error in failures],
+            )
+        finally:
+            conn.close()
+
+    def start(self, drain, linger=0.05, idle=5.0):
+        """Run drain() on a daemon writer thread until the queue is empty, each time it is woken.
+
+        drain() moves one batch and returns how many rows it took. The thread
+        lingers briefly after a wakeup so a burst lands in one transaction,
+        and polls every idle seconds for rows left by other processes.
+        """
+        with self._thread_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, args=(drain, linger, idle),
+                                            name="write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self, drain, linger, idle):
+        while True:
+            if self._wakeup.wait(idle):
+                self._wakeup.clear()
+                time.sleep(linger)  # let the rest of a burst arrive
+            try:
+                while drain():
+                    pass
+            except Exception:
+                logger.exception("write-behind drain failed; retrying in %.0fs", idle)